@@ -0,0 +1,120 @@
+"""Cycles CPU render time before and after applying a light budget
+
+Run headless from the repository root:
+
+    blender -b --factory-startup --python benchmarks/light_budget.py -- --lights 400
+
+Builds a room with a grid of small generated point lights, renders one frame
+with Cycles on the CPU, applies the light budget with each clustering method
+and renders again. The total light power is printed with each render to
+show that the budget conserves it.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import bpy
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import blender_scene_buildup as buildup  # noqa: E402
+
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lights", type=int, default=400)
+    parser.add_argument("--budget", type=int, default=32)
+    parser.add_argument("--samples", type=int, default=32)
+    parser.add_argument("--resolution", type=int, default=50,
+                        help="Render resolution percentage of 1280x720")
+    return parser.parse_args(argv)
+
+
+def build_scene(args):
+    """Floor, a few boxes, a camera and a ceiling grid of point lights"""
+    bpy.data.batch_remove(list(bpy.data.objects))
+    scene = bpy.context.scene
+
+    def add_mesh(name, verts, faces, location=(0.0, 0.0, 0.0)):
+        mesh = bpy.data.meshes.new(name)
+        mesh.from_pydata(verts, [], faces)
+        obj = bpy.data.objects.new(name, mesh)
+        obj.location = location
+        scene.collection.objects.link(obj)
+        return obj
+
+    add_mesh("Floor", [(-20, -20, 0), (20, -20, 0), (20, 20, 0), (-20, 20, 0)],
+             [(0, 1, 2, 3)])
+    box = [(x, y, z) for x in (-1, 1) for y in (-1, 1) for z in (0, 2)]
+    box_faces = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1),
+                 (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+    for i, (x, y) in enumerate([(-8, -6), (4, 2), (10, -9), (-3, 9)]):
+        add_mesh(f"Box.{i}", box, box_faces, (x, y, 0.0))
+
+    side = int(np.ceil(np.sqrt(args.lights)))
+    rng = np.random.default_rng(0)
+    for i in range(args.lights):
+        light_data = bpy.data.lights.new(f"Lamp.{i:04d}", 'POINT')
+        light_data.energy = float(rng.uniform(20.0, 80.0))
+        light_data.shadow_soft_size = 0.1
+        light_obj = bpy.data.objects.new(light_data.name, light_data)
+        light_obj.location = (
+            (i % side) / side * 36.0 - 18.0,
+            (i // side) / side * 36.0 - 18.0,
+            4.0,
+        )
+        light_obj[buildup.GENERATED_LIGHT] = True
+        scene.collection.objects.link(light_obj)
+
+    camera = bpy.data.objects.new("Camera", bpy.data.cameras.new("Camera"))
+    camera.location = (0.0, -30.0, 18.0)
+    camera.rotation_euler = (np.radians(60.0), 0.0, 0.0)
+    scene.collection.objects.link(camera)
+    scene.camera = camera
+
+    scene.render.engine = 'CYCLES'
+    scene.cycles.device = 'CPU'
+    scene.cycles.samples = args.samples
+    scene.cycles.use_denoising = False
+    scene.render.resolution_x = 1280
+    scene.render.resolution_y = 720
+    scene.render.resolution_percentage = args.resolution
+    return scene
+
+
+def render(scene, label):
+    lights = [obj for obj in scene.objects
+              if obj.type == 'LIGHT' and obj.visible_get()]
+    power = sum(obj.data.energy for obj in lights)
+    began = time.perf_counter()
+    bpy.ops.render.render()
+    elapsed = time.perf_counter() - began
+    print(f"{label:<20}{len(lights):>8}{power:>12.1f}{elapsed:>12.2f}")
+    return elapsed
+
+
+def main():
+    args = parse_args()
+    buildup.register()
+    scene = build_scene(args)
+
+    print(f"{args.lights} lights, budget {args.budget}, {args.samples} samples")
+    print(f"{'setup':<20}{'lights':>8}{'power W':>12}{'render s':>12}")
+    render(scene, "original")
+    for method in ('KMEANS', 'GRID'):
+        began = time.perf_counter()
+        buildup.apply_light_budget(scene, args.budget, method)
+        clustering = time.perf_counter() - began
+        render(scene, f"budget {method.lower()}")
+        print(f"  clustering took {clustering * 1000:.1f} ms")
+    buildup.restore_light_budget(scene)
+    render(scene, "restored")
+
+    buildup.unregister()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Per-frame evaluation cost of each visibility strategy
+
+Run headless from the repository root:
+
+    blender -b --factory-startup --python benchmarks/visibility.py -- --objects 5000
+
+Builds a grid of cubes sharing one mesh, applies the buildup with every
+visibility strategy in turn and times scene.frame_set() over the whole
+animation. Frames where objects appear are reported separately, that is
+where keyed hide_viewport forces a depsgraph relations rebuild. With
+--lights, that many objects also get a point light from the light tools
+after the buildup is applied, hidden the way their parent's strategy hides
+them.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import bpy
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import blender_scene_buildup as buildup  # noqa: E402
+
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, default=2000)
+    parser.add_argument(
+        "--start-frames", type=int, default=40,
+        help="Number of distinct start frames across the objects",
+    )
+    parser.add_argument("--spacing", type=int, default=3,
+                        help="Frames between consecutive start frames")
+    parser.add_argument("--duration", type=int, default=12)
+    parser.add_argument("--effect", default='GROW_FROM_FLOOR',
+                        choices=buildup.ANIMATED_EFFECTS)
+    parser.add_argument("--engine", default='BULK', choices=('BULK', 'DRIVERS'))
+    parser.add_argument("--lights", type=int, default=0,
+                        help="Objects that get a child point light")
+    parser.add_argument("--passes", type=int, default=2,
+                        help="Timed playback passes after one warm-up pass")
+    return parser.parse_args(argv)
+
+
+def cube_mesh():
+    mesh = bpy.data.meshes.new("BenchmarkCube")
+    verts = [(x, y, z) for x in (-1, 1) for y in (-1, 1) for z in (0, 2)]
+    faces = [
+        (0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1),
+        (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3),
+    ]
+    mesh.from_pydata(verts, [], faces)
+    # Survives the orphan purge between strategies
+    mesh.use_fake_user = True
+    return mesh
+
+
+def build_objects(scene, mesh, args, visibility):
+    """Link a fresh grid of objects with staggered start frames"""
+    side = int(np.ceil(np.sqrt(args.objects)))
+    starts = 1 + (np.arange(args.objects) % args.start_frames) * args.spacing
+    objects = []
+    for i in range(args.objects):
+        obj = bpy.data.objects.new(f"Benchmark.{i:05d}", mesh)
+        obj.location = (i % side * 2.5, i // side * 2.5, 0.0)
+        scene.collection.objects.link(obj)
+        props = obj.scene_buildup
+        props.enabled = True
+        props.effect_type = args.effect
+        props.start_frame = int(starts[i])
+        props.duration = args.duration
+        props.animation_engine = args.engine
+        props.visibility_mode = visibility
+        objects.append(obj)
+    return objects, starts
+
+
+def apply(scene, objects, starts, args, visibility):
+    if args.engine == 'DRIVERS':
+        buildup.apply_buildup_drivers(
+            objects, args.effect, visibility=visibility
+        )
+    else:
+        plan = buildup.plan_buildup(
+            objects, args.effect, starts, args.duration, visibility=visibility
+        )
+        buildup.write_buildup_plan(plan)
+    if visibility == 'COLLECTION':
+        buildup.assign_start_buckets(scene, objects, starts)
+
+
+def add_lights(scene, objects, count):
+    """Give the first count objects a point light above them, returns them"""
+    lights = []
+    for obj in objects[:count]:
+        placement = buildup.LightPlacement(
+            np.array([tuple(obj.location)]) + (0.0, 0.0, 2.5)
+        )
+        lights.append(buildup.create_light(
+            obj, 'POINT', placement, obj.scene_buildup, scene.collection
+        ))
+    return lights
+
+
+def time_playback(scene, last_frame, passes):
+    """Seconds spent in frame_set per frame, best of the timed passes"""
+    timings = {}
+    for playback in range(passes + 1):
+        for frame in range(last_frame + 1):
+            began = time.perf_counter()
+            scene.frame_set(frame)
+            elapsed = time.perf_counter() - began
+            # First pass only warms caches
+            if playback:
+                timings[frame] = min(timings.get(frame, elapsed), elapsed)
+    return timings
+
+
+def report(name, timings, appear_frames):
+    appear = [timings[f] * 1000 for f in timings if f in appear_frames]
+    other = [timings[f] * 1000 for f in timings if f not in appear_frames]
+    print(
+        f"{name:<16}"
+        f"{statistics.fmean(timings.values()) * 1000:>10.2f}"
+        f"{statistics.fmean(appear):>14.2f}"
+        f"{max(appear):>13.2f}"
+        f"{statistics.fmean(other) if other else 0.0:>13.2f}"
+    )
+
+
+def main():
+    args = parse_args()
+    buildup.register()
+    scene = bpy.context.scene
+    bpy.data.batch_remove(list(bpy.data.objects))
+    mesh = cube_mesh()
+
+    print(
+        f"{args.objects} objects, {args.start_frames} start frames, "
+        f"{args.lights} lights, {args.effect}, {args.engine} engine"
+    )
+    print(
+        f"{'strategy':<16}{'mean ms':>10}{'appear ms':>14}"
+        f"{'appear max':>13}{'other ms':>13}"
+    )
+    for visibility in buildup.VISIBILITY_PATHS:
+        objects, starts = build_objects(scene, mesh, args, visibility)
+        apply(scene, objects, starts, args, visibility)
+        lights = add_lights(scene, objects, args.lights)
+        bpy.context.evaluated_depsgraph_get()
+
+        last_frame = int(starts.max()) + args.duration + 1
+        timings = time_playback(scene, last_frame, args.passes)
+        # Lights appear with their parent's end frame
+        appear = set(starts.tolist())
+        appear.update((starts[:len(lights)] + args.duration).tolist())
+        report(visibility, timings, appear)
+
+        light_data = [light_obj.data for light_obj in lights]
+        bpy.data.batch_remove(objects + lights + light_data)
+        buildup.remove_empty_buckets(scene)
+        bpy.data.orphans_purge(do_recursive=True)
+
+    buildup.unregister()
+
+
+if __name__ == "__main__":
+    main()
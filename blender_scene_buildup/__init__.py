@@ -6,22 +6,28 @@ Creates animated scene buildup effects matching 3D-Generalist rendering style.
 bl_info = {
     "name": "Scene Buildup Animation",
     "author": "Scene Buildup Team",
-    "version": (1, 0, 0),
+    "version": (1, 1, 0),
     "blender": (4, 5, 0),
     "location": "View3D > Sidebar > Scene Buildup",
     "description": "Create animated scene buildup effects",
     "category": "Animation",
 }
 
+import contextlib
+
 import bpy
 import mathutils
+import numpy as np
 from bpy.props import (
     BoolProperty,
+    CollectionProperty,
     EnumProperty,
     FloatProperty,
     IntProperty,
     PointerProperty,
+    StringProperty,
 )
+from bpy.app.handlers import persistent
 from bpy.types import Operator, Panel, PropertyGroup
 
 
@@ -29,10 +35,12 @@ from bpy.types import Operator, Panel, PropertyGroup
 # Compatibility Helpers
 # ============================================================================
 
-def get_fcurves_collection(action):
+def get_fcurves_collection(action, slot=None):
     """Get fcurves collection from action, compatible with Blender 4.x and 5.0+
 
     Returns the fcurves collection object (supports iteration and .remove())
+    For layered actions, pass the action slot to get that slot's channelbag;
+    without one, the first non-empty channelbag is returned.
     """
     # Check for legacy action (Blender 5.0 can have both types)
     if hasattr(action, 'is_action_legacy') and action.is_action_legacy:
@@ -45,6 +53,11 @@ def get_fcurves_collection(action):
         for layer in action.layers:
             if hasattr(layer, 'strips') and layer.strips:
                 for strip in layer.strips:
+                    if slot is not None and hasattr(strip, 'channelbag'):
+                        channelbag = strip.channelbag(slot)
+                        if channelbag is not None:
+                            return channelbag.fcurves
+                        continue
                     if hasattr(strip, 'channelbags') and strip.channelbags:
                         for channelbag in strip.channelbags:
                             if channelbag.fcurves:
@@ -52,10 +65,2934 @@ def get_fcurves_collection(action):
     return None
 
 
+def get_object_fcurves(obj):
+    """Get the fcurves animating this object from its action and slot"""
+    anim_data = obj.animation_data
+    if anim_data is None or anim_data.action is None:
+        return None
+    slot = getattr(anim_data, 'action_slot', None)
+    return get_fcurves_collection(anim_data.action, slot)
+
+
+class FCurveCache:
+    """Memoized get_object_fcurves() for the duration of one operator run
+
+    Channelbags are cached per (action, slot), so repeated lookups skip the
+    layers -> strips -> channelbags walk, and objects sharing one layered
+    action through separate slots still resolve to their own curves.
+    """
+
+    def __init__(self):
+        self._fcurves = {}
+
+    def get(self, obj):
+        anim_data = obj.animation_data
+        if anim_data is None or anim_data.action is None:
+            return None
+        slot = getattr(anim_data, 'action_slot', None)
+        key = (anim_data.action.as_pointer(), slot.handle if slot else None)
+        fcurves = self._fcurves.get(key)
+        if fcurves is None:
+            fcurves = get_object_fcurves(obj)
+            if fcurves is not None:
+                self._fcurves[key] = fcurves
+        return fcurves
+
+
+def supports_action_slots():
+    """True when actions are layered and can animate many IDs via slots"""
+    return hasattr(bpy.types, 'ActionSlot')
+
+
+# ============================================================================
+# Bulk Keyframe Writer
+# ============================================================================
+
+# Channel group keyframe_insert() uses for location/rotation/scale
+TRANSFORM_GROUP = "Object Transforms"
+
+# Enum values of Keyframe.interpolation, for foreach_set()
+INTERPOLATION_MODES = {'CONSTANT': 0, 'LINEAR': 1, 'BEZIER': 2}
+
+
+def ensure_action(obj, shared_action=None):
+    """Get the object's action, creating animation data and action if needed
+
+    When shared_action is given, objects without an action get their own
+    slot in it instead of a new action (layered actions only).
+    """
+    anim_data = obj.animation_data or obj.animation_data_create()
+    if anim_data.action is None:
+        if shared_action is not None and hasattr(anim_data, 'action_slot'):
+            slot = shared_action.slots.new(id_type='OBJECT', name=obj.name)
+            anim_data.action = shared_action
+            anim_data.action_slot = slot
+        else:
+            # Same naming keyframe_insert() uses for new actions
+            anim_data.action = bpy.data.actions.new(name=f"{obj.name}Action")
+    return anim_data.action
+
+
+# Keyframe attributes copied by read/append_keyframe_arrays()
+KEYFRAME_ARRAYS = (
+    ("co", 2, np.float32),
+    ("handle_left", 2, np.float32),
+    ("handle_right", 2, np.float32),
+    ("interpolation", 1, np.int32),
+    ("handle_left_type", 1, np.int32),
+    ("handle_right_type", 1, np.int32),
+)
+
+
+def read_keyframe_arrays(fcurve):
+    """Read all keyframes of an F-curve into flat arrays, keyed by attribute"""
+    count = len(fcurve.keyframe_points)
+    data = {}
+    for attr, width, dtype in KEYFRAME_ARRAYS:
+        data[attr] = np.empty(count * width, dtype=dtype)
+        fcurve.keyframe_points.foreach_get(attr, data[attr])
+    return data
+
+
+def append_keyframe_arrays(fcurve, data):
+    """Append keyframes read by read_keyframe_arrays() to an F-curve"""
+    points = fcurve.keyframe_points
+    offset = len(points)
+    points.add(len(data["interpolation"]))
+    for attr, width, dtype in KEYFRAME_ARRAYS:
+        values = np.empty(len(points) * width, dtype=dtype)
+        points.foreach_get(attr, values)
+        values[offset * width:] = data[attr]
+        points.foreach_set(attr, values)
+    fcurve.update()
+
+
+def copy_keyframes(source, target):
+    """Append all keyframes of one F-curve to another in bulk"""
+    append_keyframe_arrays(target, read_keyframe_arrays(source))
+
+
+def split_action_slot(obj):
+    """Move the object onto its own slot holding a copy of its shared curves
+
+    Used instead of copying the whole action when several objects animate
+    through the same slot of a layered action.
+    """
+    anim_data = obj.animation_data
+    action = anim_data.action
+    source = get_object_fcurves(obj)
+    anim_data.action_slot = action.slots.new(id_type='OBJECT', name=obj.name)
+    if source:
+        for fcurve in list(source):
+            group = fcurve.group.name if fcurve.group else ""
+            target = ensure_fcurve(
+                obj, action, fcurve.data_path, fcurve.array_index, group
+            )
+            copy_keyframes(fcurve, target)
+
+
+def release_action_slot(obj):
+    """Remove the object's slot from its action if no other ID uses it"""
+    anim_data = obj.animation_data
+    slot = getattr(anim_data, 'action_slot', None) if anim_data else None
+    if slot is None or not hasattr(slot, 'users'):
+        return
+    action = anim_data.action
+    if action is not None and list(slot.users()) == [obj]:
+        anim_data.action_slot = None
+        action.slots.remove(slot)
+
+
+def ensure_fcurve(obj, action, data_path, index=0, group=""):
+    """Find or create an F-curve, compatible with Blender 4.x and 5.0+"""
+    # Slotted actions (Blender 4.4+) resolve the channelbag for the object
+    if hasattr(action, 'fcurve_ensure_for_datablock'):
+        return action.fcurve_ensure_for_datablock(
+            obj, data_path, index=index, group_name=group
+        )
+    fcurve = action.fcurves.find(data_path, index=index)
+    if fcurve is None:
+        fcurve = action.fcurves.new(data_path, index=index, action_group=group)
+    return fcurve
+
+
+def write_keyframes(fcurve, frames, values, interpolation='BEZIER'):
+    """Merge keyframes into an F-curve using bulk foreach calls
+
+    Behaves like a series of keyframe_insert() calls: a key on a frame that
+    already holds a keyframe replaces its value and keeps its interpolation
+    and handles, which move with the value. Handles of new keys start on
+    the key and are recalculated once by fcurve.update() at the end.
+    """
+    frames = np.asarray(frames, dtype=np.float32)
+    values = np.asarray(values, dtype=np.float32)
+
+    # Later keys win on duplicate frames, like repeated keyframe_insert()
+    frames, first = np.unique(frames[::-1], return_index=True)
+    values = values[::-1][first]
+
+    points = fcurve.keyframe_points
+    existing = len(points)
+    co = np.empty(existing * 2, dtype=np.float32)
+    left = np.empty(existing * 2, dtype=np.float32)
+    right = np.empty(existing * 2, dtype=np.float32)
+    modes = np.empty(existing, dtype=np.int32)
+    hit = np.zeros(len(frames), dtype=bool)
+    if existing:
+        points.foreach_get("co", co)
+        points.foreach_get("handle_left", left)
+        points.foreach_get("handle_right", right)
+        points.foreach_get("interpolation", modes)
+        co = co.reshape(-1, 2)
+        left = left.reshape(-1, 2)
+        right = right.reshape(-1, 2)
+
+        # Overwrite values of keys that already exist on these frames,
+        # shifting their handles by the same amount
+        order = np.argsort(co[:, 0], kind='stable')
+        slot = np.minimum(np.searchsorted(co[order, 0], frames), existing - 1)
+        hit = co[order[slot], 0] == frames
+        rows = order[slot[hit]]
+        shift = values[hit] - co[rows, 1]
+        co[rows, 1] = values[hit]
+        left[rows, 1] += shift
+        right[rows, 1] += shift
+    co = co.reshape(-1, 2)
+    left = left.reshape(-1, 2)
+    right = right.reshape(-1, 2)
+
+    new_co = np.column_stack((frames[~hit], values[~hit]))
+    points.add(len(new_co))
+
+    modes = np.concatenate((
+        modes,
+        np.full(len(new_co), INTERPOLATION_MODES[interpolation], dtype=np.int32),
+    ))
+    points.foreach_set("co", np.concatenate((co, new_co)).ravel())
+    points.foreach_set("handle_left", np.concatenate((left, new_co)).ravel())
+    points.foreach_set("handle_right", np.concatenate((right, new_co)).ravel())
+    points.foreach_set("interpolation", modes)
+
+    # Sort keys and recalculate auto-clamped handles in one pass
+    fcurve.update()
+
+
+def set_interpolation(obj, data_paths, interpolation='BEZIER', cache=None):
+    """Set interpolation of every keyframe on F-curves with the given paths"""
+    fcurves = (cache or FCurveCache()).get(obj)
+    if not fcurves:
+        return
+    mode = INTERPOLATION_MODES[interpolation]
+    for fcurve in fcurves:
+        if fcurve.data_path in data_paths:
+            count = len(fcurve.keyframe_points)
+            fcurve.keyframe_points.foreach_set(
+                "interpolation", np.full(count, mode, dtype=np.int32)
+            )
+            fcurve.update()
+
+
+# Properties keyed to hide objects by each visibility strategy. Toggling
+# hide_viewport adds and removes objects from the depsgraph, which rebuilds
+# relations on every frame where it changes; ray visibility flags do not.
+VISIBILITY_PATHS = {
+    'HIDE': ("hide_viewport", "hide_render"),
+    'RAY': (
+        "visible_camera",
+        "visible_shadow",
+        "visible_diffuse",
+        "visible_glossy",
+        "visible_transmission",
+        "visible_volume_scatter",
+    ),
+    # Bucket collections hide whole start frames, objects carry no keys
+    'COLLECTION': (),
+}
+ALL_VISIBILITY_PATHS = frozenset(
+    data_path for paths in VISIBILITY_PATHS.values() for data_path in paths
+)
+
+
+def visibility_values(visibility, hidden):
+    """Key values of the strategy's properties for per-key hidden flags"""
+    hidden = np.asarray(hidden, dtype=np.float32)
+    return hidden if visibility == 'HIDE' else 1.0 - hidden
+
+
+def write_visibility_keys(obj, action, frames, hidden, visibility='HIDE'):
+    """Key the visibility strategy's properties with constant interpolation"""
+    values = visibility_values(visibility, hidden)
+    for data_path in VISIBILITY_PATHS[visibility]:
+        fcurve = ensure_fcurve(obj, action, data_path)
+        write_keyframes(fcurve, frames, values, interpolation='CONSTANT')
+
+
+def clear_transform_keys(obj, cache=None):
+    """Remove existing location.z, delta_location.z and scale F-curves
+
+    delta_location.z holds the per-object rise of the template engine.
+    """
+    if not obj.animation_data:
+        return
+    action = obj.animation_data.action
+    if not action:
+        return
+
+    # Ensure object has its own curves (not shared with other objects).
+    # Layered actions only need a separate slot, not a copy of the action.
+    if action.users > 1:
+        slot = getattr(obj.animation_data, 'action_slot', None)
+        if slot is not None and hasattr(slot, 'users'):
+            if len(slot.users()) > 1:
+                split_action_slot(obj)
+        else:
+            obj.animation_data.action = action.copy()
+
+    # Remove existing keyframes for location.z and scale
+    fcurves = (cache or FCurveCache()).get(obj)
+    if fcurves:
+        fcurves_to_remove = []
+        for fcurve in fcurves:
+            if (fcurve.data_path in ("location", "delta_location")
+                    and fcurve.array_index == 2):
+                fcurves_to_remove.append(fcurve)
+            elif fcurve.data_path == "scale":
+                fcurves_to_remove.append(fcurve)
+
+        for fcurve in fcurves_to_remove:
+            fcurves.remove(fcurve)
+
+
+def remove_action_fcurves(obj, data_paths, cache=None):
+    """Remove F-curves with the given data paths from the object's action"""
+    fcurves = (cache or FCurveCache()).get(obj)
+    if fcurves:
+        for fcurve in [fc for fc in fcurves if fc.data_path in data_paths]:
+            fcurves.remove(fcurve)
+
+
+# ============================================================================
+# Template Actions
+# ============================================================================
+
+# NLA track that plays an object's shared buildup template
+TEMPLATE_TRACK = "SceneBuildup"
+
+# ID property on template actions holding their animation signature
+TEMPLATE_SIGNATURE = "scene_buildup_template"
+
+# Key values are compared at this many decimals when sharing templates
+TEMPLATE_PRECISION = 4
+
+# Signature of the layered action holding per-object template channels
+OBJECT_CHANNELS_SIGNATURE = "OBJECT_CHANNELS"
+
+
+def remove_buildup_tracks(obj):
+    """Remove the NLA track playing a shared buildup template"""
+    if not obj.animation_data:
+        return
+    tracks = obj.animation_data.nla_tracks
+    for track in [t for t in tracks if t.name == TEMPLATE_TRACK]:
+        tracks.remove(track)
+
+
+def new_action_fcurve(action, data_path, index=0):
+    """Create an F-curve on an action that is not assigned to any datablock
+
+    Layered actions (Blender 4.4+) get one object slot, layer and keyframe
+    strip to hold the curves.
+    """
+    if not hasattr(action, 'slots'):
+        return action.fcurves.new(data_path, index=index)
+
+    if action.slots:
+        slot = action.slots[0]
+    else:
+        slot = action.slots.new(id_type='OBJECT', name="Buildup")
+    layer = action.layers[0] if action.layers else action.layers.new("Layer")
+    strip = layer.strips[0] if layer.strips else layer.strips.new(type='KEYFRAME')
+    return strip.channelbag(slot, ensure=True).fcurves.new(data_path, index=index)
+
+
+def template_actions():
+    """Map signature to template action for templates already in the file"""
+    return {
+        action[TEMPLATE_SIGNATURE]: action
+        for action in bpy.data.actions
+        if TEMPLATE_SIGNATURE in action
+    }
+
+
+def ensure_template_action(templates, name, signature, channels):
+    """Get the template action for a signature, building it on first use
+
+    channels holds (data_path, index, interpolation, frames, values) with
+    frames relative to the animation start.
+    """
+    action = templates.get(signature)
+    if action is not None:
+        return action
+
+    action = bpy.data.actions.new(name=name)
+    action[TEMPLATE_SIGNATURE] = signature
+    for data_path, index, interpolation, frames, values in channels:
+        fcurve = new_action_fcurve(action, data_path, index)
+        write_keyframes(fcurve, frames, values, interpolation)
+    templates[signature] = action
+    return action
+
+
+def assign_template_strip(obj, action, start_frame):
+    """Play a template action on the object from start_frame via NLA"""
+    anim_data = obj.animation_data or obj.animation_data_create()
+    remove_buildup_tracks(obj)
+
+    track = anim_data.nla_tracks.new()
+    track.name = TEMPLATE_TRACK
+    # Template keys start at frame -1 when the object is hidden beforehand
+    strip_start = int(round(start_frame + action.frame_range[0]))
+    strip = track.strips.new(action.name, strip_start, action)
+    strip.extrapolation = 'HOLD'
+    if hasattr(strip, 'action_slot') and action.slots:
+        strip.action_slot = action.slots[0]
+
+
+def _template_signatures(rows):
+    """Group identical rows of relative key data, returning (first, inverse)"""
+    keys = np.round(np.asarray(rows, dtype=np.float64), TEMPLATE_PRECISION)
+    _, first, inverse = np.unique(
+        keys, axis=0, return_index=True, return_inverse=True
+    )
+    return first, inverse.reshape(-1)
+
+
+def _signature_string(prefix, row):
+    values = ",".join(f"{v:.{TEMPLATE_PRECISION}f}" for v in row)
+    return f"{prefix}:{values}"
+
+
+def write_template_plan(plan, start=0, stop=None, cache=None, templates=None):
+    """Write a delta-space plan as shared template actions on NLA strips
+
+    Objects whose keys match relative to their own start frame share one
+    action, so a whole selection usually needs a handful of actions instead
+    of one per object. The plan must come from plan_buildup(use_delta=True)
+    so the shared keys do not depend on each object's own transforms.
+    Channels in plan.object_channels, such as the rise from the floor to
+    each object's height, are keyed per object instead, each object in its
+    own slot of one layered action, so they never split templates. Only
+    plan.objects[start:stop] are written; pass the same templates dict
+    (see template_actions()) when writing a plan in several ranges.
+    """
+    if stop is None:
+        stop = len(plan)
+    if stop <= start:
+        return
+    cache = cache or FCurveCache()
+    if templates is None:
+        templates = template_actions()
+    offsets = plan.start_frames[start:stop, None].astype(np.float32)
+
+    # Keys on the object's own action would override the NLA result
+    overridden = set(ALL_VISIBILITY_PATHS)
+    overridden.update(channel[0] for channel in plan.channels)
+
+    shared = [
+        channel for channel in plan.channels
+        if channel[:2] not in plan.object_channels
+    ]
+    own = [
+        channel for channel in plan.channels
+        if channel[:2] in plan.object_channels
+    ]
+    object_action = None
+    if own:
+        object_action = templates.get(OBJECT_CHANNELS_SIGNATURE)
+        if object_action is None:
+            object_action = bpy.data.actions.new(name="SceneBuildup_Objects")
+            object_action[TEMPLATE_SIGNATURE] = OBJECT_CHANNELS_SIGNATURE
+            templates[OBJECT_CHANNELS_SIGNATURE] = object_action
+
+    if shared:
+        rows = np.hstack([
+            np.hstack((frames[start:stop] - offsets, values[start:stop]))
+            for _, _, _, _, frames, values in shared
+        ])
+        first, inverse = _template_signatures(rows)
+        actions = []
+        for i, row in zip(first, rows[first]):
+            channels = [
+                (
+                    data_path,
+                    index,
+                    interpolation,
+                    frames[start + i] - offsets[i],
+                    values[start + i],
+                )
+                for data_path, index, _, interpolation, frames, values in shared
+            ]
+            actions.append(ensure_template_action(
+                templates,
+                f"SceneBuildup_{plan.effect_type}",
+                _signature_string(plan.effect_type, row),
+                channels,
+            ))
+
+    for i in range(start, stop):
+        obj = plan.objects[i]
+        clear_transform_keys(obj, cache)
+        remove_action_fcurves(obj, overridden, cache)
+        remove_buildup_drivers(obj)
+        remove_progress_property(obj, cache)
+        if not plan.channels:
+            remove_buildup_tracks(obj)
+            continue
+        if shared:
+            assign_template_strip(
+                obj, actions[inverse[i - start]], plan.start_frames[i]
+            )
+        else:
+            remove_buildup_tracks(obj)
+        if own:
+            # Evaluated on top of the strip, which keys other channels
+            action = ensure_action(obj, object_action)
+            for data_path, index, group, interpolation, frames, values in own:
+                fcurve = ensure_fcurve(obj, action, data_path, index, group)
+                write_keyframes(fcurve, frames[i], values[i], interpolation)
+        obj.hide_viewport = False
+        obj.hide_render = False
+
+        # Child lights share visibility templates the same way
+        if not plan.child_lights[i] or not VISIBILITY_PATHS[plan.visibility]:
+            continue
+        row = plan.light_frames[i] - offsets[i - start]
+        light_values = visibility_values(plan.visibility, plan.light_hidden)
+        channels = [
+            (data_path, 0, 'CONSTANT', row, light_values)
+            for data_path in VISIBILITY_PATHS[plan.visibility]
+        ]
+        light_action = ensure_template_action(
+            templates,
+            f"SceneBuildup_LIGHT_{plan.visibility}",
+            _signature_string(f"LIGHT_{plan.visibility}", row),
+            channels,
+        )
+        for light_obj in plan.child_lights[i]:
+            remove_action_fcurves(light_obj, ALL_VISIBILITY_PATHS, cache)
+            remove_buildup_drivers(light_obj)
+            assign_template_strip(light_obj, light_action, plan.start_frames[i])
+            light_obj.hide_viewport = False
+            light_obj.hide_render = False
+
+
+# ============================================================================
+# Keyframe Planner
+# ============================================================================
+
+ANIMATED_EFFECTS = ('GROW_FROM_FLOOR', 'GROW_OVERSHOOT', 'FALL_DOWN')
+
+
+def read_object_vectors(objects, attr, width=3):
+    """Read a vector property of many objects into an (N, width) array
+
+    Takes one foreach_get call for bpy collections such as
+    view_layer.objects.selected, falls back to per-object reads for lists.
+    """
+    data = np.empty(len(objects) * width, dtype=np.float32)
+    if hasattr(objects, 'foreach_get'):
+        objects.foreach_get(attr, data)
+    else:
+        for i, obj in enumerate(objects):
+            data[i * width:(i + 1) * width] = getattr(obj, attr)
+    return data.reshape(-1, width)
+
+
+def local_fall_directions(objects):
+    """World +Z expressed in each object's parent-local space, as (N, 3)
+
+    This is column 2 of the inverse parent rotation; unparented objects get
+    plain +Z. Only objects with a parent need a matrix read.
+    """
+    directions = np.zeros((len(objects), 3), dtype=np.float32)
+    directions[:, 2] = 1.0
+    parented = [i for i, obj in enumerate(objects) if obj.parent]
+    if parented:
+        parent_rotations = np.array([
+            objects[i].parent.matrix_world.to_3x3() for i in parented
+        ], dtype=np.float64)
+        directions[parented] = np.linalg.inv(parent_rotations)[:, :, 2]
+    return directions
+
+
+def child_lights_by_parent():
+    """Map each object to its child light objects in one pass over the file
+
+    Object.children scans every object in the file, so calling it per object
+    is quadratic on large scenes.
+    """
+    lights = {}
+    for obj in bpy.data.objects:
+        if obj.type == 'LIGHT' and obj.parent is not None:
+            lights.setdefault(obj.parent, []).append(obj)
+    return lights
+
+
+class BuildupPlan:
+    """Keyframe times and values for a batch of objects sharing one effect
+
+    Each channel is (data_path, index, group, interpolation, frames, values)
+    with frames and values shaped (object_count, key_count). Rows line up
+    with ``objects``.
+    """
+
+    def __init__(self, objects, effect_type, start_frames, end_frames,
+                 visibility='HIDE'):
+        self.objects = objects
+        self.effect_type = effect_type
+        # Key in VISIBILITY_PATHS naming the properties that hide objects
+        self.visibility = visibility
+        self.start_frames = start_frames
+        self.end_frames = end_frames
+        self.channels = []
+        # Data paths whose keys all get Bezier interpolation after writing
+        self.bezier_paths = set()
+        # (data_path, index) of channels too object-specific to share, see
+        # write_template_plan()
+        self.object_channels = set()
+        # Per-object child lights, hidden until the parent animation ends
+        self.child_lights = [()] * len(objects)
+        self.light_frames = None
+        self.light_hidden = None
+
+    def __len__(self):
+        return len(self.objects)
+
+    def add_channel(self, data_path, index, frames, values,
+                    interpolation='BEZIER', group=""):
+        """Add a channel; frames and values broadcast to (N, key_count)"""
+        shape = np.broadcast_shapes(np.shape(frames), np.shape(values))
+        shape = (len(self.objects), shape[-1])
+        self.channels.append((
+            data_path,
+            index,
+            group,
+            interpolation,
+            np.broadcast_to(np.asarray(frames, dtype=np.float32), shape),
+            np.broadcast_to(np.asarray(values, dtype=np.float32), shape),
+        ))
+
+
+def plan_buildup(objects, effect_type, start_frame, duration,
+                 floor_offset=-0.05, fall_height=0.5,
+                 overshoot_amount=0.15, overshoot_settle_ratio=0.2,
+                 use_delta=False, lights=None, visibility='HIDE'):
+    """Compute the keyframes of one buildup effect for many objects at once
+
+    Transforms are read with a couple of foreach_get calls and every key time
+    and value is computed with NumPy, so the cost grows with array size
+    rather than with per-object RNA access. Pass a bpy collection (e.g.
+    view_layer.objects.selected) to get the bulk reads. Timing and effect
+    parameters are scalars or per-object arrays.
+
+    With use_delta the keys target delta_location/delta_scale relative to the
+    object's rest transform, which lets objects share template actions.
+    lights is an optional child_lights_by_parent() result to reuse.
+    visibility picks the properties keyed to hide objects before they
+    appear (see VISIBILITY_PATHS); 'RAY' also keys zero scale so hidden
+    objects vanish from the viewport without leaving the depsgraph, and
+    'COLLECTION' keys nothing and leaves hiding to assign_start_buckets().
+    """
+    count = len(objects)
+
+    def per_object(value, dtype=np.float32):
+        return np.broadcast_to(np.asarray(value, dtype=dtype), (count,))
+
+    start = per_object(start_frame, np.int64)
+    duration = per_object(duration, np.int64)
+    end = start + duration
+    plan = BuildupPlan(list(objects), effect_type, start, end, visibility)
+
+    if effect_type not in ANIMATED_EFFECTS or count == 0:
+        return plan
+
+    # Hidden before the animation starts, shown from start_frame on. With
+    # start_frame 0 both keys land on frame 0 and the later (shown) one wins.
+    visibility_frames = np.column_stack((np.maximum(start - 1, 0), start))
+    visibility_keys = visibility_values(visibility, (1.0, 0.0))
+    for data_path in VISIBILITY_PATHS[visibility]:
+        plan.add_channel(
+            data_path, 0, visibility_frames, visibility_keys, 'CONSTANT'
+        )
+
+    location = read_object_vectors(objects, "location")
+    floor = per_object(floor_offset)
+    if use_delta:
+        # Delta transforms stack on the untouched location and scale, so the
+        # floor becomes an offset from the object's own height
+        location_path, scale_path = "delta_location", "delta_scale"
+        rest_location = read_object_vectors(objects, "delta_location")
+        floor = floor - location[:, 2] + rest_location[:, 2]
+    else:
+        location_path, scale_path = "location", "scale"
+        rest_location = location
+
+    if effect_type in ('GROW_FROM_FLOOR', 'GROW_OVERSHOOT'):
+        scale = read_object_vectors(objects, scale_path)
+        zeros = np.zeros(count, dtype=np.float32)
+        location_z = rest_location[:, 2]
+
+        if effect_type == 'GROW_FROM_FLOOR':
+            frames = np.column_stack((start, end))
+            z_values = np.column_stack((floor, location_z))
+            scale_keys = [np.column_stack((zeros, scale[:, i])) for i in range(3)]
+        else:
+            # Same truncation as int() for the positive durations we allow
+            settle_frames = np.maximum(
+                1, np.floor(duration * per_object(overshoot_settle_ratio))
+            ).astype(np.int64)
+            overshoot_frame = end - settle_frames
+            overshoot = 1.0 + per_object(overshoot_amount)
+
+            frames = np.column_stack((start, overshoot_frame, end))
+            z_values = np.column_stack((floor, location_z, location_z))
+            scale_keys = [
+                np.column_stack((zeros, scale[:, i] * overshoot, scale[:, i]))
+                for i in range(3)
+            ]
+
+        plan.add_channel(location_path, 2, frames, z_values, group=TRANSFORM_GROUP)
+        if use_delta:
+            # The rise depends on each object's height
+            plan.object_channels.add((location_path, 2))
+        for index, values in enumerate(scale_keys):
+            plan.add_channel(scale_path, index, frames, values, group=TRANSFORM_GROUP)
+        plan.bezier_paths = {location_path, scale_path}
+
+    elif effect_type == 'FALL_DOWN':
+        local_fall = local_fall_directions(plan.objects)
+        local_fall *= per_object(fall_height)[:, None]
+
+        frames = np.column_stack((start, end))
+        for index in range(3):
+            values = np.column_stack((
+                rest_location[:, index] + local_fall[:, index],
+                rest_location[:, index],
+            ))
+            plan.add_channel(location_path, index, frames, values, group=TRANSFORM_GROUP)
+        plan.bezier_paths = {location_path}
+
+        if visibility == 'RAY':
+            # Growing effects already start at zero scale, falling objects
+            # need it keyed to stay out of the viewport until they appear
+            scale = read_object_vectors(objects, scale_path)
+            zeros = np.zeros(count, dtype=np.float32)
+            for index in range(3):
+                plan.add_channel(
+                    scale_path, index, visibility_frames,
+                    np.column_stack((zeros, scale[:, index])),
+                    'CONSTANT', TRANSFORM_GROUP,
+                )
+
+    # Child lights stay hidden until the parent animation completes
+    if lights is None:
+        lights = child_lights_by_parent()
+    plan.child_lights = [tuple(lights.get(obj, ())) for obj in plan.objects]
+    plan.light_frames = np.column_stack(
+        (np.maximum(start - 1, 0), start, end - 1, end)
+    )
+    plan.light_hidden = np.array([1.0, 1.0, 1.0, 0.0], dtype=np.float32)
+
+    return plan
+
+
+def write_buildup_plan(plan, start=0, stop=None, shared_action=None, cache=None):
+    """Write the keyframes of plan.objects[start:stop] as F-curves
+
+    Objects without an action get a slot in shared_action when one is given,
+    instead of an action of their own.
+    """
+    if stop is None:
+        stop = len(plan)
+    cache = cache or FCurveCache()
+
+    # Keys left by another visibility strategy would still hide the object
+    stale = ALL_VISIBILITY_PATHS.difference(VISIBILITY_PATHS[plan.visibility])
+
+    for i in range(start, stop):
+        obj = plan.objects[i]
+        clear_transform_keys(obj, cache)
+        remove_action_fcurves(obj, stale, cache)
+        remove_buildup_tracks(obj)
+        remove_buildup_drivers(obj)
+        remove_progress_property(obj, cache)
+        if not plan.channels:
+            continue
+
+        action = ensure_action(obj, shared_action)
+        for data_path, index, group, interpolation, frames, values in plan.channels:
+            fcurve = ensure_fcurve(obj, action, data_path, index, group)
+            write_keyframes(fcurve, frames[i], values[i], interpolation)
+        set_interpolation(obj, plan.bezier_paths, cache=cache)
+
+        # Final state matches the keys at end_frame
+        obj.hide_viewport = False
+        obj.hide_render = False
+
+        for light_obj in plan.child_lights[i]:
+            remove_action_fcurves(light_obj, stale, cache)
+            remove_buildup_drivers(light_obj)
+            if VISIBILITY_PATHS[plan.visibility]:
+                light_action = ensure_action(light_obj, shared_action)
+                write_visibility_keys(
+                    light_obj, light_action, plan.light_frames[i],
+                    plan.light_hidden, plan.visibility,
+                )
+            light_obj.hide_viewport = False
+            light_obj.hide_render = False
+
+
+# ============================================================================
+# Driver Engine
+# ============================================================================
+
+# Custom property holding the keyed progress for the 'PROPERTY' source
+PROGRESS_PROPERTY = "buildup_progress"
+
+
+def _is_buildup_driver(fcurve):
+    """True if a driver reads buildup settings or progress"""
+    for variable in fcurve.driver.variables:
+        path = variable.targets[0].data_path
+        if path.startswith("scene_buildup.") or path == f'["{PROGRESS_PROPERTY}"]':
+            return True
+    return False
+
+
+def remove_buildup_drivers(obj):
+    """Remove drivers added by the driver engine from the object"""
+    if not obj.animation_data:
+        return
+    drivers = obj.animation_data.drivers
+    for fcurve in [fc for fc in drivers if _is_buildup_driver(fc)]:
+        drivers.remove(fcurve)
+
+
+def add_simple_driver(obj, data_path, index, expression, variables):
+    """Drive a property with a simple expression
+
+    variables holds (name, source_object, data_path) triples. Expressions
+    stick to arithmetic, comparisons and clamp/lerp/smoothstep, so Blender
+    evaluates them without Python.
+    """
+    if index < 0:
+        fcurve = obj.driver_add(data_path)
+    else:
+        fcurve = obj.driver_add(data_path, index)
+    driver = fcurve.driver
+    driver.type = 'SCRIPTED'
+    for name, source, source_path in variables:
+        variable = driver.variables.new()
+        variable.name = name
+        variable.type = 'SINGLE_PROP'
+        variable.targets[0].id_type = 'OBJECT'
+        variable.targets[0].id = source
+        variable.targets[0].data_path = source_path
+    driver.expression = expression
+    return fcurve
+
+
+def _number(value):
+    # Fixed notation, the simple expression parser has no exponent support
+    return f"{float(value):.6f}"
+
+
+def _progress_terms(obj, progress_source):
+    """Driver variables and linear progress expression for one object
+
+    Progress runs from 0 at start_frame to 1 at start_frame + duration and
+    is negative while the object is still hidden.
+    """
+    variables = [
+        ("s", obj, "scene_buildup.start_frame"),
+        ("d", obj, "scene_buildup.duration"),
+    ]
+    if progress_source == 'PROPERTY':
+        variables.append(("t", obj, f'["{PROGRESS_PROPERTY}"]'))
+        return variables, "t"
+    return variables, "((frame - s) / d)"
+
+
+def remove_progress_property(obj, cache=None):
+    """Remove the buildup_progress property and its F-curve from the object
+
+    Keys left on the curve would merge with the keys of a retimed apply.
+    """
+    remove_action_fcurves(obj, {f'["{PROGRESS_PROPERTY}"]'}, cache)
+    if PROGRESS_PROPERTY in obj:
+        del obj[PROGRESS_PROPERTY]
+
+
+def key_progress_property(obj, start_frame, end_frame, shared_action=None):
+    """Key the linear buildup_progress property driving the object"""
+    obj[PROGRESS_PROPERTY] = 0.0
+    action = ensure_action(obj, shared_action)
+    fcurve = ensure_fcurve(obj, action, f'["{PROGRESS_PROPERTY}"]')
+    if start_frame > 0:
+        # Stay negative (hidden) until the animation starts
+        write_keyframes(fcurve, (start_frame - 1,), (-1.0,), 'CONSTANT')
+    write_keyframes(fcurve, (start_frame, end_frame), (0.0, 1.0), 'LINEAR')
+
+
+def apply_buildup_drivers(objects, effect_type, progress_source='FRAME',
+                          shared_action=None, lights=None, visibility='HIDE'):
+    """Build the effect from drivers instead of baked transform keyframes
+
+    Start frame, duration and effect parameters are read live from each
+    object's scene_buildup settings, so retiming only means editing those
+    values. With the 'PROPERTY' source a single buildup_progress property is
+    keyed per object and everything else derives from it. lights is an
+    optional child_lights_by_parent() result to reuse, visibility picks the
+    driven properties as in plan_buildup().
+    """
+    source = objects
+    objects = list(objects)
+    if not objects:
+        return
+    location = read_object_vectors(source, "location")
+    scale = read_object_vectors(source, "scale")
+    if effect_type == 'FALL_DOWN':
+        fall_directions = local_fall_directions(objects)
+    if lights is None:
+        lights = child_lights_by_parent()
+    cache = FCurveCache()
+
+    # Keys on the object's own action would be overridden by the drivers
+    overridden = set(ALL_VISIBILITY_PATHS)
+    if effect_type == 'FALL_DOWN':
+        overridden.add("location")
+    visibility_paths = VISIBILITY_PATHS[visibility]
+    # Driven visibility values of objects and their child lights
+    if visibility == 'HIDE':
+        object_state, light_state = "{t} < 0", "{t} < 1"
+    else:
+        object_state, light_state = "{t} >= 0", "{t} >= 1"
+
+    # Bezier keys between two flat keys ease exactly like smoothstep
+    rise = "smoothstep(0, 1, {t})"
+    if effect_type == 'GROW_OVERSHOOT':
+        peak = "max((d - max(1, floor(d * r))) / d, 0.001)"
+        rise = f"smoothstep(0, {peak}, {{t}})"
+        settle = f"smoothstep({peak}, 1, {{t}})"
+
+    for i, obj in enumerate(objects):
+        clear_transform_keys(obj, cache)
+        remove_action_fcurves(obj, overridden, cache)
+        remove_buildup_tracks(obj)
+        remove_buildup_drivers(obj)
+        remove_progress_property(obj, cache)
+        if effect_type not in ANIMATED_EFFECTS:
+            continue
+
+        variables, t = _progress_terms(obj, progress_source)
+        if progress_source == 'PROPERTY':
+            props = obj.scene_buildup
+            key_progress_property(
+                obj, props.start_frame, props.start_frame + props.duration,
+                shared_action
+            )
+
+        for data_path in visibility_paths:
+            add_simple_driver(obj, data_path, -1, object_state.format(t=t), variables)
+
+        if effect_type in ('GROW_FROM_FLOOR', 'GROW_OVERSHOOT'):
+            grow_vars = variables + [("f", obj, "scene_buildup.floor_offset")]
+            if effect_type == 'GROW_OVERSHOOT':
+                grow_vars += [
+                    ("a", obj, "scene_buildup.overshoot_amount"),
+                    ("r", obj, "scene_buildup.overshoot_settle_ratio"),
+                ]
+                factor = f"({rise} * (1 + a) - {settle} * a)".format(t=t)
+            else:
+                factor = rise.format(t=t)
+
+            add_simple_driver(
+                obj, "location", 2,
+                f"lerp(f, {_number(location[i, 2])}, {rise.format(t=t)})",
+                grow_vars,
+            )
+            for index in range(3):
+                add_simple_driver(
+                    obj, "scale", index,
+                    f"{_number(scale[i, index])} * {factor}",
+                    grow_vars,
+                )
+
+        elif effect_type == 'FALL_DOWN':
+            fall_vars = variables + [("h", obj, "scene_buildup.fall_height")]
+            for index in range(3):
+                direction = fall_directions[i, index]
+                if abs(direction) < 1e-6:
+                    continue
+                add_simple_driver(
+                    obj, "location", index,
+                    f"{_number(location[i, index])} + {_number(direction)} * h"
+                    f" * (1 - {rise.format(t=t)})",
+                    fall_vars,
+                )
+            if visibility == 'RAY':
+                for index in range(3):
+                    add_simple_driver(
+                        obj, "scale", index,
+                        f"{_number(scale[i, index])} * ({t} >= 0)",
+                        variables,
+                    )
+
+        obj.hide_viewport = False
+        obj.hide_render = False
+
+        # Child lights stay hidden until the parent's progress completes
+        for light_obj in lights.get(obj, ()):
+            remove_action_fcurves(light_obj, ALL_VISIBILITY_PATHS, cache)
+            remove_buildup_tracks(light_obj)
+            remove_buildup_drivers(light_obj)
+            for data_path in visibility_paths:
+                add_simple_driver(
+                    light_obj, data_path, -1, light_state.format(t=t), variables
+                )
+            light_obj.hide_viewport = False
+            light_obj.hide_render = False
+
+
+# ============================================================================
+# Start Frame Buckets
+# ============================================================================
+
+# Marks the collection holding a scene's buckets, and each bucket's frame
+BUCKET_ROOT = "scene_buildup_buckets"
+BUCKET_FRAME = "scene_buildup_frame"
+
+
+def bucket_root(scene, create=False):
+    """Collection holding the scene's start frame buckets"""
+    for collection in scene.collection.children:
+        if collection.get(BUCKET_ROOT):
+            return collection
+    if not create:
+        return None
+    root = bpy.data.collections.new("SceneBuildup Buckets")
+    root[BUCKET_ROOT] = True
+    scene.collection.children.link(root)
+    return root
+
+
+def object_buckets(obj):
+    """Bucket collections the object is currently linked to"""
+    return [c for c in obj.users_collection if BUCKET_FRAME in c]
+
+
+def assign_start_buckets(scene, objects, frames, prune=True):
+    """Move objects into the bucket collection revealed at their frame
+
+    Collections cannot be keyed, so each bucket stores its reveal frame and
+    a frame change handler toggles its visibility: one switch per distinct
+    frame instead of visibility curves on every object. The collections an
+    object came from are kept in home_collections for
+    release_start_buckets(). Buckets left empty are removed unless prune is
+    False, which keeps them for a rollback to move objects back into.
+    """
+    root = bucket_root(scene, create=True)
+    buckets = {int(c[BUCKET_FRAME]): c for c in root.children if BUCKET_FRAME in c}
+    for obj, frame in zip(objects, frames):
+        frame = int(frame)
+        bucket = buckets.get(frame)
+        if bucket is None:
+            bucket = bpy.data.collections.new(f"SceneBuildup Frame {frame:04d}")
+            bucket[BUCKET_FRAME] = frame
+            root.children.link(bucket)
+            buckets[frame] = bucket
+
+        current = obj.users_collection
+        if current == (bucket,):
+            continue
+        if not object_buckets(obj):
+            homes = obj.scene_buildup.home_collections
+            homes.clear()
+            for collection in current:
+                homes.add().collection = collection
+        if bucket not in current:
+            bucket.objects.link(obj)
+        for collection in current:
+            if collection != bucket:
+                collection.objects.unlink(obj)
+
+    if prune:
+        remove_empty_buckets(scene)
+    sync_start_buckets(scene)
+
+
+def release_start_buckets(scene, objects, prune=True):
+    """Move bucketed objects back to the collections they came from"""
+    released = False
+    for obj in objects:
+        buckets = object_buckets(obj)
+        if not buckets:
+            continue
+        homes = obj.scene_buildup.home_collections
+        # Home collections deleted since leave the object in the scene root
+        targets = [item.collection for item in homes if item.collection]
+        for collection in targets or [scene.collection]:
+            if obj.name not in collection.objects:
+                collection.objects.link(obj)
+        for bucket in buckets:
+            bucket.objects.unlink(obj)
+        homes.clear()
+        released = True
+    if released and prune:
+        remove_empty_buckets(scene)
+
+
+def remove_empty_buckets(scene):
+    """Remove buckets without objects, and the root once it is empty"""
+    root = bucket_root(scene)
+    if root is None:
+        return
+    for bucket in list(root.children):
+        if BUCKET_FRAME in bucket and not bucket.objects and not bucket.children:
+            bpy.data.collections.remove(bucket)
+    if not root.children and not root.objects:
+        bpy.data.collections.remove(root)
+
+
+def sync_start_buckets(scene):
+    """Show buckets whose frame has been reached, hide the others"""
+    root = bucket_root(scene)
+    if root is None:
+        return
+    frame = scene.frame_current
+    for bucket in root.children:
+        if BUCKET_FRAME not in bucket:
+            continue
+        hidden = frame < bucket[BUCKET_FRAME]
+        # Only write on change, each write tags depsgraph relations
+        if bucket.hide_viewport != hidden:
+            bucket.hide_viewport = hidden
+        if bucket.hide_render != hidden:
+            bucket.hide_render = hidden
+
+
+@persistent
+def sync_start_buckets_handler(scene, depsgraph=None):
+    """frame_change_pre handler revealing buckets during playback and render"""
+    sync_start_buckets(scene)
+
+
+# Depth of bulk_setting_copies() blocks, update_start_bucket() does nothing
+# inside them
+_bulk_copy_depth = 0
+
+
+@contextlib.contextmanager
+def bulk_setting_copies():
+    """Suspend update_start_bucket() while copying settings to many objects
+
+    The callback scans obj.children, which walks every object in the file,
+    once per object and setting. Callers re-bucket the objects themselves
+    afterwards, in one assign_start_buckets() call using a prebuilt
+    child_lights_by_parent() map.
+    """
+    global _bulk_copy_depth
+    _bulk_copy_depth += 1
+    try:
+        yield
+    finally:
+        _bulk_copy_depth -= 1
+
+
+def update_start_bucket(self, context):
+    """Keep driver-engine objects in the bucket of their live start frame"""
+    obj = self.id_data
+    if (
+        _bulk_copy_depth
+        or self.animation_engine != 'DRIVERS'
+        or self.visibility_mode != 'COLLECTION'
+        or context.scene is None
+        or not object_buckets(obj)
+    ):
+        return
+    lights = [child for child in obj.children if child.type == 'LIGHT']
+    assign_start_buckets(
+        context.scene,
+        [obj] + lights,
+        [self.start_frame] + [self.start_frame + self.duration] * len(lights),
+        # Apply copies settings mid-run and may still roll back into the old
+        # bucket, emptied buckets are pruned when Apply or Clear finishes
+        prune=False,
+    )
+
+
+# ============================================================================
+# Geometry Nodes Instancer
+# ============================================================================
+
+INSTANCER_GROUP = "SceneBuildup Instancer"
+
+# Start frame given to static (NONE) instances so they are always built
+STATIC_START = -1.0e6
+
+
+def matrices_to_transforms(matrices):
+    """Split (N, 4, 4) world matrices into location, XYZ Euler and scale"""
+    location = matrices[:, :3, 3]
+    basis = matrices[:, :3, :3]
+    scale = np.linalg.norm(basis, axis=1)
+    # Mirrored objects: fold the flip into the X scale
+    flipped = np.linalg.det(basis) < 0
+    scale[flipped, 0] *= -1.0
+    rotation = basis / np.where(scale == 0.0, 1.0, scale)[:, None, :]
+
+    # Blender XYZ Euler: R = Rz @ Ry @ Rx
+    cos_y = np.hypot(rotation[:, 0, 0], rotation[:, 1, 0])
+    locked = cos_y < 1e-6
+    euler = np.empty((len(matrices), 3))
+    euler[:, 0] = np.where(
+        locked,
+        np.arctan2(-rotation[:, 1, 2], rotation[:, 1, 1]),
+        np.arctan2(rotation[:, 2, 1], rotation[:, 2, 2]),
+    )
+    euler[:, 1] = np.arctan2(-rotation[:, 2, 0], cos_y)
+    euler[:, 2] = np.where(
+        locked, 0.0, np.arctan2(rotation[:, 1, 0], rotation[:, 0, 0])
+    )
+    return location, euler, scale
+
+
+def _link(tree, output, input_socket):
+    tree.links.new(output, input_socket)
+
+
+def _math(tree, operation, a, b=None, location=(0, 0)):
+    """Add a float Math node fed by sockets or constants"""
+    node = tree.nodes.new('ShaderNodeMath')
+    node.operation = operation
+    node.location = location
+    for socket, value in zip(node.inputs, (a, b)):
+        if value is None:
+            continue
+        if isinstance(value, (int, float)):
+            socket.default_value = value
+        else:
+            _link(tree, value, socket)
+    return node.outputs[0]
+
+
+def _attribute(tree, name, data_type='FLOAT', location=(0, 0)):
+    node = tree.nodes.new('GeometryNodeInputNamedAttribute')
+    node.data_type = data_type
+    node.inputs["Name"].default_value = name
+    node.location = location
+    return node.outputs["Attribute"]
+
+
+def _smooth_range(tree, value, from_min, from_max, location=(0, 0)):
+    """0..1 smoothstep of value between two frames, like two flat Bezier keys"""
+    node = tree.nodes.new('ShaderNodeMapRange')
+    node.data_type = 'FLOAT'
+    node.interpolation_type = 'SMOOTHSTEP'
+    node.clamp = True
+    node.location = location
+    _link(tree, value, node.inputs["Value"])
+    _link(tree, from_min, node.inputs["From Min"])
+    _link(tree, from_max, node.inputs["From Max"])
+    return node.outputs["Result"]
+
+
+def ensure_instancer_node_group():
+    """Get or build the node group evaluating buildup effects per instance
+
+    Each point carries its prototype index, world rotation and scale plus:
+    sb_start/sb_duration (frames), sb_grow (1 for grow effects), sb_overshoot
+    (overshoot amount), sb_settle (settle frames) and sb_drop (Z offset at
+    the start). One formula covers every effect:
+
+        rise   = smoothstep(start, start + duration - settle, frame)
+        settle = smoothstep(start + duration - settle, start + duration, frame)
+        scale  = lerp(1, rise * (1 + overshoot) - settle * overshoot, grow)
+        z      = drop * (1 - rise)
+
+    and points are deleted before their start frame.
+    """
+    group = bpy.data.node_groups.get(INSTANCER_GROUP)
+    if group is not None:
+        return group
+
+    group = bpy.data.node_groups.new(INSTANCER_GROUP, 'GeometryNodeTree')
+    if hasattr(group, 'is_modifier'):
+        group.is_modifier = True
+    group.interface.new_socket(
+        name="Geometry", in_out='INPUT', socket_type='NodeSocketGeometry'
+    )
+    group.interface.new_socket(
+        name="Collection", in_out='INPUT', socket_type='NodeSocketCollection'
+    )
+    group.interface.new_socket(
+        name="Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry'
+    )
+    nodes = group.nodes
+
+    group_in = nodes.new('NodeGroupInput')
+    group_in.location = (-1400, 0)
+    group_out = nodes.new('NodeGroupOutput')
+    group_out.location = (1000, 0)
+
+    frame = nodes.new('GeometryNodeInputSceneTime')
+    frame.location = (-1400, -300)
+    frame = frame.outputs["Frame"]
+
+    start = _attribute(group, "sb_start", location=(-1200, -300))
+    duration = _attribute(group, "sb_duration", location=(-1200, -450))
+    settle_frames = _attribute(group, "sb_settle", location=(-1200, -600))
+    grow = _attribute(group, "sb_grow", location=(-1200, -750))
+    overshoot = _attribute(group, "sb_overshoot", location=(-1200, -900))
+    drop = _attribute(group, "sb_drop", location=(-1200, -1050))
+
+    end = _math(group, 'ADD', start, duration, (-1000, -350))
+    peak = _math(group, 'SUBTRACT', end, settle_frames, (-800, -350))
+    rise = _smooth_range(group, frame, start, peak, (-600, -300))
+    settle = _smooth_range(group, frame, peak, end, (-600, -550))
+
+    # growth = rise * (1 + overshoot) - settle * overshoot
+    peak_scale = _math(group, 'ADD', overshoot, 1.0, (-600, -800))
+    growth = _math(
+        group, 'SUBTRACT',
+        _math(group, 'MULTIPLY', rise, peak_scale, (-400, -450)),
+        _math(group, 'MULTIPLY', settle, overshoot, (-400, -650)),
+        (-200, -500),
+    )
+    # factor = 1 - grow * (1 - growth)
+    factor = _math(
+        group, 'SUBTRACT', 1.0,
+        _math(
+            group, 'MULTIPLY', grow,
+            _math(group, 'SUBTRACT', 1.0, growth, (0, -500)),
+            (200, -500),
+        ),
+        (400, -500),
+    )
+    z_offset = _math(
+        group, 'MULTIPLY', drop,
+        _math(group, 'SUBTRACT', 1.0, rise, (-400, -900)),
+        (-200, -900),
+    )
+
+    # Points not built yet are removed before instancing
+    hidden = _math(group, 'LESS_THAN', frame, start, (-800, 200))
+    delete = nodes.new('GeometryNodeDeleteGeometry')
+    delete.domain = 'POINT'
+    delete.location = (-600, 100)
+    _link(group, group_in.outputs["Geometry"], delete.inputs["Geometry"])
+    _link(group, hidden, delete.inputs["Selection"])
+
+    offset = nodes.new('ShaderNodeCombineXYZ')
+    offset.location = (0, -900)
+    _link(group, z_offset, offset.inputs["Z"])
+    set_position = nodes.new('GeometryNodeSetPosition')
+    set_position.location = (200, 100)
+    _link(group, delete.outputs["Geometry"], set_position.inputs["Geometry"])
+    _link(group, offset.outputs["Vector"], set_position.inputs["Offset"])
+
+    collection_info = nodes.new('GeometryNodeCollectionInfo')
+    collection_info.transform_space = 'ORIGINAL'
+    collection_info.location = (200, 400)
+    collection_info.inputs["Separate Children"].default_value = True
+    collection_info.inputs["Reset Children"].default_value = True
+    _link(group, group_in.outputs["Collection"], collection_info.inputs["Collection"])
+
+    scale = nodes.new('ShaderNodeVectorMath')
+    scale.operation = 'SCALE'
+    scale.location = (600, -300)
+    _link(
+        group,
+        _attribute(group, "sb_scale", 'FLOAT_VECTOR', (400, -250)),
+        scale.inputs[0],
+    )
+    _link(group, factor, scale.inputs["Scale"])
+
+    instance = nodes.new('GeometryNodeInstanceOnPoints')
+    instance.location = (800, 100)
+    _link(group, set_position.outputs["Geometry"], instance.inputs["Points"])
+    _link(group, collection_info.outputs[0], instance.inputs["Instance"])
+    instance.inputs["Pick Instance"].default_value = True
+    _link(
+        group,
+        _attribute(group, "sb_proto", 'INT', (600, 0)),
+        instance.inputs["Instance Index"],
+    )
+    _link(
+        group,
+        _attribute(group, "sb_rotation", 'FLOAT_VECTOR', (600, -150)),
+        instance.inputs["Rotation"],
+    )
+    _link(group, scale.outputs[0], instance.inputs["Scale"])
+    _link(group, instance.outputs["Instances"], group_out.inputs["Geometry"])
+
+    return group
+
+
+def _set_point_attribute(mesh, name, attr_type, values):
+    attribute = mesh.attributes.new(name=name, type=attr_type, domain='POINT')
+    field = "vector" if attr_type == 'FLOAT_VECTOR' else "value"
+    attribute.data.foreach_set(field, np.ascontiguousarray(values).ravel())
+
+
+def build_instancer(objects, name, collection):
+    """Pack mesh objects into one Geometry Nodes instancer object
+
+    Objects sharing a mesh share one prototype. Every instance carries its
+    object's buildup settings as point attributes, and the node group from
+    ensure_instancer_node_group() animates all of them in one evaluation.
+    The source objects are hidden. Returns the instancer object.
+    """
+    source = objects
+    objects = [obj for obj in objects if obj.type == 'MESH']
+    count = len(objects)
+
+    # Matrix props come out of foreach_get column-major
+    if len(objects) == len(source) and hasattr(source, 'foreach_get'):
+        matrices = np.empty(count * 16, dtype=np.float32)
+        source.foreach_get("matrix_world", matrices)
+        matrices = matrices.reshape(-1, 4, 4).transpose(0, 2, 1)
+    else:
+        matrices = np.array([obj.matrix_world for obj in objects])
+    location, rotation, scale = matrices_to_transforms(
+        matrices.astype(np.float64)
+    )
+
+    # One prototype object per unique mesh, all at the origin
+    proto_collection = bpy.data.collections.new(f"{name}_Prototypes")
+    proto_of_mesh = {}
+    prototypes = []
+    proto_index = np.empty(count, dtype=np.int32)
+    for i, obj in enumerate(objects):
+        mesh = obj.data
+        if mesh not in proto_of_mesh:
+            proto_of_mesh[mesh] = len(prototypes)
+            proto = bpy.data.objects.new(
+                f"{name}_{len(prototypes):06d}", mesh
+            )
+            proto_collection.objects.link(proto)
+            prototypes.append(proto)
+        proto_index[i] = proto_of_mesh[mesh]
+
+    # Collection Info outputs separated children sorted by name
+    rank = np.empty(len(prototypes), dtype=np.int32)
+    rank[sorted(range(len(prototypes)), key=lambda i: prototypes[i].name)] = (
+        np.arange(len(prototypes))
+    )
+    proto_index = rank[proto_index]
+
+    # Per-instance effect parameters from each object's own settings
+    start = np.full(count, STATIC_START, dtype=np.float32)
+    duration = np.ones(count, dtype=np.float32)
+    grow = np.zeros(count, dtype=np.float32)
+    overshoot = np.zeros(count, dtype=np.float32)
+    settle = np.zeros(count, dtype=np.float32)
+    drop = np.zeros(count, dtype=np.float32)
+    for i, obj in enumerate(objects):
+        props = obj.scene_buildup
+        if not props.enabled or props.effect_type not in ANIMATED_EFFECTS:
+            continue
+        start[i] = props.start_frame
+        duration[i] = props.duration
+        if props.effect_type == 'FALL_DOWN':
+            drop[i] = props.fall_height
+            continue
+        grow[i] = 1.0
+        # World floor height relative to the object's world origin
+        drop[i] = props.floor_offset - location[i, 2]
+        if props.effect_type == 'GROW_OVERSHOOT':
+            overshoot[i] = props.overshoot_amount
+            settle[i] = max(1, int(props.duration * props.overshoot_settle_ratio))
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(count)
+    mesh.vertices.foreach_set("co", location.astype(np.float32).ravel())
+    _set_point_attribute(mesh, "sb_proto", 'INT', proto_index)
+    _set_point_attribute(mesh, "sb_rotation", 'FLOAT_VECTOR', rotation.astype(np.float32))
+    _set_point_attribute(mesh, "sb_scale", 'FLOAT_VECTOR', scale.astype(np.float32))
+    _set_point_attribute(mesh, "sb_start", 'FLOAT', start)
+    _set_point_attribute(mesh, "sb_duration", 'FLOAT', duration)
+    _set_point_attribute(mesh, "sb_grow", 'FLOAT', grow)
+    _set_point_attribute(mesh, "sb_overshoot", 'FLOAT', overshoot)
+    _set_point_attribute(mesh, "sb_settle", 'FLOAT', settle)
+    _set_point_attribute(mesh, "sb_drop", 'FLOAT', drop)
+    mesh.update()
+
+    instancer = bpy.data.objects.new(name, mesh)
+    collection.objects.link(instancer)
+    modifier = instancer.modifiers.new(name="SceneBuildup", type='NODES')
+    modifier.node_group = ensure_instancer_node_group()
+    collection_socket = next(
+        item for item in modifier.node_group.interface.items_tree
+        if item.item_type == 'SOCKET'
+        and item.in_out == 'INPUT'
+        and item.name == "Collection"
+    )
+    modifier[collection_socket.identifier] = proto_collection
+
+    # Sources are replaced by their instances
+    cache = FCurveCache()
+    for obj in objects:
+        # A template strip or buildup keys would show the source again
+        clear_transform_keys(obj, cache)
+        remove_action_fcurves(obj, ALL_VISIBILITY_PATHS, cache)
+        remove_buildup_tracks(obj)
+        remove_buildup_drivers(obj)
+        remove_progress_property(obj, cache)
+        obj.hide_viewport = True
+        obj.hide_render = True
+
+    return instancer
+
+
+# ============================================================================
+# Light Placement
+# ============================================================================
+
+# Light colors of the light_color_temp presets
+LIGHT_COLORS = {
+    'WARM': (1.0, 0.95, 0.8),
+    'NEUTRAL': (1.0, 1.0, 1.0),
+    'COOL': (0.9, 1.0, 1.0),
+}
+
+
+def read_loop_layout(mesh):
+    """Vertex index of every loop and first loop of every face"""
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    loop_starts = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_starts)
+    return loop_verts, loop_starts
+
+
+def connected_components(vert_count, edges):
+    """Island label of every vertex, given (E, 2) vertex index pairs
+
+    Vectorized union-find: each pass hooks the root of every edge end onto
+    the smaller of the two roots, then pointer jumping flattens the trees,
+    until both ends of every edge share a root. Labels are root indices.
+    """
+    parent = np.arange(vert_count)
+    if not len(edges):
+        return parent
+    first, second = edges[:, 0], edges[:, 1]
+    while True:
+        root_first = parent[first]
+        root_second = parent[second]
+        if np.array_equal(root_first, root_second):
+            return parent
+        low = np.minimum(root_first, root_second)
+        np.minimum.at(parent, root_first, low)
+        np.minimum.at(parent, root_second, low)
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+
+class MeshSelection:
+    """Selected vertices and faces of a mesh as arrays, in local space
+
+    coords holds the positions of the selected vertices and normals the
+    normals of the selected faces, both read with foreach_get.
+    """
+
+    def __init__(self, mesh, vertices, faces):
+        self.mesh = mesh
+        self.vertices = vertices
+        self.faces = faces
+
+        coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", coords)
+        normals = np.empty(len(mesh.polygons) * 3, dtype=np.float32)
+        mesh.polygons.foreach_get("normal", normals)
+        self.coords = coords.reshape(-1, 3)[vertices]
+        self.normals = normals.reshape(-1, 3)[faces]
+
+    def __len__(self):
+        return len(self.coords)
+
+    def islands(self):
+        """Split into one (coords, normals, faces) triple per connected island
+
+        Vertices connect through edges with both ends selected, faces go
+        to the island of their first vertex. faces are mesh face indices.
+        """
+        mesh = self.mesh
+        edges = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+        mesh.edges.foreach_get("vertices", edges)
+        edges = edges.reshape(-1, 2)
+        edges = edges[self.vertices[edges].all(axis=1)]
+        labels = connected_components(len(self.vertices), edges)
+
+        loop_verts, loop_starts = read_loop_layout(mesh)
+        vert_labels = labels[self.vertices]
+        face_labels = labels[loop_verts[loop_starts]][self.faces]
+        face_indices = np.flatnonzero(self.faces)
+        return [
+            (
+                self.coords[vert_labels == label],
+                self.normals[face_labels == label],
+                face_indices[face_labels == label],
+            )
+            for label in np.unique(vert_labels)
+        ]
+
+
+def read_edit_selection(obj):
+    """Selected vertices and faces of an object in Edit Mode
+
+    Flushes the edit BMesh to the mesh once, then reads everything with
+    foreach_get instead of walking BMesh elements in Python.
+    """
+    obj.update_from_editmode()
+    mesh = obj.data
+
+    selected = np.empty(len(mesh.vertices), dtype=bool)
+    mesh.vertices.foreach_get("select", selected)
+    faces = np.empty(len(mesh.polygons), dtype=bool)
+    mesh.polygons.foreach_get("select", faces)
+
+    return MeshSelection(mesh, selected, faces)
+
+
+# Attribute types readable as element masks, with their foreach_get dtype
+MASK_ATTRIBUTE_TYPES = {
+    'BOOLEAN': bool,
+    'FLOAT': np.float32,
+    'INT': np.int32,
+    'INT8': np.int8,
+}
+
+
+def vertex_group_mask(mesh, group_index):
+    """Vertices with a weight above zero in the vertex group
+
+    Weights are not exposed to foreach_get, so this takes one pass over a
+    temporary BMesh deform layer; no Edit Mode needed.
+    """
+    import bmesh
+
+    bm = bmesh.new()
+    try:
+        bm.from_mesh(mesh)
+        layer = bm.verts.layers.deform.active
+        if layer is None:
+            return np.zeros(len(bm.verts), dtype=bool)
+        return np.fromiter(
+            (v[layer].get(group_index, 0.0) > 0.0 for v in bm.verts),
+            dtype=bool,
+            count=len(bm.verts),
+        )
+    finally:
+        bm.free()
+
+
+def read_marked_selection(obj, name):
+    """Like read_edit_selection(), for elements marked by a group or attribute
+
+    A vertex group marks vertices weighted above zero, a point or face
+    attribute marks elements with non-zero values. Faces count as marked
+    when all their vertices are, as with vertex selection in Edit Mode.
+    Returns None when the mesh has no usable group or attribute of that name.
+    """
+    mesh = obj.data
+    group_index = obj.vertex_groups.find(name)
+    attribute = mesh.attributes.get(name)
+    if group_index < 0 and (
+        attribute is None
+        or attribute.domain not in ('POINT', 'FACE')
+        or attribute.data_type not in MASK_ATTRIBUTE_TYPES
+    ):
+        return None
+
+    vert_count = len(mesh.vertices)
+    face_count = len(mesh.polygons)
+    loop_verts, loop_starts = read_loop_layout(mesh)
+
+    if group_index >= 0:
+        marked = vertex_group_mask(mesh, group_index)
+        faces = None
+    else:
+        values = np.empty(
+            len(attribute.data), dtype=MASK_ATTRIBUTE_TYPES[attribute.data_type]
+        )
+        attribute.data.foreach_get("value", values)
+        if attribute.domain == 'POINT':
+            marked = values != 0
+            faces = None
+        else:
+            faces = values != 0
+            loop_totals = np.diff(np.append(loop_starts, len(loop_verts)))
+            marked = np.zeros(vert_count, dtype=bool)
+            marked[loop_verts[np.repeat(faces, loop_totals)]] = True
+
+    if faces is None:
+        faces = (
+            np.logical_and.reduceat(marked[loop_verts], loop_starts)
+            if face_count else np.zeros(0, dtype=bool)
+        )
+
+    return MeshSelection(mesh, marked, faces)
+
+
+def to_world(coords, matrix_world):
+    """Transform (N, 3) local positions by an object matrix in one multiply"""
+    matrix = np.array(matrix_world, dtype=np.float64)
+    return coords @ matrix[:3, :3].T + matrix[:3, 3]
+
+
+def _normalized(vector):
+    # Like Vector.normalize(), zero vectors stay zero
+    length = np.linalg.norm(vector)
+    return vector / length if length > 0.0 else vector
+
+
+def average_normal(normals, matrix_world):
+    """World-space average of local face normals, None without faces"""
+    if not len(normals):
+        return None
+    normal = _normalized(normals.sum(axis=0, dtype=np.float64))
+    normal = np.array(matrix_world.to_3x3(), dtype=np.float64) @ normal
+    return mathutils.Vector(_normalized(normal))
+
+
+def principal_axes(coords):
+    """Principal axes of (N, 3) positions as matrix columns, widest first
+
+    Eigenvectors of the 3x3 covariance matrix, the same axes an SVD of the
+    centered positions gives without decomposing an (N, 3) matrix.
+    """
+    centered = coords - coords.mean(axis=0)
+    _, vectors = np.linalg.eigh(centered.T @ centered)
+    return vectors[:, ::-1]
+
+
+class LightPlacement:
+    """Center, bounds and average radius of a set of world-space vertices
+
+    With oriented, the bounds follow the principal axes of the vertices
+    (an oriented bounding box) and axes holds them as matrix columns; size
+    is then measured along those axes, widest first. faces holds the
+    indices of the mesh faces the placement covers.
+    """
+
+    def __init__(self, coords, normal=None, oriented=False, faces=None):
+        self.axes = None
+        if oriented:
+            self.axes = principal_axes(coords)
+            local = coords @ self.axes
+            low = local.min(axis=0)
+            high = local.max(axis=0)
+            center = self.axes @ ((low + high) / 2.0)
+        else:
+            low = coords.min(axis=0)
+            high = coords.max(axis=0)
+            center = (low + high) / 2.0
+        self.center = mathutils.Vector(center)
+        self.size = np.maximum(high - low, 0.1)
+        self.avg_radius = float(np.linalg.norm(coords - center, axis=1).mean())
+        self.normal = normal
+        self.vertex_count = len(coords)
+        self.faces = faces
+
+    def area_rotation(self):
+        """Area light rotation with its sides on the two widest axes
+
+        The light points down its local -Z axis, along the average normal
+        when there is one and downwards otherwise.
+        """
+        x_axis, y_axis = self.axes[:, 0], self.axes[:, 1]
+        z_axis = np.cross(x_axis, y_axis)
+        facing = np.array(self.normal) if self.normal else (0.0, 0.0, -1.0)
+        if np.dot(z_axis, facing) > 0.0:
+            # Flip Z and Y to keep the basis right-handed
+            z_axis, y_axis = -z_axis, -y_axis
+        matrix = mathutils.Matrix(np.column_stack((x_axis, y_axis, z_axis)).tolist())
+        return matrix.to_quaternion()
+
+
+def selection_placements(selection, matrix_world, oriented=False,
+                         per_island=False):
+    """Light placements for a MeshSelection, one per island with per_island"""
+    parts = (
+        selection.islands() if per_island
+        else [(selection.coords, selection.normals, np.flatnonzero(selection.faces))]
+    )
+    return [
+        LightPlacement(
+            to_world(coords, matrix_world),
+            average_normal(normals, matrix_world),
+            oriented=oriented,
+            faces=faces,
+        )
+        for coords, normals, faces in parts
+    ]
+
+
+# ID property on light datablocks holding their quantized settings
+LIGHT_SIGNATURE = "scene_buildup_light_signature"
+
+# Light settings are compared at this many decimals when sharing datablocks
+LIGHT_PRECISION = 3
+
+
+def shared_light_data():
+    """Map light signatures to the light datablocks the light tools made"""
+    return {
+        light[LIGHT_SIGNATURE]: light
+        for light in bpy.data.lights
+        if LIGHT_SIGNATURE in light
+    }
+
+
+def _light_signature(light_type, values):
+    """Quantized light type and settings, equal for interchangeable lights"""
+    parts = [light_type]
+    for name, value in sorted(values.items()):
+        if isinstance(value, str):
+            parts.append(f"{name}={value}")
+        elif hasattr(value, '__len__'):
+            rounded = ",".join(f"{v:.{LIGHT_PRECISION}f}" for v in value)
+            parts.append(f"{name}=({rounded})")
+        else:
+            parts.append(f"{name}={value:.{LIGHT_PRECISION}f}")
+    return ";".join(parts)
+
+
+def create_light(source, light_type, placement, settings, collection,
+                 shared_data=None, energy=None, color=None):
+    """Create a light for placement, parented to and synced with source
+
+    settings holds the intensity, color and offset (scene_buildup of the
+    object the tool runs from), the light follows source's own animation.
+    energy and color replace the intensity and color presets when given.
+    With a shared_data dict (see shared_light_data()) lights whose quantized
+    settings match reuse one light datablock, so identical fixtures become
+    linked duplicates.
+    """
+    props = source.scene_buildup
+    values = {
+        "energy": settings.light_intensity if energy is None else energy,
+        "color": LIGHT_COLORS[settings.light_color_temp] if color is None else color,
+    }
+
+    # Configure based on light type
+    if light_type == 'AREA':
+        values["shape"] = 'RECTANGLE'
+
+        # Use two largest dimensions from bounding box
+        # Works correctly for any rotation
+        dimensions = placement.size.tolist()
+        if placement.axes is None:
+            dimensions.sort(reverse=True)
+        values["size"] = dimensions[0]  # Largest dimension
+        values["size_y"] = dimensions[1]  # Second largest
+    elif light_type == 'POINT':
+        # Average radius for soft shadow size
+        values["shadow_soft_size"] = max(placement.avg_radius, 0.1)
+
+    # Reuse a datablock with the same settings, unless edited since
+    light_data = None
+    light_name = f"{source.name}_Light"
+    if shared_data is not None:
+        signature = _light_signature(light_type, values)
+        light_data = shared_data.get(signature)
+        if light_data is not None and signature != _light_signature(
+            light_data.type, {name: getattr(light_data, name) for name in values}
+        ):
+            light_data = None
+
+    # Create light data
+    if light_data is None:
+        light_data = bpy.data.lights.new(
+            name=light_name,
+            type=light_type
+        )
+        for name, value in values.items():
+            setattr(light_data, name, value)
+        if shared_data is not None:
+            light_data[LIGHT_SIGNATURE] = signature
+            shared_data[signature] = light_data
+
+    # Create light object
+    light_obj = bpy.data.objects.new(
+        name=light_name,
+        object_data=light_data
+    )
+    light_obj[GENERATED_LIGHT] = True
+    collection.objects.link(light_obj)
+
+    center = placement.center
+    avg_normal = placement.normal
+
+    # Position light in world space (before parenting)
+    if light_type == 'AREA' and avg_normal:
+        # Offset along normal for area lights (uses settings value)
+        light_obj.location = center + (avg_normal * settings.light_offset)
+    else:
+        # Point light or no normal: place at center
+        light_obj.location = center
+
+    # Rotate area light to match surface normal
+    if light_type == 'AREA' and placement.axes is not None:
+        # Oriented fit also lines the light's sides up with the vertices
+        light_obj.rotation_mode = 'QUATERNION'
+        light_obj.rotation_quaternion = placement.area_rotation()
+    elif light_type == 'AREA' and avg_normal:
+        # Area lights point down their local -Z axis
+        default_dir = mathutils.Vector((0, 0, -1))
+        rotation_quat = default_dir.rotation_difference(avg_normal)
+        light_obj.rotation_mode = 'QUATERNION'
+        light_obj.rotation_quaternion = rotation_quat
+
+    # Parent light to source mesh (preserves world transform)
+    light_obj.parent = source
+    light_obj.matrix_parent_inverse = source.matrix_world.inverted()
+
+    # Sync with parent animation if it exists
+    if props.enabled and props.effect_type in ANIMATED_EFFECTS:
+        hide_light_until_built(light_obj, source)
+
+    return light_obj
+
+
+def hide_light_until_built(light_obj, source, scene=None):
+    """Keep a new child light hidden until its parent's buildup completes
+
+    Follows the parent's engine and visibility mode like Apply does for
+    child lights: the bucket of the parent's end frame, drivers on the
+    parent's progress or keys on the mode's properties. Keyed hide flags
+    are only used where the parent uses them too.
+    """
+    props = source.scene_buildup
+    start_frame = props.start_frame
+    end_frame = start_frame + props.duration
+    engine = props.animation_engine
+    # Keyframe Insert always keys hide flags
+    visibility = 'HIDE' if engine == 'LEGACY' else props.visibility_mode
+
+    if visibility == 'COLLECTION':
+        # Only once Apply has bucketed the parent
+        if object_buckets(source):
+            assign_start_buckets(
+                scene or bpy.context.scene, [light_obj], [end_frame]
+            )
+    elif engine == 'DRIVERS':
+        variables, t = _progress_terms(source, props.progress_source)
+        state = f"{t} < 1" if visibility == 'HIDE' else f"{t} >= 1"
+        for data_path in VISIBILITY_PATHS[visibility]:
+            add_simple_driver(light_obj, data_path, -1, state, variables)
+    else:
+        write_visibility_keys(
+            light_obj, ensure_action(light_obj),
+            (max(start_frame - 1, 0), start_frame, end_frame - 1, end_frame),
+            (1.0, 1.0, 1.0, 0.0), visibility,
+        )
+    light_obj.hide_viewport = False
+    light_obj.hide_render = False
+
+
+def lights_from_group(objects, light_type, settings, collection):
+    """Create lights on meshes from the vertices marked by a group
+
+    The group named settings.light_source_group is a vertex group or
+    attribute (see read_marked_selection()). Returns (lights created,
+    meshes skipped for lacking marked vertices).
+    """
+    name = settings.light_source_group
+    oriented = light_type == 'AREA' and settings.light_area_fit == 'OBB'
+    shared_data = shared_light_data() if settings.light_share_data else None
+
+    # Linked duplicates share their mesh, read each mesh and group once
+    selections = {}
+    created = 0
+    skipped = 0
+    for obj in objects:
+        if obj.type != 'MESH':
+            continue
+        key = (obj.data, obj.vertex_groups.find(name))
+        if key not in selections:
+            selections[key] = read_marked_selection(obj, name)
+        selection = selections[key]
+        if selection is None or not len(selection):
+            skipped += 1
+            continue
+
+        placements = selection_placements(
+            selection,
+            obj.matrix_world,
+            oriented=oriented,
+            per_island=settings.light_per_island,
+        )
+        for placement in placements:
+            create_light(
+                obj, light_type, placement, settings, collection, shared_data
+            )
+        created += len(placements)
+    return created, skipped
+
+
+# ============================================================================
+# Light Budget
+# ============================================================================
+
+# ID property marking lights made by the light tools
+GENERATED_LIGHT = "scene_buildup_light"
+
+# ID properties marking the collections the light budget manages
+ORIGINAL_LIGHTS = "scene_buildup_original_lights"
+BUDGET_LIGHTS = "scene_buildup_budget_lights"
+
+
+def kmeans_labels(points, weights, k, iterations=50, seed=0):
+    """Weighted k-means cluster label of every point, k-means++ seeding
+
+    Seeded with a fixed seed so the same lights always cluster the same way.
+    """
+    rng = np.random.default_rng(seed)
+    count = len(points)
+    centers = np.empty((k, 3))
+    centers[0] = points[rng.choice(count, p=weights / weights.sum())]
+    distance = ((points - centers[0]) ** 2).sum(axis=1)
+    for i in range(1, k):
+        total = distance.sum()
+        index = rng.choice(count, p=distance / total) if total > 0 else i
+        centers[i] = points[index]
+        distance = np.minimum(distance, ((points - centers[i]) ** 2).sum(axis=1))
+
+    labels = None
+    for _ in range(iterations):
+        # |p - c|^2 = |p|^2 - 2 p.c + |c|^2 as an (N, k) product, |p|^2 is
+        # the same for every center and drops out of the argmin
+        distances = (centers ** 2).sum(axis=1) - 2.0 * (points @ centers.T)
+        assigned = distances.argmin(axis=1)
+        if labels is not None and np.array_equal(assigned, labels):
+            break
+        labels = assigned
+        mass = np.bincount(labels, weights, minlength=k)
+        for axis in range(3):
+            moment = np.bincount(labels, weights * points[:, axis], minlength=k)
+            # Clusters that lost every point keep their center
+            centers[:, axis] = np.where(
+                mass > 0, moment / np.maximum(mass, 1e-12), centers[:, axis]
+            )
+    return labels
+
+
+def grid_labels(points, k):
+    """Cluster label of every point from the coarsest grid with <= k cells"""
+    low = points.min(axis=0)
+    extent = max(float((points.max(axis=0) - low).max()), 1e-6)
+    cell = extent / max(np.cbrt(k), 1.0)
+    while True:
+        cells = np.floor((points - low) / cell).astype(np.int64)
+        _, labels = np.unique(cells, axis=0, return_inverse=True)
+        labels = labels.reshape(-1)
+        if labels.max() < k:
+            return labels
+        cell *= 1.25
+
+
+def light_reveal_frame(light_obj):
+    """Frame a generated light appears at, when its parent's buildup ends"""
+    parent = light_obj.parent
+    if parent is None:
+        return 0
+    props = parent.scene_buildup
+    if props.enabled and props.effect_type in ANIMATED_EFFECTS:
+        return props.start_frame + props.duration
+    return 0
+
+
+def _managed_collection(scene, marker, name=None):
+    """Child collection of the scene tagged with marker, created given a name"""
+    for collection in scene.collection.children:
+        if collection.get(marker):
+            return collection
+    if name is None:
+        return None
+    collection = bpy.data.collections.new(name)
+    collection[marker] = True
+    scene.collection.children.link(collection)
+    return collection
+
+
+def apply_light_budget(scene, max_lights, method='KMEANS'):
+    """Replace generated point lights by at most max_lights stand-ins
+
+    Lights are clustered on their world positions (k-means weighted by
+    energy, or a uniform grid). Each cluster becomes one point light at its
+    energy-weighted centroid carrying the cluster's total power; energy is
+    keyed to step up as the originals would appear during the buildup.
+    Originals move to a disabled collection, see restore_light_budget().
+    Returns (original count, stand-in count).
+    """
+    restore_light_budget(scene)
+    lights = [
+        obj for obj in scene.objects
+        if obj.type == 'LIGHT' and obj.get(GENERATED_LIGHT) and obj.data.type == 'POINT'
+    ]
+    if len(lights) <= max_lights:
+        return len(lights), 0
+
+    positions = np.array([obj.matrix_world.translation for obj in lights])
+    energies = np.array([obj.data.energy for obj in lights])
+    colors = np.array([obj.data.color for obj in lights])
+    soft_sizes = np.array([obj.data.shadow_soft_size for obj in lights])
+    reveal = np.array([light_reveal_frame(obj) for obj in lights])
+    weights = np.maximum(energies, 1e-6)
+
+    if method == 'GRID':
+        labels = grid_labels(positions, max_lights)
+    else:
+        labels = kmeans_labels(positions, weights, max_lights)
+    _, labels = np.unique(labels, return_inverse=True)
+    labels = labels.reshape(-1)
+    cluster_count = labels.max() + 1
+
+    mass = np.bincount(labels, weights, minlength=cluster_count)
+
+    def weighted_mean(values):
+        return np.column_stack([
+            np.bincount(labels, weights * values[:, i], minlength=cluster_count)
+            for i in range(values.shape[1])
+        ]) / mass[:, None]
+
+    centers = weighted_mean(positions)
+    cluster_colors = weighted_mean(colors)
+    cluster_soft = weighted_mean(soft_sizes[:, None])[:, 0]
+    power = np.bincount(labels, energies, minlength=cluster_count)
+
+    budget = _managed_collection(scene, BUDGET_LIGHTS, "SceneBuildup Budget Lights")
+    for cluster in range(cluster_count):
+        light_data = bpy.data.lights.new(
+            name=f"BudgetLight_{cluster:03d}", type='POINT'
+        )
+        light_data.energy = power[cluster]
+        light_data.color = cluster_colors[cluster]
+        light_data.shadow_soft_size = cluster_soft[cluster]
+        light_obj = bpy.data.objects.new(light_data.name, light_data)
+        light_obj.location = centers[cluster]
+        budget.objects.link(light_obj)
+
+        # Step power up as the members' parents finish building
+        members = labels == cluster
+        frames, inverse = np.unique(reveal[members], return_inverse=True)
+        if len(frames) > 1 or frames[0] > 0:
+            steps = np.cumsum(np.bincount(inverse, energies[members]))
+            if frames[0] > 0:
+                frames = np.append(frames[0] - 1, frames)
+                steps = np.append(0.0, steps)
+            for frame, energy in zip(frames, steps):
+                light_data.energy = energy
+                light_data.keyframe_insert(data_path="energy", frame=int(frame))
+            for fcurve in get_object_fcurves(light_data) or ():
+                for keyframe in fcurve.keyframe_points:
+                    keyframe.interpolation = 'CONSTANT'
+
+    # Originals stay in the file, in a collection disabled for render and
+    # viewport, so restore_light_budget() can switch back
+    originals = _managed_collection(
+        scene, ORIGINAL_LIGHTS, "SceneBuildup Original Lights"
+    )
+    originals.hide_viewport = True
+    originals.hide_render = True
+    for light_obj in lights:
+        homes = light_obj.scene_buildup.budget_collections
+        homes.clear()
+        for collection in light_obj.users_collection:
+            homes.add().collection = collection
+            collection.objects.unlink(light_obj)
+        originals.objects.link(light_obj)
+
+    return len(lights), cluster_count
+
+
+def restore_light_budget(scene):
+    """Bring back the original lights and remove the budget stand-ins
+
+    Returns the number of lights restored.
+    """
+    budget = _managed_collection(scene, BUDGET_LIGHTS)
+    if budget is not None:
+        for light_obj in list(budget.objects):
+            light_data = light_obj.data
+            bpy.data.objects.remove(light_obj)
+            if light_data is not None and light_data.users == 0:
+                bpy.data.lights.remove(light_data)
+        bpy.data.collections.remove(budget)
+
+    originals = _managed_collection(scene, ORIGINAL_LIGHTS)
+    if originals is None:
+        return 0
+    restored = list(originals.objects)
+    for light_obj in restored:
+        homes = light_obj.scene_buildup.budget_collections
+        targets = [item.collection for item in homes if item.collection]
+        for collection in targets or [scene.collection]:
+            if light_obj.name not in collection.objects:
+                collection.objects.link(light_obj)
+        originals.objects.unlink(light_obj)
+        homes.clear()
+    bpy.data.collections.remove(originals)
+    return len(restored)
+
+
+# ============================================================================
+# Emitter Scanner
+# ============================================================================
+
+# ID properties: cached emission strength and color on materials, the
+# fingerprint of the last scan on meshes' objects, and the marker on lights
+# the scan made
+EMISSION_STRENGTH = "scene_buildup_emission"
+EMISSION_COLOR = "scene_buildup_emission_color"
+EMITTER_SCAN = "scene_buildup_emitter_scan"
+EMITTER_LIGHT = "scene_buildup_emitter_light"
+
+# session_uid of materials and meshes changed since the last scan, None
+# until the first scan after loading a file or an undo/redo (everything
+# counts as changed)
+_scan_changes = None
+
+
+# (strength, color) of a material that does not emit
+NO_EMISSION = (0.0, (0.0, 0.0, 0.0))
+
+
+def _socket_emission(strength, color):
+    """(strength, color) of a strength/color socket pair, 0 when black"""
+    # Textured color or strength can emit anything, count them as white
+    # and unit strength
+    rgb = (1.0, 1.0, 1.0) if color.is_linked else tuple(color.default_value[:3])
+    if max(rgb) <= 0.0:
+        return NO_EMISSION
+    return (1.0 if strength.is_linked else max(strength.default_value, 0.0)), rgb
+
+
+def material_emission(material):
+    """(strength, color) of a material's strongest Emission or Principled BSDF"""
+    if material is None or not material.use_nodes or material.node_tree is None:
+        return NO_EMISSION
+    emission = NO_EMISSION
+    for node in material.node_tree.nodes:
+        if node.type == 'EMISSION':
+            sockets = (node.inputs['Strength'], node.inputs['Color'])
+        elif node.type == 'BSDF_PRINCIPLED':
+            sockets = (node.inputs['Emission Strength'], node.inputs['Emission Color'])
+        else:
+            continue
+        found = _socket_emission(*sockets)
+        if found[0] * max(found[1]) > emission[0] * max(emission[1]):
+            emission = found
+    return emission
+
+
+def material_emissions(materials, changed):
+    """(strength, color) of each material, walking a node tree only when needed
+
+    Materials keep their last result in ID properties, only the ones
+    without them or in changed are walked again.
+    """
+    emissions = {}
+    for material in materials:
+        if material in emissions:
+            continue
+        if (
+            changed is None
+            or EMISSION_STRENGTH not in material
+            or EMISSION_COLOR not in material
+            or material.session_uid in changed
+        ):
+            strength, color = material_emission(material)
+            material[EMISSION_STRENGTH] = strength
+            material[EMISSION_COLOR] = color
+        emissions[material] = (
+            material[EMISSION_STRENGTH], tuple(material[EMISSION_COLOR])
+        )
+    return emissions
+
+
+def face_emission(obj, emissions):
+    """Emitted power and color of every face, from its material
+
+    Power is emission strength times world-space face area, which is the
+    power in Watts of an area light as bright as the surface. Areas are
+    scaled by the object's transform, exact for uniform scale.
+    """
+    slots = [
+        emissions.get(slot.material, NO_EMISSION) for slot in obj.material_slots
+    ] or [NO_EMISSION]
+    strengths = np.array([strength for strength, _ in slots])
+    colors = np.array([color for _, color in slots], dtype=np.float64)
+
+    mesh = obj.data
+    indices = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", indices)
+    indices = np.clip(indices, 0, len(slots) - 1)
+    areas = np.empty(len(mesh.polygons), dtype=np.float32)
+    mesh.polygons.foreach_get("area", areas)
+    scale = abs(np.linalg.det(np.array(obj.matrix_world.to_3x3()))) ** (2.0 / 3.0)
+    return strengths[indices] * areas * scale, colors[indices]
+
+
+def _emitter_fingerprint(obj, emissions, light_type):
+    """What a scan of the object depends on, besides mesh edits"""
+    emission = tuple(
+        (round(strength, 4), tuple(round(c, 4) for c in color))
+        for strength, color in (
+            emissions.get(slot.material, NO_EMISSION) for slot in obj.material_slots
+        )
+    )
+    matrix = tuple(round(v, 4) for row in obj.matrix_world for v in row)
+    mesh = obj.data
+    return repr((
+        light_type, mesh.name, len(mesh.vertices), len(mesh.polygons),
+        emission, matrix,
+    ))
+
+
+def scan_emitters(objects, light_type, settings, collection, full=False):
+    """Create lights for the emissive faces of every mesh in one batch
+
+    Each material's node tree is walked once, faces are mapped to emitting
+    materials through their material index, and the faces of each mesh go
+    through the same placement as Add Light from Vertices. Each light
+    gets the power its faces emit and their power-weighted emission color
+    instead of the intensity and color presets. Meshes whose materials,
+    transform and geometry are unchanged since the last scan keep their
+    lights. Returns (lights created, meshes scanned, skipped).
+    """
+    global _scan_changes
+    changed = None if full else _scan_changes
+    meshes = [obj for obj in objects if obj.type == 'MESH']
+    emissions = material_emissions(
+        [slot.material for obj in meshes for slot in obj.material_slots
+         if slot.material is not None],
+        changed,
+    )
+    lights = child_lights_by_parent()
+    shared_data = shared_light_data() if settings.light_share_data else None
+    oriented = light_type == 'AREA' and settings.light_area_fit == 'OBB'
+
+    created = scanned = skipped = 0
+    for obj in meshes:
+        fingerprint = _emitter_fingerprint(obj, emissions, light_type)
+        if (
+            changed is not None
+            and obj.get(EMITTER_SCAN) == fingerprint
+            and obj.data.session_uid not in changed
+        ):
+            skipped += 1
+            continue
+
+        # Replace the lights of the previous scan
+        for light_obj in lights.get(obj, ()):
+            if light_obj.get(EMITTER_LIGHT):
+                light_data = light_obj.data
+                bpy.data.objects.remove(light_obj)
+                if light_data.users == 0:
+                    bpy.data.lights.remove(light_data)
+        obj[EMITTER_SCAN] = fingerprint
+        scanned += 1
+
+        power, colors = face_emission(obj, emissions)
+        faces = power > 0.0
+        if not faces.any():
+            continue
+        mesh = obj.data
+        loop_verts, loop_starts = read_loop_layout(mesh)
+        loop_totals = np.diff(np.append(loop_starts, len(loop_verts)))
+        vertices = np.zeros(len(mesh.vertices), dtype=bool)
+        vertices[loop_verts[np.repeat(faces, loop_totals)]] = True
+
+        placements = selection_placements(
+            MeshSelection(mesh, vertices, faces),
+            obj.matrix_world,
+            oriented=oriented,
+            per_island=settings.light_per_island,
+        )
+        for placement in placements:
+            weights = power[placement.faces]
+            energy = float(weights.sum())
+            color = (weights @ colors[placement.faces] / energy).tolist()
+            light_obj = create_light(
+                obj, light_type, placement, settings, collection, shared_data,
+                energy=energy, color=color,
+            )
+            light_obj[EMITTER_LIGHT] = True
+        created += len(placements)
+
+    _scan_changes = set()
+    return created, scanned, skipped
+
+
+@persistent
+def track_scan_changes(scene, depsgraph):
+    """depsgraph_update_post handler recording edited materials and meshes"""
+    if _scan_changes is None:
+        return
+    for update in depsgraph.updates:
+        data = update.id.original
+        if isinstance(data, bpy.types.Material):
+            _scan_changes.add(data.session_uid)
+        elif isinstance(data, bpy.types.Mesh) and update.is_updated_geometry:
+            _scan_changes.add(data.session_uid)
+        elif isinstance(data, bpy.types.ShaderNodeTree):
+            # Embedded material trees report themselves, recheck all
+            # materials using a node tree
+            _scan_changes.update(
+                material.session_uid for material in bpy.data.materials
+                if material.node_tree == data
+            )
+
+
+@persistent
+def reset_scan_changes(*args):
+    """load_post/undo_post/redo_post handler, the recorded changes no longer
+    match the data, which undo restores without depsgraph updates"""
+    global _scan_changes
+    _scan_changes = None
+
+
+# ============================================================================
+# Mirror Materials
+# ============================================================================
+
+MIRROR_MATERIAL = "Mirror"
+
+
+def create_mirror_material(name):
+    """Create perfect chrome mirror material using Principled BSDF"""
+    mat = bpy.data.materials.new(name=name)
+    mat.use_nodes = True
+
+    nodes = mat.node_tree.nodes
+    links = mat.node_tree.links
+
+    # Clear default nodes for clean setup
+    nodes.clear()
+
+    # Create Principled BSDF node
+    bsdf = nodes.new(type='ShaderNodeBsdfPrincipled')
+    bsdf.location = (0, 0)
+
+    # Create Material Output node
+    output = nodes.new(type='ShaderNodeOutputMaterial')
+    output.location = (300, 0)
+
+    # Configure for perfect chrome mirror
+    bsdf.inputs['Base Color'].default_value = (1.0, 1.0, 1.0, 1.0)
+    bsdf.inputs['Metallic'].default_value = 1.0
+    bsdf.inputs['Roughness'].default_value = 0.0
+    # Specular uses default 0.5 which is correct for mirrors
+
+    # Link shader to output
+    links.new(bsdf.outputs['BSDF'], output.inputs['Surface'])
+
+    return mat
+
+
+def ensure_mirror_material(name=MIRROR_MATERIAL):
+    """Existing mirror material of that name, or a new one"""
+    if name in bpy.data.materials:
+        return bpy.data.materials[name]
+    return create_mirror_material(name)
+
+
+def assign_material_to_faces(mesh, material, faces):
+    """Assign material to the faces in a boolean mask, adding its slot
+
+    Material indices are read and written with one foreach call each, the
+    mesh must not be in Edit Mode. Returns the number of faces assigned.
+    """
+    # Ensure material is in mesh's slots
+    if material.name not in mesh.materials:
+        mesh.materials.append(material)
+    mat_index = mesh.materials.find(material.name)
+
+    indices = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", indices)
+    indices[faces] = mat_index
+    mesh.polygons.foreach_set("material_index", indices)
+    mesh.update()
+    return int(np.count_nonzero(faces))
+
+
+def assign_material_to_edit_selection(mesh, material):
+    """Assign material to the selected faces of a mesh in Edit Mode
+
+    Writes the edit BMesh directly, so the mesh is not converted out of
+    Edit Mode and back. Returns the number of faces assigned.
+    """
+    import bmesh
+
+    # Kept up to date by edit mode, skips meshes with nothing selected
+    if not mesh.total_face_sel:
+        return 0
+    if material.name not in mesh.materials:
+        mesh.materials.append(material)
+    mat_index = mesh.materials.find(material.name)
+
+    bm = bmesh.from_edit_mesh(mesh)
+    count = 0
+    for face in bm.faces:
+        if face.select:
+            face.material_index = mat_index
+            count += 1
+    bmesh.update_edit_mesh(mesh, loop_triangles=False, destructive=False)
+    return count
+
+
+def face_planes(mesh, matrix_world):
+    """World-space normal, plane offset, area and center of every face
+
+    Areas follow the object's scale: a face's area scales by
+    |det(M)| * |M^-T n| under the 3x3 matrix M.
+    """
+    face_count = len(mesh.polygons)
+    normals = np.empty(face_count * 3, dtype=np.float32)
+    mesh.polygons.foreach_get("normal", normals)
+    centers = np.empty(face_count * 3, dtype=np.float32)
+    mesh.polygons.foreach_get("center", centers)
+    areas = np.empty(face_count, dtype=np.float32)
+    mesh.polygons.foreach_get("area", areas)
+
+    matrix = np.array(matrix_world, dtype=np.float64)
+    linear = matrix[:3, :3]
+    normals = normals.reshape(-1, 3) @ np.linalg.inv(linear)
+    scale = np.linalg.norm(normals, axis=1)
+    normals /= np.maximum(scale, 1e-12)[:, None]
+    areas = areas * abs(np.linalg.det(linear)) * scale
+    centers = centers.reshape(-1, 3) @ linear.T + matrix[:3, 3]
+    offsets = (normals * centers).sum(axis=1)
+    return normals, offsets, areas, centers
+
+
+def _split_on_gaps(labels, values, tolerance):
+    """Split each labelled group where its sorted values jump by more than
+    tolerance, returns the new labels"""
+    order = np.lexsort((values, labels))
+    sorted_labels = labels[order]
+    starts = np.ones(len(order), dtype=bool)
+    starts[1:] = (
+        (sorted_labels[1:] != sorted_labels[:-1])
+        | (np.diff(values[order]) > tolerance)
+    )
+    refined = np.empty(len(order), dtype=np.int64)
+    refined[order] = np.cumsum(starts) - 1
+    return refined
+
+
+def plane_labels(normals, offsets, angle_tolerance, distance_tolerance):
+    """Label faces lying in the same plane, from their normals and offsets
+
+    Faces are split along each normal component and then the offset
+    wherever the sorted values leave a gap above the tolerance, so faces
+    within tolerance of each other always share a label (chains of close
+    faces may span more). Faces facing opposite ways get different labels
+    even when coplanar, they reflect different sides.
+    """
+    # Unit normals angle_tolerance apart differ by at most the chord
+    # 2 sin(angle / 2) in each component
+    chord = 2.0 * np.sin(angle_tolerance / 2.0)
+    labels = np.zeros(len(offsets), dtype=np.int64)
+    for axis in range(3):
+        labels = _split_on_gaps(labels, normals[:, axis], chord)
+    return _split_on_gaps(labels, offsets, distance_tolerance)
+
+
+def select_faces(mesh, faces):
+    """Make the faces in a boolean mask the mesh selection, with their verts
+
+    The mesh must not be in Edit Mode; the selection shows once it enters.
+    """
+    loop_verts, loop_starts = read_loop_layout(mesh)
+    loop_totals = np.diff(np.append(loop_starts, len(loop_verts)))
+    vertices = np.zeros(len(mesh.vertices), dtype=bool)
+    vertices[loop_verts[np.repeat(faces, loop_totals)]] = True
+    edges = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.edges.foreach_get("vertices", edges)
+
+    mesh.vertices.foreach_set("select", vertices)
+    mesh.edges.foreach_set("select", vertices[edges.reshape(-1, 2)].all(axis=1))
+    mesh.polygons.foreach_set("select", faces)
+    mesh.update()
+
+
+# ID properties marking generated mirror probes and their collection
+MIRROR_PROBE = "scene_buildup_mirror_probe"
+MIRROR_PROBES = "scene_buildup_mirror_probes"
+
+
+def material_faces(obj, material):
+    """Boolean mask of the object's faces whose slot holds material"""
+    mesh = obj.data
+    slots = np.array(
+        [slot.material == material for slot in obj.material_slots] or [False]
+    )
+    indices = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", indices)
+    # Indices past the last slot render with the last slot's material
+    return slots[np.clip(indices, 0, len(slots) - 1)]
+
+
+def mirror_probe_planes(objects, material, angle_tolerance=0.0175,
+                        distance_tolerance=0.001, min_area=0.0):
+    """Center, basis and size of one planar probe per mirror plane
+
+    Faces using material are grouped by plane across all objects (see
+    plane_labels()), so coplanar mirrors share one probe. Returns a list of
+    (center, basis, size) with basis columns along the probe's width,
+    height and the area-weighted plane normal, and size its width and
+    height in world units. Pure geometry, no datablocks are created.
+    """
+    normals, offsets, areas, points, point_faces = [], [], [], [], []
+    face_base = 0
+    for obj in objects:
+        faces = material_faces(obj, material)
+        if not faces.any():
+            continue
+        mesh = obj.data
+        face_normals, face_offsets, face_areas, _ = face_planes(
+            mesh, obj.matrix_world
+        )
+        normals.append(face_normals[faces])
+        offsets.append(face_offsets[faces])
+        areas.append(face_areas[faces])
+
+        # Corners of the mirror faces, tagged with their face's group row
+        coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", coords)
+        coords = to_world(coords.reshape(-1, 3), obj.matrix_world)
+        loop_verts, loop_starts = read_loop_layout(mesh)
+        loop_totals = np.diff(np.append(loop_starts, len(loop_verts)))
+        loop_faces = np.repeat(np.arange(len(faces)), loop_totals)
+        corners = faces[loop_faces]
+        rows = np.cumsum(faces) - 1 + face_base
+        points.append(coords[loop_verts[corners]])
+        point_faces.append(rows[loop_faces[corners]])
+        face_base += int(np.count_nonzero(faces))
+
+    if not face_base:
+        return []
+    normals, offsets, areas, points, point_faces = (
+        np.concatenate(arrays)
+        for arrays in (normals, offsets, areas, points, point_faces)
+    )
+    labels = plane_labels(normals, offsets, angle_tolerance, distance_tolerance)
+    point_labels = labels[point_faces]
+
+    planes = []
+    for label in np.unique(labels):
+        members = labels == label
+        if areas[members].sum() < min_area:
+            continue
+        normal = _normalized((normals[members] * areas[members, None]).sum(axis=0))
+        corners = points[point_labels == label]
+
+        # Width along the widest in-plane direction of the corners
+        width_axis = principal_axes(corners)[:, 0]
+        width_axis = width_axis - normal * np.dot(width_axis, normal)
+        if np.linalg.norm(width_axis) < 1e-6:
+            width_axis = np.cross(normal, (1.0, 0.0, 0.0))
+            if np.linalg.norm(width_axis) < 1e-6:
+                width_axis = np.cross(normal, (0.0, 1.0, 0.0))
+        width_axis = _normalized(width_axis)
+        height_axis = np.cross(normal, width_axis)
+        basis = np.column_stack((width_axis, height_axis, normal))
+
+        local = corners @ basis
+        low = local.min(axis=0)
+        high = local.max(axis=0)
+        center = basis @ ((low + high) / 2.0)
+        planes.append((center, basis, high[:2] - low[:2]))
+    return planes
+
+
+def create_plane_probe(name, center, basis, size, collection):
+    """Planar light probe object covering a width x height rectangle"""
+    try:
+        probe = bpy.data.lightprobes.new(name=name, type='PLANE')
+    except TypeError:
+        # Called PLANAR before Blender 4.1
+        probe = bpy.data.lightprobes.new(name=name, type='PLANAR')
+    probe_obj = bpy.data.objects.new(name=name, object_data=probe)
+    probe_obj[MIRROR_PROBE] = True
+    # A planar probe spans -1..1 along its local X and Y
+    probe_obj.matrix_world = mathutils.Matrix.LocRotScale(
+        mathutils.Vector(center),
+        mathutils.Matrix(basis.tolist()).to_quaternion(),
+        mathutils.Vector((max(size[0], 1e-3) / 2.0, max(size[1], 1e-3) / 2.0, 1.0)),
+    )
+    collection.objects.link(probe_obj)
+    return probe_obj
+
+
+def remove_mirror_probes(scene):
+    """Remove probes made by the mirror probe tool, returns how many"""
+    collection = _managed_collection(scene, MIRROR_PROBES)
+    if collection is None:
+        return 0
+    probes = [obj for obj in collection.objects if obj.get(MIRROR_PROBE)]
+    for probe_obj in probes:
+        probe = probe_obj.data
+        bpy.data.objects.remove(probe_obj)
+        if probe is not None and probe.users == 0:
+            bpy.data.lightprobes.remove(probe)
+    if not collection.objects:
+        bpy.data.collections.remove(collection)
+    return len(probes)
+
+
+def detect_mirror_faces(objects, angle_tolerance=0.0175,
+                        distance_tolerance=0.001, min_area=0.1, assign=False):
+    """Select the faces of coplanar groups with enough area on all objects
+
+    All faces are clustered at once so a mirror split over several objects
+    counts as one group. With assign the Mirror material is also assigned
+    to them. Returns (face count, group count).
+    """
+    planes = [face_planes(obj.data, obj.matrix_world) for obj in objects]
+    normals, offsets, areas, _ = (
+        np.concatenate(arrays) for arrays in zip(*planes)
+    )
+    labels = plane_labels(normals, offsets, angle_tolerance, distance_tolerance)
+    group_area = np.bincount(labels, areas)
+    kept = group_area >= min_area
+    found = kept[labels]
+
+    mirror_mat = ensure_mirror_material() if assign else None
+    start = 0
+    for obj in objects:
+        mesh = obj.data
+        faces = found[start:start + len(mesh.polygons)]
+        start += len(mesh.polygons)
+        select_faces(mesh, faces)
+        if mirror_mat is not None and faces.any():
+            assign_material_to_faces(mesh, mirror_mat, faces)
+
+    return int(np.count_nonzero(found)), len(np.unique(labels[found]))
+
+
+def add_mirror_probes(scene, objects, material, angle_tolerance=0.0175,
+                      distance_tolerance=0.001, min_area=0.0):
+    """Replace the mirror probes with one per plane of material's faces
+
+    Returns the number of probes added.
+    """
+    # Re-running replaces the probes of the previous run
+    remove_mirror_probes(scene)
+    planes = mirror_probe_planes(
+        objects, material, angle_tolerance, distance_tolerance, min_area
+    )
+    if not planes:
+        return 0
+
+    collection = _managed_collection(
+        scene, MIRROR_PROBES, "SceneBuildup Mirror Probes"
+    )
+    for i, (center, basis, size) in enumerate(planes):
+        create_plane_probe(
+            f"MirrorProbe_{i:03d}", center, basis, size, collection
+        )
+    return len(planes)
+
+
+# ============================================================================
+# Rollback
+# ============================================================================
+
+# Per-object settings Apply Animation copies from the active object
+BUILDUP_SETTINGS = (
+    "enabled",
+    "effect_type",
+    "start_frame",
+    "duration",
+    "floor_offset",
+    "fall_height",
+    "overshoot_amount",
+    "overshoot_settle_ratio",
+    "animation_engine",
+    "use_shared_action",
+    "progress_source",
+    "visibility_mode",
+)
+
+
+class BuildupSnapshot:
+    """Pre-apply state of objects, for rolling back a cancelled apply
+
+    Only each object's own F-curves, buildup NLA strip and buildup drivers
+    are stored rather than copies of whole actions, so objects sharing one
+    layered action stay cheap to capture.
+    """
+
+    def __init__(self):
+        self._states = []
+
+    def __len__(self):
+        return len(self._states)
+
+    def capture(self, obj):
+        """Record the object's state before it gets modified"""
+        props = obj.scene_buildup
+        state = {
+            "object": obj,
+            "location": obj.location.copy(),
+            "scale": obj.scale.copy(),
+            "delta_location": obj.delta_location.copy(),
+            "delta_scale": obj.delta_scale.copy(),
+            "hidden": (obj.hide_viewport, obj.hide_render),
+            "collections": obj.users_collection,
+            "homes": [item.collection for item in props.home_collections],
+            "settings": {name: getattr(props, name) for name in BUILDUP_SETTINGS},
+            "progress": obj.get(PROGRESS_PROPERTY),
+            "animation": None,
+        }
+
+        anim_data = obj.animation_data
+        if anim_data is not None:
+            fcurves = get_object_fcurves(obj) or ()
+            state["animation"] = {
+                "action": anim_data.action,
+                "slot": getattr(anim_data, 'action_slot', None),
+                "fcurves": [
+                    (
+                        fcurve.data_path,
+                        fcurve.array_index,
+                        fcurve.group.name if fcurve.group else "",
+                        read_keyframe_arrays(fcurve),
+                    )
+                    for fcurve in fcurves
+                ],
+                "strips": [
+                    (strip.action, strip.frame_start)
+                    for track in anim_data.nla_tracks
+                    if track.name == TEMPLATE_TRACK
+                    for strip in track.strips
+                ],
+                "drivers": [
+                    (
+                        fcurve.data_path,
+                        fcurve.array_index,
+                        fcurve.driver.expression,
+                        [
+                            (var.name, var.targets[0].id, var.targets[0].data_path)
+                            for var in fcurve.driver.variables
+                        ],
+                    )
+                    for fcurve in anim_data.drivers
+                    if _is_buildup_driver(fcurve)
+                ],
+            }
+        self._states.append(state)
+
+    def restore(self):
+        """Restore every captured object, most recent capture first"""
+        for state in reversed(self._states):
+            self._restore(state)
+        self._states.clear()
+
+    def _restore(self, state):
+        obj = state["object"]
+        # Bucket links are restored below, the bucket callback would only
+        # walk every object's children for each setting
+        with bulk_setting_copies():
+            for name, value in state["settings"].items():
+                setattr(obj.scene_buildup, name, value)
+
+        saved = state["animation"]
+        if saved is None:
+            if obj.animation_data is not None:
+                release_action_slot(obj)
+                obj.animation_data_clear()
+        else:
+            self._restore_animation(obj, saved)
+
+        if state["progress"] is not None:
+            obj[PROGRESS_PROPERTY] = state["progress"]
+        elif PROGRESS_PROPERTY in obj:
+            del obj[PROGRESS_PROPERTY]
+
+        obj.location = state["location"]
+        obj.scale = state["scale"]
+        obj.delta_location = state["delta_location"]
+        obj.delta_scale = state["delta_scale"]
+        obj.hide_viewport, obj.hide_render = state["hidden"]
+
+        # Undo moves into and between start frame buckets
+        collections = state["collections"]
+        for collection in collections:
+            if obj.name not in collection.objects:
+                collection.objects.link(obj)
+        for collection in obj.users_collection:
+            if collection not in collections:
+                collection.objects.unlink(obj)
+        homes = obj.scene_buildup.home_collections
+        homes.clear()
+        for collection in state["homes"]:
+            homes.add().collection = collection
+
+    def _restore_animation(self, obj, saved):
+        anim_data = obj.animation_data or obj.animation_data_create()
+        remove_buildup_tracks(obj)
+        remove_buildup_drivers(obj)
+
+        # Undo action copies and slot splits made while applying
+        action = saved["action"]
+        current = (anim_data.action, getattr(anim_data, 'action_slot', None))
+        if current != (action, saved["slot"]):
+            release_action_slot(obj)
+            replaced = anim_data.action
+            anim_data.action = action
+            if saved["slot"] is not None:
+                anim_data.action_slot = saved["slot"]
+            if replaced is not None and replaced != action and replaced.users == 0:
+                bpy.data.actions.remove(replaced)
+
+        if action is not None:
+            fcurves = get_object_fcurves(obj)
+            if fcurves is not None:
+                for fcurve in list(fcurves):
+                    fcurves.remove(fcurve)
+            for data_path, index, group, keys in saved["fcurves"]:
+                fcurve = ensure_fcurve(obj, action, data_path, index, group)
+                append_keyframe_arrays(fcurve, keys)
+
+        for strip_action, frame_start in saved["strips"]:
+            assign_template_strip(
+                obj, strip_action, frame_start - strip_action.frame_range[0]
+            )
+        for data_path, index, expression, variables in saved["drivers"]:
+            if data_path.startswith("hide_"):
+                index = -1
+            add_simple_driver(obj, data_path, index, expression, variables)
+
+
 # ============================================================================
 # Property Group
 # ============================================================================
 
+class SceneBuildupHomeCollection(PropertyGroup):
+    """Collection an object returns to when it leaves a managed collection"""
+
+    collection: PointerProperty(type=bpy.types.Collection)
+
+
 class SceneBuildupProperties(PropertyGroup):
     """Custom properties for scene buildup animation"""
 
@@ -94,7 +3031,8 @@ class SceneBuildupProperties(PropertyGroup):
         description="Frame when the animation starts",
         default=0,
         min=0,
-        soft_max=1000
+        soft_max=1000,
+        update=update_start_bucket
     )
 
     duration: IntProperty(
@@ -102,7 +3040,8 @@ class SceneBuildupProperties(PropertyGroup):
         description="Number of frames for the animation (default ~1.3s at 30fps)",
         default=15,
         min=1,
-        soft_max=300
+        soft_max=300,
+        update=update_start_bucket
     )
 
     floor_offset: FloatProperty(
@@ -122,21 +3061,110 @@ class SceneBuildupProperties(PropertyGroup):
         soft_max=0.5,
     )
 
-    overshoot_settle_ratio: FloatProperty(
-        name="Settle Ratio",
-        description="Fraction of duration used for the settle-back phase",
-        default=0.2,
-        min=0.05,
-        max=0.5,
-    )
+    overshoot_settle_ratio: FloatProperty(
+        name="Settle Ratio",
+        description="Fraction of duration used for the settle-back phase",
+        default=0.2,
+        min=0.05,
+        max=0.5,
+    )
+
+    fall_height: FloatProperty(
+        name="Fall Height",
+        description="Distance above final position (Fall Down effect)",
+        default=0.5,
+        min=0.0,
+        soft_max=10.0,
+        unit='LENGTH'
+    )
+
+    animation_engine: EnumProperty(
+        name="Keying",
+        description="How keyframes are written when applying animation",
+        items=[
+            (
+                'BULK',
+                "Bulk F-Curves",
+                "Write F-curves directly in a few bulk calls (fast)"
+            ),
+            (
+                'LEGACY',
+                "Keyframe Insert",
+                "Insert every keyframe with keyframe_insert (slow)"
+            ),
+            (
+                'TEMPLATE',
+                "Shared Template",
+                "Share one action per effect signature, played by an NLA "
+                "strip per object (small files)"
+            ),
+            (
+                'DRIVERS',
+                "Drivers",
+                "Drive transforms and visibility from the start frame and "
+                "duration settings, retime without rewriting keyframes"
+            ),
+        ],
+        default='BULK'
+    )
+
+    progress_source: EnumProperty(
+        name="Progress",
+        description="Where the driver engine reads animation progress from",
+        items=[
+            (
+                'FRAME',
+                "Scene Frame",
+                "Compute progress from the current frame, start frame and "
+                "duration (no keyframes at all)"
+            ),
+            (
+                'PROPERTY',
+                "Progress Property",
+                "Key one buildup_progress custom property per object"
+            ),
+        ],
+        default='FRAME'
+    )
+
+    visibility_mode: EnumProperty(
+        name="Visibility",
+        description="How objects are kept hidden until their start frame",
+        items=[
+            (
+                'HIDE',
+                "Hide Keys",
+                "Key hide_viewport and hide_render, which rebuilds depsgraph "
+                "relations on every frame where an object appears"
+            ),
+            (
+                'RAY',
+                "Ray Visibility",
+                "Key ray visibility flags and zero scale, objects stay in the "
+                "depsgraph (smoother playback)"
+            ),
+            (
+                'COLLECTION',
+                "Start Frame Collections",
+                "Move objects into one auto-managed collection per start "
+                "frame and switch visibility per collection. Needs this add-on "
+                "enabled wherever the file plays or renders (render farms too), "
+                "without it every bucket keeps its last visibility"
+            ),
+        ],
+        default='HIDE'
+    )
+
+    home_collections: CollectionProperty(type=SceneBuildupHomeCollection)
+    budget_collections: CollectionProperty(type=SceneBuildupHomeCollection)
 
-    fall_height: FloatProperty(
-        name="Fall Height",
-        description="Distance above final position (Fall Down effect)",
-        default=0.5,
-        min=0.0,
-        soft_max=10.0,
-        unit='LENGTH'
+    use_shared_action: BoolProperty(
+        name="Share Action",
+        description=(
+            "Key objects without an action into one layered action with a "
+            "slot per object, instead of an action per object"
+        ),
+        default=True
     )
 
     # Light tool settings
@@ -169,6 +3197,53 @@ class SceneBuildupProperties(PropertyGroup):
         default='WARM'
     )
 
+    light_source_group: StringProperty(
+        name="Group",
+        description=(
+            "Vertex group or point/face attribute marking the emitter on "
+            "each selected mesh"
+        ),
+        default="emitter"
+    )
+
+    light_per_island: BoolProperty(
+        name="Light per Island",
+        description=(
+            "Create one light per connected island of the selection (e.g. "
+            "each bulb of a chandelier) instead of one for all of it"
+        ),
+        default=False
+    )
+
+    light_share_data: BoolProperty(
+        name="Share Light Data",
+        description=(
+            "Reuse the light datablock of an earlier light with the same "
+            "type, power, color and size (identical fixtures become linked "
+            "duplicates, editing one edits all)"
+        ),
+        default=False
+    )
+
+    light_area_fit: EnumProperty(
+        name="Area Fit",
+        description="How area lights are sized to the selected vertices",
+        items=[
+            (
+                'AABB',
+                "World Bounds",
+                "Two largest sides of the world-aligned bounding box"
+            ),
+            (
+                'OBB',
+                "Oriented Bounds",
+                "Bounding box along the principal axes of the vertices, also "
+                "sets the light rotation (tight fit for rotated emitters)"
+            ),
+        ],
+        default='AABB'
+    )
+
 
 # ============================================================================
 # Operators
@@ -180,11 +3255,84 @@ class SCENEBUILD_OT_ApplyAnimation(Operator):
     bl_label = "Apply Animation"
     bl_options = {'REGISTER', 'UNDO'}
 
+    chunk_size: IntProperty(
+        name="Chunk Size",
+        description=(
+            "Objects processed between UI updates when applying to a large "
+            "selection (Esc cancels and rolls back)"
+        ),
+        default=250,
+        min=1,
+        soft_max=5000
+    )
+
     @classmethod
     def poll(cls, context):
         return context.active_object is not None
 
     def execute(self, context):
+        if not self._begin(context):
+            return {'CANCELLED'}
+        self._apply_range(0, len(self._objects))
+        return self._finish()
+
+    def invoke(self, context, event):
+        if not self._begin(context):
+            return {'CANCELLED'}
+        if len(self._objects) <= self.chunk_size:
+            self._apply_range(0, len(self._objects))
+            return self._finish()
+
+        # Large selections run in chunks from a timer so the UI stays live
+        self._next = 0
+        self._snapshot = BuildupSnapshot()
+        wm = context.window_manager
+        wm.progress_begin(0, len(self._objects))
+        self._timer = wm.event_timer_add(0.001, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self._snapshot.restore()
+            remove_empty_buckets(self._scene)
+            sync_start_buckets(self._scene)
+            self._remove_unused_actions()
+            self._end_modal(context)
+            self.report({'WARNING'}, "Apply Animation cancelled, changes reverted")
+            return {'CANCELLED'}
+        if event.type != 'TIMER':
+            # Block other input while objects are half processed
+            return {'RUNNING_MODAL'}
+
+        start = self._next
+        stop = min(start + self.chunk_size, len(self._objects))
+        for obj in self._objects[start:stop]:
+            self._snapshot.capture(obj)
+            for light_obj in self._lights.get(obj, ()):
+                self._snapshot.capture(light_obj)
+        self._apply_range(start, stop)
+        self._next = stop
+
+        context.window_manager.progress_update(stop)
+        context.workspace.status_text_set(
+            f"Applying animation: {stop}/{len(self._objects)} objects "
+            f"(Esc to cancel)"
+        )
+        if stop < len(self._objects):
+            return {'RUNNING_MODAL'}
+
+        self._end_modal(context)
+        return self._finish()
+
+    def _end_modal(self, context):
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        wm.progress_end()
+        context.workspace.status_text_set(None)
+
+    def _begin(self, context):
+        """Validate settings and plan the whole selection up front"""
         # Get settings from active object
         active_obj = context.active_object
         active_props = active_obj.scene_buildup
@@ -192,27 +3340,119 @@ class SCENEBUILD_OT_ApplyAnimation(Operator):
         if not active_props.enabled:
             msg = f"Animation not enabled for '{active_obj.name}'."
             self.report({'WARNING'}, msg)
-            return {'CANCELLED'}
+            return False
 
-        # Apply to all selected objects
-        success_count = 0
-        for obj in context.selected_objects:
-            # Copy settings from active object to this object
-            props = obj.scene_buildup
-            props.enabled = active_props.enabled
-            props.effect_type = active_props.effect_type
-            props.start_frame = active_props.start_frame
-            props.duration = active_props.duration
-            props.floor_offset = active_props.floor_offset
-            props.fall_height = active_props.fall_height
-            props.overshoot_amount = active_props.overshoot_amount
-            props.overshoot_settle_ratio = active_props.overshoot_settle_ratio
-
-            # Apply animation using copied settings
-            self._apply_animation_to_object(obj, props)
-            success_count += 1
-
-        msg = f"Animation applied to {success_count} object(s)"
+        selected = context.view_layer.objects.selected
+        self._objects = list(selected)
+        self._settings = {
+            name: getattr(active_props, name) for name in BUILDUP_SETTINGS
+        }
+        self._engine = active_props.animation_engine
+        self._scene = context.scene
+        # Keyframe Insert always keys hide flags on each object
+        self._use_buckets = (
+            self._engine != 'LEGACY'
+            and active_props.visibility_mode == 'COLLECTION'
+            and active_props.effect_type in ANIMATED_EFFECTS
+        )
+        self._lights = child_lights_by_parent()
+        self._cache = FCurveCache()
+        self._templates = None
+        self._shared_action = None
+        self._plan = None
+
+        # Keyframe paths plan every object in one batch, written in ranges
+        if self._engine in ('BULK', 'TEMPLATE'):
+            use_template = self._engine == 'TEMPLATE'
+            self._plan = plan_buildup(
+                selected,
+                active_props.effect_type,
+                active_props.start_frame,
+                active_props.duration,
+                floor_offset=active_props.floor_offset,
+                fall_height=active_props.fall_height,
+                overshoot_amount=active_props.overshoot_amount,
+                overshoot_settle_ratio=active_props.overshoot_settle_ratio,
+                use_delta=use_template,
+                lights=self._lights,
+                visibility=active_props.visibility_mode,
+            )
+            if use_template:
+                self._templates = template_actions()
+                self._existing_templates = set(self._templates)
+            elif active_props.use_shared_action and supports_action_slots():
+                self._shared_action = bpy.data.actions.new(
+                    name="SceneBuildupAction"
+                )
+        return True
+
+    def _apply_range(self, start, stop):
+        """Copy settings to and animate self._objects[start:stop]"""
+        objects = self._objects[start:stop]
+        # Objects are re-bucketed below, once for the whole range
+        with bulk_setting_copies():
+            for obj in objects:
+                # Copy settings from active object to this object
+                props = obj.scene_buildup
+                for name, value in self._settings.items():
+                    setattr(props, name, value)
+
+                # Legacy path keys each object with the copied settings
+                if self._engine == 'LEGACY':
+                    self._apply_animation_to_object(obj, props)
+
+        if self._engine == 'DRIVERS':
+            apply_buildup_drivers(
+                objects,
+                self._settings["effect_type"],
+                self._settings["progress_source"],
+                lights=self._lights,
+                visibility=self._settings["visibility_mode"],
+            )
+        elif self._engine == 'TEMPLATE':
+            write_template_plan(
+                self._plan, start, stop, self._cache, self._templates
+            )
+        elif self._engine == 'BULK':
+            write_buildup_plan(
+                self._plan, start, stop, self._shared_action, self._cache
+            )
+
+        # Child lights appear with the bucket of their parent's end frame
+        lights = [
+            light_obj for obj in objects for light_obj in self._lights.get(obj, ())
+        ]
+        if self._use_buckets:
+            start_frame = self._settings["start_frame"]
+            end_frame = start_frame + self._settings["duration"]
+            assign_start_buckets(
+                self._scene,
+                objects + lights,
+                [start_frame] * len(objects) + [end_frame] * len(lights),
+                prune=False,
+            )
+        else:
+            release_start_buckets(self._scene, objects + lights, prune=False)
+
+    def _remove_unused_actions(self):
+        """Remove actions this run created that ended up with no users"""
+        created = []
+        if self._shared_action is not None:
+            created.append(self._shared_action)
+        if self._templates is not None:
+            created.extend(
+                action for signature, action in self._templates.items()
+                if signature not in self._existing_templates
+            )
+        for action in created:
+            if action.users == 0:
+                bpy.data.actions.remove(action)
+
+    def _finish(self):
+        self._remove_unused_actions()
+        remove_empty_buckets(self._scene)
+
+        msg = f"Animation applied to {len(self._objects)} object(s)"
         self.report({'INFO'}, msg)
         return {'FINISHED'}
 
@@ -227,26 +3467,9 @@ class SCENEBUILD_OT_ApplyAnimation(Operator):
         original_scale = obj.scale.copy()
 
         # Clear existing keyframes for the properties we'll animate
-        if obj.animation_data:
-            action = obj.animation_data.action
-            if action:
-                # Ensure object has its own action (not shared with other objects)
-                if action.users > 1:
-                    obj.animation_data.action = action.copy()
-                    action = obj.animation_data.action
-
-                # Remove existing keyframes for location.z and scale
-                fcurves = get_fcurves_collection(action)
-                if fcurves:
-                    fcurves_to_remove = []
-                    for fcurve in fcurves:
-                        if fcurve.data_path == "location" and fcurve.array_index == 2:
-                            fcurves_to_remove.append(fcurve)
-                        elif fcurve.data_path == "scale":
-                            fcurves_to_remove.append(fcurve)
-
-                    for fcurve in fcurves_to_remove:
-                        fcurves.remove(fcurve)
+        clear_transform_keys(obj)
+        remove_buildup_tracks(obj)
+        remove_buildup_drivers(obj)
 
         # Apply animation based on effect type
         if props.effect_type == 'GROW_FROM_FLOOR':
@@ -285,7 +3508,7 @@ class SCENEBUILD_OT_ApplyAnimation(Operator):
 
             # Set interpolation to Bezier for smooth animation
             if obj.animation_data and obj.animation_data.action:
-                fcurves = get_fcurves_collection(obj.animation_data.action)
+                fcurves = get_object_fcurves(obj)
                 if fcurves:
                     for fcurve in fcurves:
                         if fcurve.data_path == "location" or fcurve.data_path == "scale":
@@ -341,7 +3564,7 @@ class SCENEBUILD_OT_ApplyAnimation(Operator):
 
             # Set interpolation to Bezier for smooth animation
             if obj.animation_data and obj.animation_data.action:
-                fcurves = get_fcurves_collection(obj.animation_data.action)
+                fcurves = get_object_fcurves(obj)
                 if fcurves:
                     for fcurve in fcurves:
                         if fcurve.data_path == "location" or fcurve.data_path == "scale":
@@ -391,7 +3614,7 @@ class SCENEBUILD_OT_ApplyAnimation(Operator):
 
             # Set interpolation to Bezier for smooth animation
             if obj.animation_data and obj.animation_data.action:
-                fcurves = get_fcurves_collection(obj.animation_data.action)
+                fcurves = get_object_fcurves(obj)
                 if fcurves:
                     for fcurve in fcurves:
                         if fcurve.data_path == "location":
@@ -472,17 +3695,26 @@ class SCENEBUILD_OT_ClearAnimation(Operator):
     def execute(self, context):
         # Clear animation from all selected objects
         cleared_count = 0
+        bucketed = []
         for obj in context.selected_objects:
+            bucketed.append(obj)
             props = obj.scene_buildup
 
             if obj.animation_data:
-                # Remove all animation data
+                # Remove all animation data, and the object's slot if the
+                # action is shared through slots with other objects
+                release_action_slot(obj)
                 obj.animation_data_clear()
                 cleared_count += 1
+            if PROGRESS_PROPERTY in obj:
+                del obj[PROGRESS_PROPERTY]
 
             # Clear child light animations
             for child in obj.children:
+                if child.type == 'LIGHT':
+                    bucketed.append(child)
                 if child.type == 'LIGHT' and child.animation_data:
+                    release_action_slot(child)
                     child.animation_data_clear()
                     # Ensure lights are visible after clearing
                     child.hide_viewport = False
@@ -492,6 +3724,9 @@ class SCENEBUILD_OT_ClearAnimation(Operator):
             props.enabled = False
             props.effect_type = 'NONE'
 
+        # Objects return to their own collections from start frame buckets
+        release_start_buckets(context.scene, bucketed)
+
         if cleared_count > 0:
             msg = f"Animation cleared from {cleared_count} object(s)"
             self.report({'INFO'}, msg)
@@ -501,6 +3736,32 @@ class SCENEBUILD_OT_ClearAnimation(Operator):
         return {'FINISHED'}
 
 
+class SCENEBUILD_OT_PackInstancer(Operator):
+    """Pack selected meshes into one animated Geometry Nodes instancer"""
+    bl_idname = "scene_buildup.pack_instancer"
+    bl_label = "Pack into Instancer"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode == 'OBJECT' and bool(context.selected_objects)
+
+    def execute(self, context):
+        selected = context.view_layer.objects.selected
+        mesh_count = sum(1 for obj in selected if obj.type == 'MESH')
+        if mesh_count == 0:
+            self.report({'WARNING'}, "No mesh objects selected")
+            return {'CANCELLED'}
+
+        instancer = build_instancer(
+            selected, "SceneBuildup_Instancer", context.collection
+        )
+
+        msg = f"Packed {mesh_count} object(s) into '{instancer.name}'"
+        self.report({'INFO'}, msg)
+        return {'FINISHED'}
+
+
 class SCENEBUILD_OT_AddLightToLamp(Operator):
     """Create light based on selected vertices in Edit Mode"""
     bl_idname = "scene_buildup.add_light_to_lamp"
@@ -525,165 +3786,336 @@ class SCENEBUILD_OT_AddLightToLamp(Operator):
         )
 
     def execute(self, context):
-        import bmesh
-        from mathutils import Vector
-
         obj = context.edit_object
         props = obj.scene_buildup  # Read settings from PropertyGroup
-        bm = bmesh.from_edit_mesh(obj.data)
 
-        # Get selected vertices
-        selected_verts = [v for v in bm.verts if v.select]
+        # Get selected vertices and faces
+        selection = read_edit_selection(obj)
 
-        if not selected_verts:
+        if not len(selection):
             self.report({'WARNING'}, "No vertices selected")
             return {'CANCELLED'}
 
-        # Calculate bounds in world space
-        matrix_world = obj.matrix_world
-        coords = [matrix_world @ v.co for v in selected_verts]
-
-        min_x = min(co.x for co in coords)
-        max_x = max(co.x for co in coords)
-        min_y = min(co.y for co in coords)
-        max_y = max(co.y for co in coords)
-        min_z = min(co.z for co in coords)
-        max_z = max(co.z for co in coords)
-
-        # Calculate center
-        center = Vector((
-            (min_x + max_x) / 2.0,
-            (min_y + max_y) / 2.0,
-            (min_z + max_z) / 2.0
-        ))
+        # Bounds, center and normal in world space
+        placements = selection_placements(
+            selection,
+            obj.matrix_world,
+            oriented=self.light_type == 'AREA' and props.light_area_fit == 'OBB',
+            per_island=props.light_per_island,
+        )
+        shared_data = shared_light_data() if props.light_share_data else None
+        for placement in placements:
+            create_light(
+                obj, self.light_type, placement, props, context.collection,
+                shared_data,
+            )
 
-        # Calculate sizes
-        size_x = max(max_x - min_x, 0.1)
-        size_y = max(max_y - min_y, 0.1)
-        size_z = max(max_z - min_z, 0.1)
-
-        # Get average normal from selected faces (if any)
-        selected_faces = [f for f in bm.faces if f.select]
-        avg_normal = None
-
-        if selected_faces:
-            avg_normal = Vector((0, 0, 0))
-            for f in selected_faces:
-                avg_normal += f.normal
-            avg_normal.normalize()
-            # Transform to world space
-            avg_normal = matrix_world.to_3x3() @ avg_normal
-            avg_normal.normalize()
-
-        # Color mapping
-        colors = {
-            'WARM': (1.0, 0.95, 0.8),
-            'NEUTRAL': (1.0, 1.0, 1.0),
-            'COOL': (0.9, 1.0, 1.0),
-        }
+        msg = f"Created {self.light_type} light from {len(selection)} verts"
+        if len(placements) > 1:
+            msg = (
+                f"Created {len(placements)} {self.light_type} lights from "
+                f"{len(selection)} verts"
+            )
+        self.report({'INFO'}, msg)
+        return {'FINISHED'}
 
-        # Create light data
-        light_name = f"{obj.name}_Light"
-        light_data = bpy.data.lights.new(
-            name=light_name,
-            type=self.light_type
+
+class SCENEBUILD_OT_AddLightsFromGroup(Operator):
+    """Create a light on every selected mesh from a vertex group or attribute"""
+    bl_idname = "scene_buildup.add_lights_from_group"
+    bl_label = "Add Lights from Group"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    light_type: EnumProperty(
+        name="Light Type",
+        items=[
+            ('POINT', "Point", "Omnidirectional point light"),
+            ('AREA', "Area", "Area light with soft shadows"),
+        ],
+        default='POINT'
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode == 'OBJECT' and context.active_object is not None
+
+    def execute(self, context):
+        settings = context.active_object.scene_buildup
+        name = settings.light_source_group
+        created, skipped = lights_from_group(
+            context.selected_objects,
+            self.light_type,
+            settings,
+            context.collection,
         )
-        light_data.energy = props.light_intensity
-        light_data.color = colors[props.light_color_temp]
-
-        # Configure based on light type
-        if self.light_type == 'AREA':
-            light_data.shape = 'RECTANGLE'
-
-            # Use two largest dimensions from bounding box
-            # Works correctly for any rotation
-            dimensions = sorted([size_x, size_y, size_z], reverse=True)
-            light_data.size = dimensions[0]  # Largest dimension
-            light_data.size_y = dimensions[1]  # Second largest
-        elif self.light_type == 'POINT':
-            # Calculate average radius for soft shadow size
-            avg_radius = (
-                sum((co - center).length for co in coords) / len(coords)
-            )
-            light_data.shadow_soft_size = max(avg_radius, 0.1)
-
-        # Create light object
-        light_obj = bpy.data.objects.new(
-            name=light_name,
-            object_data=light_data
+
+        if not created:
+            self.report(
+                {'WARNING'}, f"No selected mesh has vertices marked by '{name}'"
+            )
+            return {'CANCELLED'}
+
+        msg = f"Created {created} {self.light_type} light(s) from '{name}'"
+        if skipped:
+            msg += f", skipped {skipped} mesh(es) without it"
+        self.report({'INFO'}, msg)
+        return {'FINISHED'}
+
+
+class SCENEBUILD_OT_ScanEmitters(Operator):
+    """Create lights for emissive surfaces on the selected meshes"""
+    bl_idname = "scene_buildup.scan_emitters"
+    bl_label = "Convert Emitters to Lights"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    light_type: EnumProperty(
+        name="Light Type",
+        items=[
+            ('POINT', "Point", "Omnidirectional point light"),
+            ('AREA', "Area", "Area light with soft shadows"),
+        ],
+        default='AREA'
+    )
+
+    full_rescan: BoolProperty(
+        name="Full Rescan",
+        description="Rescan every mesh, not only the ones changed since last time",
+        default=False
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode == 'OBJECT' and context.active_object is not None
+
+    def execute(self, context):
+        # Selected meshes, or every mesh in the view layer without a selection
+        objects = context.selected_objects or list(context.view_layer.objects)
+        created, scanned, skipped = scan_emitters(
+            objects,
+            self.light_type,
+            context.active_object.scene_buildup,
+            context.collection,
+            full=self.full_rescan,
         )
-        context.collection.objects.link(light_obj)
 
-        # Position light in world space (before parenting)
-        if self.light_type == 'AREA' and avg_normal:
-            # Offset along normal for area lights (uses settings value)
-            light_obj.location = center + (avg_normal * props.light_offset)
-        else:
-            # Point light or no normal: place at center
-            light_obj.location = center
-
-        # Rotate area light to match surface normal
-        if self.light_type == 'AREA' and avg_normal:
-            # Area lights point down their local -Z axis
-            default_dir = Vector((0, 0, -1))
-            rotation_quat = default_dir.rotation_difference(avg_normal)
-            light_obj.rotation_mode = 'QUATERNION'
-            light_obj.rotation_quaternion = rotation_quat
-
-        # Parent light to source mesh (preserves world transform)
-        light_obj.parent = obj
-        light_obj.matrix_parent_inverse = obj.matrix_world.inverted()
-
-        # Sync with parent animation if it exists
-        if (props.enabled and
-            props.effect_type in ('GROW_FROM_FLOOR', 'GROW_OVERSHOOT', 'FALL_DOWN')):
-            start_frame = props.start_frame
-            end_frame = start_frame + props.duration
-
-            # Hide light during parent's animation
-            if start_frame > 0:
-                light_obj.hide_viewport = True
-                light_obj.hide_render = True
-                light_obj.keyframe_insert(
-                    data_path="hide_viewport", frame=start_frame - 1
-                )
-                light_obj.keyframe_insert(
-                    data_path="hide_render", frame=start_frame - 1
-                )
+        msg = f"Created {created} light(s) from emitters on {scanned} mesh(es)"
+        if skipped:
+            msg += f", {skipped} unchanged mesh(es) skipped"
+        self.report({'INFO'}, msg)
+        return {'FINISHED'}
 
-            # Keep hidden during animation
-            light_obj.hide_viewport = True
-            light_obj.hide_render = True
-            light_obj.keyframe_insert(
-                data_path="hide_viewport", frame=start_frame
-            )
-            light_obj.keyframe_insert(
-                data_path="hide_render", frame=start_frame
-            )
-            light_obj.keyframe_insert(
-                data_path="hide_viewport", frame=end_frame - 1
-            )
-            light_obj.keyframe_insert(
-                data_path="hide_render", frame=end_frame - 1
-            )
 
-            # Show when animation completes
-            light_obj.hide_viewport = False
-            light_obj.hide_render = False
-            light_obj.keyframe_insert(
-                data_path="hide_viewport", frame=end_frame
+class SCENEBUILD_OT_LightBudget(Operator):
+    """Replace lights made by the light tools with a few clustered lights"""
+    bl_idname = "scene_buildup.light_budget"
+    bl_label = "Apply Light Budget"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    max_lights: IntProperty(
+        name="Max Lights",
+        description="Number of lights the generated point lights are reduced to",
+        default=32,
+        min=1,
+        soft_max=512
+    )
+
+    method: EnumProperty(
+        name="Clustering",
+        items=[
+            ('KMEANS', "K-Means", "Energy-weighted k-means on light positions"),
+            ('GRID', "Grid", "Uniform grid cells (fast, less even)"),
+        ],
+        default='KMEANS'
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return context.scene is not None
+
+    def execute(self, context):
+        original, stand_ins = apply_light_budget(
+            context.scene, self.max_lights, self.method
+        )
+        if not stand_ins:
+            self.report(
+                {'WARNING'},
+                f"{original} generated point light(s), already within budget"
             )
-            light_obj.keyframe_insert(
-                data_path="hide_render", frame=end_frame
+            return {'CANCELLED'}
+
+        msg = f"Replaced {original} lights with {stand_ins} (originals kept)"
+        self.report({'INFO'}, msg)
+        return {'FINISHED'}
+
+
+class SCENEBUILD_OT_RestoreLightBudget(Operator):
+    """Switch back from budget lights to the original generated lights"""
+    bl_idname = "scene_buildup.restore_light_budget"
+    bl_label = "Restore Original Lights"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return (
+            context.scene is not None
+            and _managed_collection(context.scene, ORIGINAL_LIGHTS) is not None
+        )
+
+    def execute(self, context):
+        restored = restore_light_budget(context.scene)
+        self.report({'INFO'}, f"Restored {restored} original light(s)")
+        return {'FINISHED'}
+
+
+class SCENEBUILD_OT_DetectMirrors(Operator):
+    """Find flat coplanar face groups on the selected meshes and select them"""
+    bl_idname = "scene_buildup.detect_mirrors"
+    bl_label = "Find Planar Mirrors"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    min_area: FloatProperty(
+        name="Min Area",
+        description="Smallest total area of a coplanar face group",
+        default=0.1,
+        min=0.0,
+        soft_max=10.0,
+        unit='AREA'
+    )
+
+    angle_tolerance: FloatProperty(
+        name="Angle Tolerance",
+        description="Normals closer than this count as parallel",
+        default=0.0175,
+        min=0.0001,
+        max=0.5,
+        subtype='ANGLE'
+    )
+
+    distance_tolerance: FloatProperty(
+        name="Distance Tolerance",
+        description="Planes closer than this count as the same plane",
+        default=0.001,
+        min=0.00001,
+        soft_max=0.1,
+        unit='LENGTH'
+    )
+
+    assign: BoolProperty(
+        name="Assign Mirror",
+        description=(
+            "Assign the Mirror material to the found faces instead of only "
+            "selecting them for preview"
+        ),
+        default=False
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode in ('OBJECT', 'EDIT_MESH')
+
+    def execute(self, context):
+        edit_mode = context.mode == 'EDIT_MESH'
+        if edit_mode:
+            candidates = context.objects_in_mode_unique_data
+        else:
+            candidates = context.selected_objects
+        # Each mesh once, its selection is shared by all its users
+        objects = list({
+            obj.data: obj for obj in reversed(candidates) if obj.type == 'MESH'
+        }.values())
+        if not objects:
+            self.report({'WARNING'}, "No mesh objects selected")
+            return {'CANCELLED'}
+
+        if edit_mode:
+            bpy.ops.object.mode_set(mode='OBJECT')
+        try:
+            found, groups = detect_mirror_faces(
+                objects,
+                self.angle_tolerance,
+                self.distance_tolerance,
+                self.min_area,
+                self.assign,
             )
+        finally:
+            if edit_mode:
+                bpy.ops.object.mode_set(mode='EDIT')
+
+        if not found:
+            self.report({'WARNING'}, "No coplanar face groups above Min Area")
+            return {'CANCELLED'}
+
+        action = "Assigned Mirror to" if self.assign else "Selected"
+        msg = f"{action} {found} face(s) in {groups} coplanar group(s)"
+        self.report({'INFO'}, msg)
+        return {'FINISHED'}
+
+
+class SCENEBUILD_OT_AddMirrorProbes(Operator):
+    """Add one planar light probe per coplanar group of Mirror faces"""
+    bl_idname = "scene_buildup.add_mirror_probes"
+    bl_label = "Add Mirror Probes"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    min_area: FloatProperty(
+        name="Min Area",
+        description="Skip mirror planes with less total area",
+        default=0.0,
+        min=0.0,
+        soft_max=10.0,
+        unit='AREA'
+    )
+
+    angle_tolerance: FloatProperty(
+        name="Angle Tolerance",
+        description="Normals closer than this count as parallel",
+        default=0.0175,
+        min=0.0001,
+        max=0.5,
+        subtype='ANGLE'
+    )
 
-        msg = f"Created {self.light_type} light from {len(selected_verts)} verts"
+    distance_tolerance: FloatProperty(
+        name="Distance Tolerance",
+        description="Planes closer than this share one probe",
+        default=0.001,
+        min=0.00001,
+        soft_max=0.1,
+        unit='LENGTH'
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode == 'OBJECT' and MIRROR_MATERIAL in bpy.data.materials
+
+    def execute(self, context):
+        mirror_mat = bpy.data.materials[MIRROR_MATERIAL]
+        # Selected meshes, or every mesh in the view layer without a selection
+        objects = [obj for obj in context.selected_objects if obj.type == 'MESH']
+        if not objects:
+            objects = [
+                obj for obj in context.view_layer.objects if obj.type == 'MESH'
+            ]
+
+        added = add_mirror_probes(
+            context.scene,
+            objects,
+            mirror_mat,
+            self.angle_tolerance,
+            self.distance_tolerance,
+            self.min_area,
+        )
+        if not added:
+            self.report({'WARNING'}, "No faces use the Mirror material")
+            return {'CANCELLED'}
+
+        msg = f"Added {added} planar probe(s) for mirror faces"
         self.report({'INFO'}, msg)
         return {'FINISHED'}
 
 
 class SCENEBUILD_OT_ApplyMirrorMaterial(Operator):
-    """Apply mirror material to selected faces in Edit Mode"""
+    """Apply mirror material to selected faces of every mesh in Edit Mode"""
     bl_idname = "scene_buildup.apply_mirror_material"
     bl_label = "Apply Mirror Material"
     bl_options = {'REGISTER', 'UNDO'}
@@ -697,72 +4129,59 @@ class SCENEBUILD_OT_ApplyMirrorMaterial(Operator):
         )
 
     def execute(self, context):
-        import bmesh
-
-        obj = context.edit_object
+        # Meshes shared by several objects in Edit Mode only appear once
+        objects = [
+            obj for obj in context.objects_in_mode_unique_data
+            if obj.type == 'MESH'
+        ]
 
         # Get or create mirror material
-        mat_name = "Mirror"
-        if mat_name in bpy.data.materials:
-            mirror_mat = bpy.data.materials[mat_name]
-        else:
-            mirror_mat = self.create_mirror_material(mat_name)
-
-        # Ensure material is in object's slots
-        if mirror_mat.name not in obj.data.materials:
-            obj.data.materials.append(mirror_mat)
+        mirror_mat = ensure_mirror_material()
 
-        # Get material index
-        mat_index = obj.data.materials.find(mirror_mat.name)
+        face_count = 0
+        mesh_count = 0
+        for obj in objects:
+            assigned = assign_material_to_edit_selection(obj.data, mirror_mat)
+            if assigned:
+                face_count += assigned
+                mesh_count += 1
 
-        # Get BMesh and assign to selected faces
-        bm = bmesh.from_edit_mesh(obj.data)
-
-        selected_faces = [f for f in bm.faces if f.select]
-        if not selected_faces:
+        if not face_count:
             self.report({'WARNING'}, "No faces selected")
             return {'CANCELLED'}
 
-        # Assign material index to selected faces
-        for face in selected_faces:
-            face.material_index = mat_index
-
-        # Update mesh
-        bmesh.update_edit_mesh(obj.data)
-
-        msg = f"Applied mirror material to {len(selected_faces)} face(s)"
+        msg = f"Applied mirror material to {face_count} face(s)"
+        if mesh_count > 1:
+            msg += f" on {mesh_count} meshes"
         self.report({'INFO'}, msg)
         return {'FINISHED'}
 
-    def create_mirror_material(self, name):
-        """Create perfect chrome mirror material using Principled BSDF"""
-        mat = bpy.data.materials.new(name=name)
-        mat.use_nodes = True
 
-        nodes = mat.node_tree.nodes
-        links = mat.node_tree.links
+# ============================================================================
+# Panel Statistics
+# ============================================================================
 
-        # Clear default nodes for clean setup
-        nodes.clear()
+# Selected object count per view layer, valid until the next depsgraph update
+_selection_counts = {}
 
-        # Create Principled BSDF node
-        bsdf = nodes.new(type='ShaderNodeBsdfPrincipled')
-        bsdf.location = (0, 0)
 
-        # Create Material Output node
-        output = nodes.new(type='ShaderNodeOutputMaterial')
-        output.location = (300, 0)
+def selected_object_count(view_layer):
+    """Number of selected objects without building a list on every redraw
 
-        # Configure for perfect chrome mirror
-        bsdf.inputs['Base Color'].default_value = (1.0, 1.0, 1.0, 1.0)
-        bsdf.inputs['Metallic'].default_value = 1.0
-        bsdf.inputs['Roughness'].default_value = 0.0
-        # Specular uses default 0.5 which is correct for mirrors
+    The panel redraws whenever the mouse moves over the sidebar, so the count
+    is cached until a depsgraph update, which selection changes also send.
+    """
+    key = view_layer.as_pointer()
+    count = _selection_counts.get(key)
+    if count is None:
+        count = _selection_counts[key] = len(view_layer.objects.selected)
+    return count
 
-        # Link shader to output
-        links.new(bsdf.outputs['BSDF'], output.inputs['Surface'])
 
-        return mat
+@persistent
+def clear_selection_counts(*args):
+    """depsgraph_update_post/load_post handler invalidating cached counts"""
+    _selection_counts.clear()
 
 
 # ============================================================================
@@ -786,7 +4205,7 @@ class SCENEBUILD_PT_MainPanel(Panel):
         layout = self.layout
         obj = context.active_object
         props = obj.scene_buildup
-        selected_count = len(context.selected_objects)
+        selected_count = selected_object_count(context.view_layer)
 
         # Header with object/selection info
         box = layout.box()
@@ -816,6 +4235,13 @@ class SCENEBUILD_PT_MainPanel(Panel):
             col = box.column(align=True)
             col.prop(props, "start_frame")
             col.prop(props, "duration")
+            box.prop(props, "animation_engine")
+            if props.animation_engine == 'BULK' and supports_action_slots():
+                box.prop(props, "use_shared_action")
+            elif props.animation_engine == 'DRIVERS':
+                box.prop(props, "progress_source")
+            if props.animation_engine != 'LEGACY':
+                box.prop(props, "visibility_mode")
 
             # Effect-specific parameters
             if props.effect_type == 'GROW_FROM_FLOOR':
@@ -851,6 +4277,13 @@ class SCENEBUILD_PT_MainPanel(Panel):
                 text="Clear Animation"
             )
 
+            row = col.row(align=True)
+            row.operator(
+                "scene_buildup.pack_instancer",
+                icon='GEOMETRY_NODES',
+                text="Pack into Instancer"
+            )
+
         else:
             # Show hint when not enabled
             box = layout.box()
@@ -864,9 +4297,8 @@ class SCENEBUILD_PT_MainPanel(Panel):
 
         # Only show in Edit Mode with mesh
         if context.mode == 'EDIT_MESH' and context.edit_object:
-            import bmesh
-            bm = bmesh.from_edit_mesh(context.edit_object.data)
-            vert_count = sum(1 for v in bm.verts if v.select)
+            # Kept up to date by edit mode, no need to walk the BMesh
+            vert_count = context.edit_object.data.total_vert_sel
 
             if vert_count > 0:
                 box.label(
@@ -882,6 +4314,9 @@ class SCENEBUILD_PT_MainPanel(Panel):
                 col.prop(light_props, "light_intensity")
                 col.prop(light_props, "light_color_temp")
                 col.prop(light_props, "light_offset", slider=True)
+                box.prop(light_props, "light_area_fit")
+                box.prop(light_props, "light_per_island")
+                box.prop(light_props, "light_share_data")
 
                 box.separator()
 
@@ -902,14 +4337,72 @@ class SCENEBUILD_PT_MainPanel(Panel):
                 op.light_type = 'AREA'
             else:
                 box.label(text="Select vertices to place light", icon='INFO')
+        elif context.mode == 'OBJECT':
+            # Batch lights from a stored group on every selected mesh
+            light_props = obj.scene_buildup
+            box.prop(light_props, "light_source_group")
+
+            col = box.column(align=True)
+            col.prop(light_props, "light_intensity")
+            col.prop(light_props, "light_color_temp")
+            col.prop(light_props, "light_offset", slider=True)
+            box.prop(light_props, "light_area_fit")
+            box.prop(light_props, "light_per_island")
+            box.prop(light_props, "light_share_data")
+
+            box.separator()
+
+            op = box.operator(
+                "scene_buildup.add_lights_from_group",
+                icon='LIGHT_POINT',
+                text="Point Lights from Group"
+            )
+            op.light_type = 'POINT'
+
+            op = box.operator(
+                "scene_buildup.add_lights_from_group",
+                icon='LIGHT_AREA',
+                text="Area Lights from Group"
+            )
+            op.light_type = 'AREA'
+
+            box.operator(
+                "scene_buildup.scan_emitters",
+                icon='SHADING_RENDERED',
+                text="Convert Emitters to Lights"
+            )
+            box.label(text="Or enter Edit Mode to use a selection", icon='INFO')
         else:
             box.label(text="Enter Edit Mode to use", icon='INFO')
 
+        # Light budget works on every generated light in the scene
+        if context.mode == 'OBJECT':
+            box.separator()
+            col = box.column(align=True)
+            col.operator(
+                "scene_buildup.light_budget",
+                icon='LIGHT_HEMI',
+                text="Apply Light Budget"
+            )
+            col.operator(
+                "scene_buildup.restore_light_budget",
+                icon='LOOP_BACK',
+                text="Restore Original Lights"
+            )
+
         # Material Tools section (always visible)
         layout.separator()
         box = layout.box()
         box.label(text="Material Tools:", icon='MATERIAL')
 
+        # Detection previews found mirrors as a face selection
+        if context.mode in ('OBJECT', 'EDIT_MESH'):
+            box.operator(
+                "scene_buildup.detect_mirrors",
+                icon='VIEW_ZOOM',
+                text="Find Planar Mirrors"
+            )
+
         # Only show for mesh in edit mode
         if context.mode == 'EDIT_MESH' and context.edit_object:
             box.operator(
@@ -917,6 +4410,12 @@ class SCENEBUILD_PT_MainPanel(Panel):
                 icon='MATSPHERE',
                 text="Apply Mirror to Selected Faces"
             )
+        elif context.mode == 'OBJECT':
+            box.operator(
+                "scene_buildup.add_mirror_probes",
+                icon='LIGHTPROBE_PLANE',
+                text="Add Mirror Probes"
+            )
         else:
             box.label(
                 text="Enter Edit Mode to use",
@@ -929,11 +4428,19 @@ class SCENEBUILD_PT_MainPanel(Panel):
 # ============================================================================
 
 classes = (
+    SceneBuildupHomeCollection,
     SceneBuildupProperties,
     SCENEBUILD_OT_ApplyAnimation,
     SCENEBUILD_OT_ClearAnimation,
+    SCENEBUILD_OT_PackInstancer,
     SCENEBUILD_OT_AddLightToLamp,
+    SCENEBUILD_OT_AddLightsFromGroup,
+    SCENEBUILD_OT_ScanEmitters,
+    SCENEBUILD_OT_LightBudget,
+    SCENEBUILD_OT_RestoreLightBudget,
+    SCENEBUILD_OT_DetectMirrors,
     SCENEBUILD_OT_ApplyMirrorMaterial,
+    SCENEBUILD_OT_AddMirrorProbes,
     SCENEBUILD_PT_MainPanel,
 )
 
@@ -946,8 +4453,45 @@ def register():
     # Attach properties to Object type (after PropertyGroup is registered)
     bpy.types.Object.scene_buildup = PointerProperty(type=SceneBuildupProperties)
 
+    if sync_start_buckets_handler not in bpy.app.handlers.frame_change_pre:
+        bpy.app.handlers.frame_change_pre.append(sync_start_buckets_handler)
+    for handlers in (
+        bpy.app.handlers.depsgraph_update_post,
+        bpy.app.handlers.load_post,
+    ):
+        if clear_selection_counts not in handlers:
+            handlers.append(clear_selection_counts)
+    if track_scan_changes not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(track_scan_changes)
+    for handlers in (
+        bpy.app.handlers.load_post,
+        bpy.app.handlers.undo_post,
+        bpy.app.handlers.redo_post,
+    ):
+        if reset_scan_changes not in handlers:
+            handlers.append(reset_scan_changes)
+
 def unregister():
     """Unregister all classes and remove properties"""
+    if sync_start_buckets_handler in bpy.app.handlers.frame_change_pre:
+        bpy.app.handlers.frame_change_pre.remove(sync_start_buckets_handler)
+    for handlers in (
+        bpy.app.handlers.depsgraph_update_post,
+        bpy.app.handlers.load_post,
+    ):
+        if clear_selection_counts in handlers:
+            handlers.remove(clear_selection_counts)
+    if track_scan_changes in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(track_scan_changes)
+    for handlers in (
+        bpy.app.handlers.load_post,
+        bpy.app.handlers.undo_post,
+        bpy.app.handlers.redo_post,
+    ):
+        if reset_scan_changes in handlers:
+            handlers.remove(reset_scan_changes)
+    _selection_counts.clear()
+
     # Remove attached properties first (if they exist)
     if hasattr(bpy.types.Object, 'scene_buildup'):
         del bpy.types.Object.scene_buildup
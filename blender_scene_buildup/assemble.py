@@ -0,0 +1,319 @@
+"""
+Stream a JSON-lines layout into an animated scene.
+
+Each line is one object, every key is optional:
+
+    {"name": "Chair.001", "mesh": "Chair", "library": "/abs/assets.blend",
+     "location": [1.0, 2.0, 0.0], "rotation": [0.0, 0.0, 1.57], "scale": 1.0,
+     "collection": "Furniture", "buildup": {"start_frame": 10}}
+
+"mesh" names a mesh in the open file, or in "library" when given; without
+it the object is an empty. "rotation" is XYZ Euler in radians, or give
+"quaternion" as [w, x, y, z]. "buildup" holds per-object buildup settings
+(see BUILDUP_SETTINGS), and a line {"defaults": {...}} sets buildup
+settings for the lines after it. Objects with any buildup settings are
+enabled and animated.
+
+Lines are read in chunks, so memory stays bounded however long the layout
+is: each chunk creates its objects, sets their transforms in one
+foreach_set per property, fills in their buildup settings and writes their
+animation before the next chunk is read.
+
+    blender -b base.blend --python blender_scene_buildup/assemble.py -- layout.jsonl -o scene.blend
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import bpy
+import numpy as np
+
+if __package__:
+    from . import BUILDUP_SETTINGS, remove_empty_buckets
+    from .batch import animate_objects, ensure_registered, save_blend, set_settings
+else:
+    # Run as a script with --python, the package is not imported yet
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from blender_scene_buildup import BUILDUP_SETTINGS, remove_empty_buckets
+    from blender_scene_buildup.batch import (
+        animate_objects,
+        ensure_registered,
+        save_blend,
+        set_settings,
+    )
+
+
+# Keys a layout record may have
+RECORD_KEYS = (
+    "name",
+    "mesh",
+    "library",
+    "location",
+    "rotation",
+    "quaternion",
+    "scale",
+    "collection",
+    "buildup",
+)
+
+# Records read, built and animated at a time
+CHUNK_SIZE = 2048
+
+# Unlinked collection holding one chunk, so its transforms are set with
+# foreach_set on collection.objects
+STAGING_COLLECTION = "SceneBuildup Assembly Staging"
+
+
+def read_chunks(lines, size=CHUNK_SIZE):
+    """Yield lists of up to size validated records from JSON lines
+
+    Defaults lines are folded into the buildup settings of the records
+    after them and not yielded.
+    """
+    defaults = {}
+    chunk = []
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"Line {number}: {error}") from error
+
+        if "defaults" in record:
+            defaults = {**defaults, **record["defaults"]}
+            unknown = set(defaults) - set(BUILDUP_SETTINGS)
+            if unknown:
+                raise ValueError(f"Line {number}: unknown settings {sorted(unknown)}")
+            continue
+        unknown = set(record) - set(RECORD_KEYS)
+        if unknown:
+            raise ValueError(f"Line {number}: unknown keys {sorted(unknown)}")
+        if "library" in record and "mesh" not in record:
+            raise ValueError(f"Line {number}: library without mesh")
+
+        buildup = {**defaults, **record.get("buildup", {})}
+        unknown = set(buildup) - set(BUILDUP_SETTINGS)
+        if unknown:
+            raise ValueError(f"Line {number}: unknown settings {sorted(unknown)}")
+        if buildup:
+            buildup.setdefault("enabled", True)
+        record["buildup"] = buildup
+
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class MeshSource:
+    """Meshes records refer to, loading library meshes in batches
+
+    Each mesh is looked up or loaded once and then shared by every record
+    using it, so repeated assets become linked duplicates.
+    """
+
+    def __init__(self, link=False):
+        self.link = link
+        self.meshes = {}
+        self.library_loads = 0
+
+    def prefetch(self, records):
+        """Load the library meshes of records not loaded yet, one call per file"""
+        wanted = {}
+        for record in records:
+            if "library" in record:
+                key = (record["library"], record["mesh"])
+                if key not in self.meshes:
+                    wanted.setdefault(record["library"], set()).add(record["mesh"])
+
+        for library, names in wanted.items():
+            with bpy.data.libraries.load(library, link=self.link) as (data_from, data_to):
+                found = sorted(names & set(data_from.meshes))
+                data_to.meshes = found
+            # Appended meshes may be renamed, match them by position
+            for name, mesh in zip(found, data_to.meshes):
+                self.meshes[(library, name)] = mesh
+            self.library_loads += 1
+
+    def get(self, record):
+        """Mesh for record, None for an empty"""
+        if "mesh" not in record:
+            return None
+        key = (record.get("library"), record["mesh"])
+        mesh = self.meshes.get(key)
+        if mesh is None and "library" not in record:
+            mesh = bpy.data.meshes.get(record["mesh"])
+            self.meshes[key] = mesh
+        if mesh is None:
+            where = record.get("library", "the open file")
+            raise KeyError(f"No mesh '{record['mesh']}' in {where}")
+        return mesh
+
+
+def target_collection(scene, name, collections):
+    """Collection named name under the scene, created on first use"""
+    if not name:
+        return scene.collection
+    collection = collections.get(name)
+    if collection is None:
+        collection = bpy.data.collections.get(name)
+        if collection is None:
+            collection = bpy.data.collections.new(name)
+            scene.collection.children.link(collection)
+        collections[name] = collection
+    return collection
+
+
+def record_transforms(records):
+    """(location, rotation, quaternion, scale, quaternion rows) of records"""
+    count = len(records)
+    location = np.zeros((count, 3), dtype=np.float32)
+    rotation = np.zeros((count, 3), dtype=np.float32)
+    quaternion = np.zeros((count, 4), dtype=np.float32)
+    quaternion[:, 0] = 1.0
+    scale = np.ones((count, 3), dtype=np.float32)
+    quaternion_rows = []
+    for i, record in enumerate(records):
+        if "location" in record:
+            location[i] = record["location"]
+        if "rotation" in record:
+            rotation[i] = record["rotation"]
+        if "quaternion" in record:
+            quaternion[i] = record["quaternion"]
+            quaternion_rows.append(i)
+        if "scale" in record:
+            # A single number scales uniformly
+            scale[i] = record["scale"]
+    return location, rotation, quaternion, scale, quaternion_rows
+
+
+def build_chunk(scene, records, meshes, collections, default_collection=None):
+    """Create, place, link and animate one chunk, returns (created, animated)"""
+    meshes.prefetch(records)
+    objects = [
+        bpy.data.objects.new(
+            record.get("name") or record.get("mesh") or "Empty", meshes.get(record)
+        )
+        for record in records
+    ]
+
+    location, rotation, quaternion, scale, quaternion_rows = record_transforms(records)
+    staging = bpy.data.collections.new(STAGING_COLLECTION)
+    try:
+        for obj in objects:
+            staging.objects.link(obj)
+        staging.objects.foreach_set("location", location.ravel())
+        staging.objects.foreach_set("rotation_euler", rotation.ravel())
+        staging.objects.foreach_set("rotation_quaternion", quaternion.ravel())
+        staging.objects.foreach_set("scale", scale.ravel())
+        for i in quaternion_rows:
+            objects[i].rotation_mode = 'QUATERNION'
+
+        for obj, record in zip(objects, records):
+            name = record.get("collection", default_collection)
+            target_collection(scene, name, collections).objects.link(obj)
+    finally:
+        bpy.data.collections.remove(staging)
+
+    for obj, record in zip(objects, records):
+        if record["buildup"]:
+            set_settings(obj, record["buildup"])
+    # New objects have no child lights, skip the scan for them
+    animated, _ = animate_objects(scene, objects, lights={})
+    return len(objects), animated
+
+
+def assemble(lines, scene=None, chunk_size=CHUNK_SIZE, link=False,
+             default_collection=None):
+    """Build and animate the objects of JSON lines, returns stats"""
+    scene = scene or bpy.context.scene
+    began = time.perf_counter()
+    meshes = MeshSource(link=link)
+    collections = {}
+    created = animated = chunks = 0
+    for records in read_chunks(lines, chunk_size):
+        made, moved = build_chunk(
+            scene, records, meshes, collections, default_collection
+        )
+        created += made
+        animated += moved
+        chunks += 1
+    remove_empty_buckets(scene)
+    return {
+        "objects": created,
+        "animated": animated,
+        "chunks": chunks,
+        "meshes": sum(mesh is not None for mesh in meshes.meshes.values()),
+        "library_loads": meshes.library_loads,
+        "assemble_seconds": round(time.perf_counter() - began, 4),
+    }
+
+
+def parse_args(argv=None):
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(
+        prog="assemble.py",
+        description="Build an animated scene from a JSON-lines layout",
+    )
+    parser.add_argument("layout", help="JSON-lines layout, - for stdin")
+    parser.add_argument(
+        "-o", "--output",
+        help="Save to this .blend instead of overwriting the open file",
+    )
+    parser.add_argument(
+        "--chunk", type=int, default=CHUNK_SIZE, help="Records per chunk"
+    )
+    parser.add_argument(
+        "--link", action="store_true",
+        help="Link library meshes instead of appending them",
+    )
+    parser.add_argument(
+        "--collection", help="Collection for records without one"
+    )
+    parser.add_argument(
+        "--stats", help="Also write the stats JSON to this file"
+    )
+    parser.add_argument(
+        "--no-save", action="store_true", help="Assemble without saving"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Command line entry point, prints one JSON line of stats"""
+    args = parse_args(argv)
+    began = time.perf_counter()
+    ensure_registered()
+
+    if args.layout == "-":
+        stats = assemble(sys.stdin, chunk_size=args.chunk, link=args.link,
+                         default_collection=args.collection)
+    else:
+        with open(args.layout, encoding="utf-8") as lines:
+            stats = assemble(lines, chunk_size=args.chunk, link=args.link,
+                             default_collection=args.collection)
+
+    if not args.no_save:
+        output = args.output or bpy.data.filepath
+        if not output:
+            raise SystemExit("No output path and the scene was never saved")
+        stats.update(save_blend(output))
+    stats["total_seconds"] = round(time.perf_counter() - began, 4)
+
+    line = json.dumps(stats, sort_keys=True)
+    print(line)
+    if args.stats:
+        Path(args.stats).write_text(line + "\n", encoding="utf-8")
+    return stats
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,517 @@
+"""
+Headless entry point applying scene buildup from a manifest.
+
+Runs in background mode without selection or context overrides:
+
+    blender -b scene.blend --python blender_scene_buildup/batch.py -- manifest.json
+
+or, with the add-on installed, from any script:
+
+    from blender_scene_buildup import batch
+    stats = batch.apply_manifest(batch.load_manifest("manifest.json"))
+
+A manifest maps object names or patterns to buildup settings:
+
+    {
+        "defaults": {"effect_type": "GROW_FROM_FLOOR", "duration": 15},
+        "objects": [
+            {"match": "Chair*", "start_frame": 10},
+            {"name": "Table", "effect_type": "FALL_DOWN"},
+            {"regex": "^Lamp\\\\.\\\\d+$", "start_frame": 30}
+        ]
+    }
+
+Entries apply in order, so later entries override earlier ones for objects
+both match, but only for the keys they set: "defaults" fill in an object's
+settings once, before its first matching entry. Settings are the per-object buildup settings (see
+BUILDUP_SETTINGS); YAML manifests work when PyYAML is installed.
+
+Optional sections run the lighting and material tools before animating:
+
+    "mirrors": {"match": "Mirror*", "min_area": 0.1, "probes": true},
+    "lights": [{"match": "Lamp*", "light_type": "AREA",
+                "light_source_group": "bulb"}],
+    "emitters": {"light_type": "AREA", "light_share_data": true}
+
+"lights" entries need a name, match or regex, "mirrors" and "emitters"
+default to every mesh. Light entries may set the light_* tool settings.
+"""
+
+import argparse
+import fnmatch
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+import bpy
+import numpy as np
+
+if __package__:
+    from . import (
+        ANIMATED_EFFECTS,
+        BUILDUP_SETTINGS,
+        MIRROR_MATERIAL,
+        add_mirror_probes,
+        apply_buildup_drivers,
+        assign_start_buckets,
+        bulk_setting_copies,
+        child_lights_by_parent,
+        detect_mirror_faces,
+        lights_from_group,
+        plan_buildup,
+        register,
+        release_start_buckets,
+        remove_empty_buckets,
+        scan_emitters,
+        supports_action_slots,
+        template_actions,
+        write_buildup_plan,
+        write_template_plan,
+    )
+    from .result_cache import ResultCache, cache_key, load_manifest
+else:
+    # Run as a script with --python, the package is not imported yet
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from blender_scene_buildup import (
+        ANIMATED_EFFECTS,
+        BUILDUP_SETTINGS,
+        MIRROR_MATERIAL,
+        add_mirror_probes,
+        apply_buildup_drivers,
+        assign_start_buckets,
+        bulk_setting_copies,
+        child_lights_by_parent,
+        detect_mirror_faces,
+        lights_from_group,
+        plan_buildup,
+        register,
+        release_start_buckets,
+        remove_empty_buckets,
+        scan_emitters,
+        supports_action_slots,
+        template_actions,
+        write_buildup_plan,
+        write_template_plan,
+    )
+    from blender_scene_buildup.result_cache import (
+        ResultCache,
+        cache_key,
+        load_manifest,
+    )
+
+
+# Settings that have to match for objects to be planned in one batch, the
+# others may differ per object
+GROUP_SETTINGS = (
+    "effect_type",
+    "animation_engine",
+    "visibility_mode",
+    "use_shared_action",
+    "progress_source",
+)
+
+# Keys of a manifest entry that select objects rather than set settings
+MATCH_KEYS = ("name", "match", "regex")
+
+# Light tool settings "lights" and "emitters" entries may set
+LIGHT_SETTINGS = (
+    "light_offset",
+    "light_intensity",
+    "light_color_temp",
+    "light_source_group",
+    "light_per_island",
+    "light_share_data",
+    "light_area_fit",
+)
+
+# Options of the "mirrors" section and their defaults
+MIRROR_OPTIONS = {
+    "min_area": 0.1,
+    "angle_tolerance": 0.0175,
+    "distance_tolerance": 0.001,
+    "assign": True,
+    "probes": False,
+}
+
+
+def _entry_matcher(entry, required=True):
+    """Predicate on object names for one manifest entry"""
+    keys = [key for key in MATCH_KEYS if key in entry]
+    if not keys and not required:
+        return lambda name: True
+    if len(keys) != 1:
+        raise ValueError(f"Manifest entry needs one of {MATCH_KEYS}: {entry}")
+    key = keys[0]
+    if key == "name":
+        return lambda name: name == entry["name"]
+    if key == "match":
+        return lambda name: fnmatch.fnmatchcase(name, entry["match"])
+    pattern = re.compile(entry["regex"])
+    return lambda name: pattern.search(name) is not None
+
+
+def _entry_options(entry, allowed, defaults=None):
+    """Non-matching keys of an entry over defaults, checked against allowed"""
+    options = dict(defaults or {})
+    options.update(
+        (key, value) for key, value in entry.items() if key not in MATCH_KEYS
+    )
+    unknown = set(options) - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown settings {sorted(unknown)} in {entry}")
+    return options
+
+
+def set_settings(obj, settings):
+    """Set scene_buildup properties on obj, naming the object on bad values"""
+    props = obj.scene_buildup
+    for name, value in settings.items():
+        try:
+            setattr(props, name, value)
+        except (TypeError, ValueError) as error:
+            raise ValueError(f"'{obj.name}': bad {name}={value!r}: {error}")
+
+
+def _matching_meshes(entry, objects, required=True):
+    matches = _entry_matcher(entry, required)
+    return [obj for obj in objects if obj.type == 'MESH' and matches(obj.name)]
+
+
+def resolve_objects(manifest, objects):
+    """Map objects to their merged settings from the manifest entries
+
+    An object starts from "defaults" on its first match, then each
+    matching entry applies only its own keys, so a later entry never puts
+    a default back over a setting an earlier entry made. Returns
+    (assignments, unmatched) where assignments maps each matched object
+    to its settings dict and unmatched lists entries without a match.
+    """
+    defaults = {"enabled": True}
+    defaults.update(_entry_options(manifest.get("defaults", {}), BUILDUP_SETTINGS))
+    assignments = {}
+    unmatched = []
+    objects = list(objects)
+    for entry in manifest.get("objects", ()):
+        matches = _entry_matcher(entry)
+        settings = _entry_options(entry, BUILDUP_SETTINGS)
+        found = False
+        for obj in objects:
+            if matches(obj.name):
+                if obj not in assignments:
+                    assignments[obj] = dict(defaults)
+                assignments[obj].update(settings)
+                found = True
+        if not found:
+            unmatched.append(entry)
+    return assignments, unmatched
+
+
+def _apply_group(scene, objects, lights):
+    """Animate objects sharing GROUP_SETTINGS with their own settings"""
+    props = [obj.scene_buildup for obj in objects]
+    first = props[0]
+    effect_type = first.effect_type
+    engine = first.animation_engine
+    visibility = first.visibility_mode
+
+    def column(name):
+        return np.array([getattr(p, name) for p in props])
+
+    if engine == 'DRIVERS':
+        apply_buildup_drivers(
+            objects, effect_type, first.progress_source,
+            lights=lights, visibility=visibility,
+        )
+    else:
+        # Keyframe Insert is the operator's per-key path, batch always
+        # writes the same keys in bulk
+        plan = plan_buildup(
+            objects,
+            effect_type,
+            column("start_frame"),
+            column("duration"),
+            floor_offset=column("floor_offset"),
+            fall_height=column("fall_height"),
+            overshoot_amount=column("overshoot_amount"),
+            overshoot_settle_ratio=column("overshoot_settle_ratio"),
+            use_delta=engine == 'TEMPLATE',
+            lights=lights,
+            visibility=visibility,
+        )
+        if engine == 'TEMPLATE':
+            write_template_plan(plan, templates=template_actions())
+        else:
+            shared_action = None
+            if first.use_shared_action and supports_action_slots():
+                shared_action = bpy.data.actions.new(name="SceneBuildupAction")
+            write_buildup_plan(plan, shared_action=shared_action)
+            if shared_action is not None and shared_action.users == 0:
+                bpy.data.actions.remove(shared_action)
+
+    # Child lights appear with the bucket of their parent's end frame
+    group_lights = [light for obj in objects for light in lights.get(obj, ())]
+    if visibility == 'COLLECTION' and effect_type in ANIMATED_EFFECTS:
+        start = column("start_frame")
+        end = start + column("duration")
+        assign_start_buckets(
+            scene,
+            objects + group_lights,
+            list(start) + [
+                end[i] for i, obj in enumerate(objects) for _ in lights.get(obj, ())
+            ],
+        )
+    else:
+        release_start_buckets(scene, objects + group_lights)
+
+
+def animate_objects(scene, objects, lights=None):
+    """Animate the enabled objects from their own buildup settings
+
+    Objects are batched by GROUP_SETTINGS. lights maps objects to their
+    child lights, pass an empty dict for objects known to have none to
+    skip the scan over the file. Returns (objects animated, batches).
+    """
+    groups = {}
+    for obj in objects:
+        props = obj.scene_buildup
+        if props.enabled:
+            key = tuple(getattr(props, name) for name in GROUP_SETTINGS)
+            groups.setdefault(key, []).append(obj)
+
+    if lights is None:
+        lights = child_lights_by_parent()
+    for group in groups.values():
+        _apply_group(scene, group, lights)
+    return sum(len(group) for group in groups.values()), len(groups)
+
+
+def apply_mirrors(scene, entry):
+    """Run the "mirrors" section, returns (faces, groups, probes)"""
+    options = _entry_options(entry, MIRROR_OPTIONS, MIRROR_OPTIONS)
+    # Each mesh once, linked duplicates share their faces
+    objects = list({
+        obj.data: obj
+        for obj in _matching_meshes(entry, scene.objects, required=False)
+    }.values())
+    if not objects:
+        return 0, 0, 0
+
+    faces, groups = detect_mirror_faces(
+        objects,
+        options["angle_tolerance"],
+        options["distance_tolerance"],
+        options["min_area"],
+        options["assign"],
+    )
+    probes = 0
+    if options["probes"] and MIRROR_MATERIAL in bpy.data.materials:
+        probes = add_mirror_probes(
+            scene,
+            objects,
+            bpy.data.materials[MIRROR_MATERIAL],
+            options["angle_tolerance"],
+            options["distance_tolerance"],
+        )
+    return faces, groups, probes
+
+
+def apply_lights(scene, entries):
+    """Run the "lights" entries, returns the number of lights created"""
+    created = 0
+    for entry in entries:
+        options = _entry_options(entry, LIGHT_SETTINGS + ("light_type",))
+        light_type = options.pop("light_type", 'POINT')
+        objects = _matching_meshes(entry, scene.objects)
+        for obj in objects:
+            set_settings(obj, options)
+        if objects:
+            created += lights_from_group(
+                objects, light_type, objects[0].scene_buildup, scene.collection
+            )[0]
+    return created
+
+
+def apply_emitters(scene, entry):
+    """Run the "emitters" section, returns the number of lights created"""
+    options = _entry_options(entry, LIGHT_SETTINGS + ("light_type",))
+    light_type = options.pop("light_type", 'AREA')
+    objects = _matching_meshes(entry, scene.objects, required=False)
+    if not objects:
+        return 0
+    for obj in objects:
+        set_settings(obj, options)
+    return scan_emitters(
+        objects, light_type, objects[0].scene_buildup, scene.collection,
+        full=True,
+    )[0]
+
+
+def apply_manifest(manifest, scene=None):
+    """Apply buildup settings and animation from a manifest dict
+
+    Works on scene.objects through the data API only, no selection or
+    operator context is needed. Objects are matched before the light tools
+    run, so generated lights never pick up buildup entries, and lights
+    exist before animating so they are synced with their parents. Returns
+    a dict of counts and timings.
+    """
+    scene = scene or bpy.context.scene
+    began = time.perf_counter()
+    assignments, unmatched = resolve_objects(manifest, scene.objects)
+    resolved = time.perf_counter()
+
+    stats = {}
+    if "mirrors" in manifest:
+        faces, planes, probes = apply_mirrors(scene, manifest["mirrors"])
+        stats.update(mirror_faces=faces, mirror_planes=planes, mirror_probes=probes)
+    if "lights" in manifest:
+        stats["lights"] = apply_lights(scene, manifest["lights"])
+    if "emitters" in manifest:
+        stats["emitter_lights"] = apply_emitters(scene, manifest["emitters"])
+    tooled = time.perf_counter()
+
+    # animate_objects() re-buckets every group once
+    with bulk_setting_copies():
+        for obj, settings in assignments.items():
+            set_settings(obj, settings)
+    animated, groups = animate_objects(scene, assignments)
+    remove_empty_buckets(scene)
+    applied = time.perf_counter()
+
+    stats.update(
+        objects=animated,
+        matched=len(assignments),
+        groups=groups,
+        unmatched_entries=len(unmatched),
+        resolve_seconds=round(resolved - began, 4),
+        tools_seconds=round(tooled - resolved, 4),
+        apply_seconds=round(applied - tooled, 4),
+    )
+    return stats
+
+
+def save_blend(output):
+    """Save the open file to output, returns its stats entries"""
+    began = time.perf_counter()
+    output = Path(output).resolve()
+    output.parent.mkdir(parents=True, exist_ok=True)
+    bpy.ops.wm.save_as_mainfile(filepath=str(output))
+    return {
+        "output": str(output),
+        "save_seconds": round(time.perf_counter() - began, 4),
+    }
+
+
+def cached_result(cache, key, output, began):
+    """Stats of a cache hit linked to output, or None on a miss"""
+    stats = cache.fetch(key, output)
+    if stats is not None:
+        stats.update(
+            cached=True,
+            output=str(Path(output).resolve()),
+            total_seconds=round(time.perf_counter() - began, 4),
+        )
+    return stats
+
+
+def process_blend(filepath, manifest, output, cache=None):
+    """Open filepath, apply manifest and save to output, returns stats
+
+    Opening a file keeps registered add-ons, so a long-running process can
+    call this for one file after another. With a ResultCache, a result for
+    the same file bytes and manifest is linked to output without opening
+    the file at all.
+    """
+    began = time.perf_counter()
+    key = None
+    if cache is not None:
+        key = cache_key(filepath, manifest)
+        stats = cached_result(cache, key, output, began)
+        if stats is not None:
+            return stats
+
+    bpy.ops.wm.open_mainfile(filepath=str(filepath), load_ui=False)
+    stats = {
+        "input": str(Path(filepath).resolve()),
+        "open_seconds": round(time.perf_counter() - began, 4),
+    }
+    stats.update(apply_manifest(manifest))
+    stats.update(save_blend(output))
+    stats["total_seconds"] = round(time.perf_counter() - began, 4)
+    if key is not None:
+        cache.store(key, output, stats)
+    return stats
+
+
+def ensure_registered():
+    """Register the add-on unless it is enabled already"""
+    # Background Blender does not enable add-ons from a --python script
+    if not hasattr(bpy.types.Object, "scene_buildup"):
+        register()
+
+
+def parse_args(argv=None):
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(
+        prog="batch.py",
+        description="Apply scene buildup to the open .blend from a manifest",
+    )
+    parser.add_argument("manifest", help="JSON or YAML manifest")
+    parser.add_argument(
+        "-o", "--output",
+        help="Save to this .blend instead of overwriting the open file",
+    )
+    parser.add_argument(
+        "--stats", help="Also write the stats JSON to this file"
+    )
+    parser.add_argument(
+        "--no-save", action="store_true", help="Apply without saving"
+    )
+    parser.add_argument(
+        "--cache", help="Result cache directory, reused for unchanged inputs"
+    )
+    parser.add_argument(
+        "--cache-size", type=float, default=0.0,
+        help="Evict least recently used results past this many GiB (0: never)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Command line entry point, prints one JSON line of stats"""
+    args = parse_args(argv)
+    began = time.perf_counter()
+    ensure_registered()
+
+    manifest = load_manifest(args.manifest)
+    output = args.output or bpy.data.filepath
+    if not args.no_save and not output:
+        raise SystemExit("No output path and the scene was never saved")
+
+    # The file on disk is what was opened, so it stands in for the scene
+    cache = key = stats = None
+    if args.cache and not args.no_save and bpy.data.filepath:
+        cache = ResultCache(args.cache, int(args.cache_size * 2**30))
+        key = cache_key(bpy.data.filepath, manifest)
+        stats = cached_result(cache, key, output, began)
+
+    if stats is None:
+        stats = apply_manifest(manifest)
+        if not args.no_save:
+            stats.update(save_blend(output))
+        stats["total_seconds"] = round(time.perf_counter() - began, 4)
+        if key is not None:
+            cache.store(key, output, stats)
+
+    line = json.dumps(stats, sort_keys=True)
+    print(line)
+    if args.stats:
+        Path(args.stats).write_text(line + "\n", encoding="utf-8")
+    return stats
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Content-addressed cache of processed .blend files.
+
+A result is keyed by the input file's bytes, the normalized manifest and the
+add-on version, so re-running an unchanged scene is a file link instead of
+a Blender run. The module only uses the standard library and has no
+relative imports, so tools outside Blender can load it from this folder.
+
+    cache = ResultCache("~/.cache/scene_buildup", max_bytes=20 * 2**30)
+    key = cache_key("scene.blend", manifest)
+    if cache.fetch(key, "built.blend") is None:
+        ...  # process, then
+        cache.store(key, "built.blend", stats)
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tomllib
+import uuid
+from pathlib import Path
+
+# Version from the extension manifest, a new release invalidates the cache
+with open(Path(__file__).with_name("blender_manifest.toml"), "rb") as _file:
+    ADDON_VERSION = tomllib.load(_file)["version"]
+
+# Numbers are compared at this many decimals, like the light signatures
+KEY_PRECISION = 6
+
+# Bytes read at a time when hashing input files
+HASH_CHUNK = 1 << 20
+
+
+def load_manifest(path):
+    """Read a JSON or YAML manifest file"""
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError as error:
+            raise RuntimeError(
+                "YAML manifests need PyYAML in Blender's Python, use JSON"
+            ) from error
+        return yaml.safe_load(text)
+    return json.loads(text)
+
+
+def file_digest(path):
+    """SHA-256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _normalized_value(value):
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        # 15 and 15.0 set the same property
+        return round(float(value), KEY_PRECISION)
+    if isinstance(value, dict):
+        return {key: _normalized_value(value[key]) for key in sorted(value)}
+    return [_normalized_value(item) for item in value]
+
+
+def normalize_manifest(manifest):
+    """Manifest with sorted keys, rounded numbers and explicit defaults
+
+    Defaults seed each object once before the entries matching it apply
+    their own keys (see batch.resolve_objects()), so they stay a separate
+    section rather than being folded into entries. Entries keep their
+    order since later entries override earlier ones. Reordering keys,
+    writing 15 as 15.0 or leaving out "enabled": true gives the same result.
+    """
+    normalized = _normalized_value(manifest)
+    defaults = normalized.setdefault("defaults", {})
+    defaults.setdefault("enabled", True)
+    return normalized
+
+
+def cache_key(blend_path, manifest):
+    """Key of the result of applying manifest to the file at blend_path"""
+    payload = json.dumps(
+        {
+            "blend": file_digest(blend_path),
+            "manifest": normalize_manifest(manifest),
+            "version": ADDON_VERSION,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _partial_path(target):
+    """Temporary name next to target, unique to this writer
+
+    Workers on other processes or machines may write the same target at
+    once, each renames its own file into place.
+    """
+    return target.with_name(f".{target.name}.{os.getpid()}-{uuid.uuid4().hex}.partial")
+
+
+def _link_or_copy(source, target):
+    """Hardlink target to source, copying across file systems"""
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    partial = _partial_path(target)
+    try:
+        try:
+            os.link(source, partial)
+        except OSError:
+            shutil.copyfile(source, partial)
+        os.replace(partial, target)
+    finally:
+        # Left behind on errors, and by the rename when target already is
+        # a link to the same file
+        partial.unlink(missing_ok=True)
+
+
+class ResultCache:
+    """Directory of results evicted least recently used past max_bytes
+
+    Each entry is <key>.blend with its stats in <key>.json. Use times live
+    on a separate <key>.used file, because the .blend may be hardlinked to
+    outputs whose times should not change on every hit. Outputs are
+    hardlinks where possible, Blender saves through a new file so they are
+    never changed in place.
+    """
+
+    def __init__(self, root, max_bytes=0):
+        self.root = Path(root).expanduser().resolve()
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key, suffix):
+        return self.root / key[:2] / f"{key}{suffix}"
+
+    def fetch(self, key, output):
+        """Link the cached result to output, returns its stats or None"""
+        blend = self._path(key, ".blend")
+        try:
+            stats = json.loads(self._path(key, ".json").read_text(encoding="utf-8"))
+            _link_or_copy(blend, output)
+        except (FileNotFoundError, json.JSONDecodeError):
+            # Missing, half written or evicted meanwhile
+            return None
+        try:
+            # Only refresh the marker, recreating it after an eviction
+            # would leave it without an entry
+            os.utime(self._path(key, ".used"))
+        except FileNotFoundError:
+            pass
+        return stats
+
+    def store(self, key, output, stats=None):
+        """Add the file at output as the result for key, then evict"""
+        _link_or_copy(output, self._path(key, ".blend"))
+        record = self._path(key, ".json")
+        partial = _partial_path(record)
+        try:
+            partial.write_text(json.dumps(stats or {}, sort_keys=True), encoding="utf-8")
+            os.replace(partial, record)
+        finally:
+            partial.unlink(missing_ok=True)
+        self._path(key, ".used").touch()
+        if self.max_bytes:
+            self.evict()
+
+    def entries(self):
+        """(last use, size, key) of every complete entry"""
+        found = []
+        for used in self.root.glob("*/*.used"):
+            key = used.stem
+            try:
+                size = self._path(key, ".blend").stat().st_size
+                found.append((used.stat().st_mtime, size, key))
+            except FileNotFoundError:
+                continue
+        return found
+
+    def evict(self):
+        """Remove least recently used entries until within max_bytes"""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, key in entries:
+            if total <= self.max_bytes:
+                break
+            # The marker goes first so the entry stops being listed
+            for suffix in (".used", ".json", ".blend"):
+                self._path(key, suffix).unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
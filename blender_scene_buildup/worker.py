@@ -0,0 +1,166 @@
+"""
+Long-running Blender worker taking batch jobs from a spool directory.
+
+Blender starts and registers the add-on once, then processes one job after
+another:
+
+    blender -b --factory-startup --python blender_scene_buildup/worker.py -- SPOOL
+
+A job is a JSON file in SPOOL/jobs:
+
+    {"input": "/abs/scene.blend", "output": "/abs/built.blend",
+     "manifest": "/abs/manifest.json", "submitted": 1760000000.0,
+     "cache": {"root": "/abs/cache", "max_bytes": 0}}
+
+where "manifest" is a manifest path or the manifest itself (see batch.py)
+and the optional "cache" is a result cache (see result_cache.py).
+A worker claims a job by renaming it into SPOOL/claimed with its process
+id in front of the name, which only one worker can win and lets the
+dispatcher fail jobs whose worker died. It runs batch.process_blend() and
+writes the job with its stats and timestamps to SPOOL/done, or with the
+error to SPOOL/failed. Workers exit once idle after SPOOL/stop is created.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import traceback
+from pathlib import Path
+
+if __package__:
+    from .batch import ensure_registered, load_manifest, process_blend
+    from .result_cache import ResultCache
+else:
+    # Run as a script with --python, the package is not imported yet
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from blender_scene_buildup.batch import (
+        ensure_registered,
+        load_manifest,
+        process_blend,
+    )
+    from blender_scene_buildup.result_cache import ResultCache
+
+
+# Spool subdirectories, jobs move from one to the next
+SPOOL_DIRS = ("jobs", "claimed", "done", "failed", "workers")
+
+# File whose presence tells idle workers to exit
+STOP_FILE = "stop"
+
+
+def write_json(path, data):
+    """Write data so readers never see a partial file"""
+    partial = path.with_name(f".{path.name}.partial")
+    partial.write_text(json.dumps(data, sort_keys=True), encoding="utf-8")
+    os.replace(partial, path)
+
+
+def claim_next(spool):
+    """Move the oldest pending job into claimed/, None when there is none
+
+    The claimed file is named <pid>-<job name>.
+    """
+    for path in sorted((spool / "jobs").glob("*.json")):
+        claimed = spool / "claimed" / f"{os.getpid()}-{path.name}"
+        try:
+            os.rename(path, claimed)
+        except FileNotFoundError:
+            # Another worker claimed it first
+            continue
+        return claimed
+    return None
+
+
+def run_job(spool, claimed, worker_id):
+    """Process a claimed job and file its record under done/ or failed/"""
+    record = {"worker": worker_id, "pid": os.getpid(), "started": time.time()}
+    folder = "failed"
+    try:
+        job = json.loads(claimed.read_text(encoding="utf-8"))
+        record.update(job)
+        manifest = job["manifest"]
+        if isinstance(manifest, str):
+            manifest = load_manifest(manifest)
+        cache = None
+        if job.get("cache"):
+            cache = ResultCache(**job["cache"])
+        record["stats"] = process_blend(
+            job["input"], manifest, job["output"], cache
+        )
+        folder = "done"
+    except Exception as error:
+        record["error"] = f"{type(error).__name__}: {error}"
+        traceback.print_exc()
+    record["finished"] = time.time()
+    job_name = claimed.name.partition("-")[2]
+    write_json(spool / folder / job_name, record)
+    claimed.unlink()
+    return folder == "done"
+
+
+def serve(spool, worker_id, poll_interval=0.1, idle_timeout=0.0):
+    """Process jobs until stopped or idle for idle_timeout seconds (0: never)"""
+    spool = Path(spool).resolve()
+    for name in SPOOL_DIRS:
+        (spool / name).mkdir(parents=True, exist_ok=True)
+
+    ensure_registered()
+    write_json(
+        spool / "workers" / f"{worker_id}.json",
+        {"pid": os.getpid(), "ready": time.time()},
+    )
+
+    processed = failed = 0
+    idle_since = time.monotonic()
+    while True:
+        claimed = claim_next(spool)
+        if claimed is None:
+            idle = time.monotonic() - idle_since
+            if (spool / STOP_FILE).exists():
+                break
+            if idle_timeout and idle > idle_timeout:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        if not run_job(spool, claimed, worker_id):
+            failed += 1
+        processed += 1
+        idle_since = time.monotonic()
+
+    print(json.dumps(
+        {"worker": worker_id, "processed": processed, "failed": failed}
+    ))
+    return processed
+
+
+def parse_args(argv=None):
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(
+        prog="worker.py",
+        description="Process scene buildup jobs from a spool directory",
+    )
+    parser.add_argument("spool", help="Spool directory shared with the dispatcher")
+    parser.add_argument(
+        "--id", default=f"worker-{os.getpid()}", help="Name in job records"
+    )
+    parser.add_argument(
+        "--poll", type=float, default=0.1, help="Seconds between checks when idle"
+    )
+    parser.add_argument(
+        "--idle-timeout", type=float, default=0.0,
+        help="Exit after this many idle seconds (0: wait for the stop file)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    serve(args.spool, args.id, args.poll, args.idle_timeout)
+
+
+if __name__ == "__main__":
+    main()
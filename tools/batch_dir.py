@@ -0,0 +1,232 @@
+"""
+Apply scene buildup to every .blend in a directory, one Blender per core.
+
+Plain Python, no Blender needed. Each file runs in its own background
+Blender through blender_scene_buildup/batch.py, so a crash costs one file.
+Finished files are appended to a checkpoint log and skipped when the run
+is started again, and every file's timing, size and error go to a CSV:
+
+    python tools/batch_dir.py scenes/ --manifest manifest.json --output-dir built/
+
+For many small files where Blender's startup dominates, the long-running
+workers of tools/dispatch.py are faster.
+"""
+
+import argparse
+import concurrent.futures
+import csv
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+BATCH_SCRIPT = REPO_ROOT / "blender_scene_buildup" / "batch.py"
+
+# The add-on package imports bpy, its standalone result cache is loaded
+# from its folder instead
+sys.path.insert(0, str(REPO_ROOT / "blender_scene_buildup"))
+from result_cache import ResultCache, cache_key, load_manifest  # noqa: E402
+
+# Columns of the summary CSV, in order
+CSV_FIELDS = (
+    "input",
+    "status",
+    "output",
+    "seconds",
+    "output_bytes",
+    "objects",
+    "cached",
+    "error",
+)
+
+
+def read_checkpoint(path):
+    """Latest record of each input in the checkpoint log"""
+    records = {}
+    if not path.exists():
+        return records
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Last line cut off by the interruption
+                continue
+            records[record["input"]] = record
+    return records
+
+
+def append_checkpoint(file, record):
+    """Append one record and make sure it survives an interruption"""
+    file.write(json.dumps(record, sort_keys=True) + "\n")
+    file.flush()
+    os.fsync(file.fileno())
+
+
+def run_blender(blender, source, output, manifest, cache_args, timeout):
+    """Process one file in a new background Blender, returns its stats"""
+    with tempfile.TemporaryDirectory() as scratch:
+        stats_path = Path(scratch) / "stats.json"
+        command = [
+            blender, "-b", "--factory-startup", str(source),
+            "--python", str(BATCH_SCRIPT),
+            "--", manifest, "-o", str(output), "--stats", str(stats_path),
+            *cache_args,
+        ]
+        result = subprocess.run(
+            command, capture_output=True, text=True, timeout=timeout or None
+        )
+        if result.returncode != 0 or not stats_path.exists():
+            tail = (result.stderr or result.stdout).strip().splitlines()[-5:]
+            message = f"Blender exited with {result.returncode}"
+            raise RuntimeError(" | ".join([message, *tail]))
+        return json.loads(stats_path.read_text(encoding="utf-8"))
+
+
+def process_file(args, source, relative, manifest, cache):
+    """Checkpoint record for one input, never raises"""
+    output = args.output_dir / relative
+    output.parent.mkdir(parents=True, exist_ok=True)
+    record = {"input": str(relative), "output": str(output)}
+    began = time.perf_counter()
+    try:
+        stats = None
+        if cache is not None:
+            # A hit needs no Blender at all
+            stats = cache.fetch(cache_key(source, manifest), output)
+            if stats is not None:
+                stats["cached"] = True
+        if stats is None:
+            cache_args = []
+            if args.cache:
+                cache_args = ["--cache", args.cache, "--cache-size", str(args.cache_size)]
+            stats = run_blender(
+                args.blender, source, output, str(args.manifest),
+                cache_args, args.timeout,
+            )
+        record.update(
+            status="ok",
+            output_bytes=output.stat().st_size,
+            objects=stats.get("objects", 0),
+            cached=bool(stats.get("cached")),
+        )
+    except Exception as error:
+        record.update(status="failed", error=f"{type(error).__name__}: {error}")
+    record["seconds"] = round(time.perf_counter() - began, 3)
+    return record
+
+
+def write_summary(path, records):
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, CSV_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Apply scene buildup to a directory of .blend files"
+    )
+    parser.add_argument("input_dir", type=Path, help="Directory to search")
+    parser.add_argument("--manifest", type=Path, required=True, help="Manifest for every file")
+    parser.add_argument(
+        "--output-dir", type=Path, required=True,
+        help="Outputs keep their path relative to input_dir",
+    )
+    parser.add_argument(
+        "--pattern", default="**/*.blend", help="Glob of inputs within input_dir"
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=os.cpu_count() or 1,
+        help="Blender processes at once",
+    )
+    parser.add_argument(
+        "--checkpoint", type=Path,
+        help="Log of finished files (default: OUTPUT_DIR/checkpoint.jsonl)",
+    )
+    parser.add_argument(
+        "--summary", type=Path,
+        help="Summary CSV (default: OUTPUT_DIR/summary.csv)",
+    )
+    parser.add_argument(
+        "--blender", default=shutil.which("blender") or "blender",
+        help="Blender executable",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=0.0,
+        help="Seconds before one file counts as failed (0: no limit)",
+    )
+    parser.add_argument(
+        "--cache", help="Result cache directory, reused for unchanged inputs"
+    )
+    parser.add_argument(
+        "--cache-size", type=float, default=0.0,
+        help="Evict least recently used results past this many GiB (0: never)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    args.input_dir = args.input_dir.resolve()
+    args.output_dir = args.output_dir.resolve()
+    args.manifest = args.manifest.resolve()
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    checkpoint = args.checkpoint or args.output_dir / "checkpoint.jsonl"
+    summary = args.summary or args.output_dir / "summary.csv"
+
+    # Outputs may sit inside the input directory, never process them again
+    sources = sorted(
+        path for path in args.input_dir.glob(args.pattern)
+        if path.is_file() and args.output_dir not in path.parents
+    )
+    records = read_checkpoint(checkpoint)
+    pending = [
+        path for path in sources
+        if records.get(str(path.relative_to(args.input_dir)), {}).get("status") != "ok"
+    ]
+    print(f"{len(sources)} file(s), {len(sources) - len(pending)} done before, "
+          f"{len(pending)} to process with {args.jobs} job(s)")
+
+    manifest = load_manifest(args.manifest)
+    cache = None
+    if args.cache:
+        cache = ResultCache(args.cache, int(args.cache_size * 2**30))
+
+    began = time.perf_counter()
+    with open(checkpoint, "a", encoding="utf-8") as log, \
+            concurrent.futures.ThreadPoolExecutor(args.jobs) as pool:
+        # Threads only wait on Blender processes, which do the work
+        futures = [
+            pool.submit(
+                process_file, args, path,
+                path.relative_to(args.input_dir), manifest, cache,
+            )
+            for path in pending
+        ]
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                record = future.result()
+                records[record["input"]] = record
+                append_checkpoint(log, record)
+                print(f"{record['status']:6} {record['seconds']:8.2f}s {record['input']}")
+        except KeyboardInterrupt:
+            pool.shutdown(wait=True, cancel_futures=True)
+            print("Interrupted, run again to resume", file=sys.stderr)
+            raise
+
+    write_summary(summary, [records[key] for key in sorted(records)])
+    failed = sum(record["status"] != "ok" for record in records.values())
+    print(f"Processed {len(pending)} file(s) in {time.perf_counter() - began:.1f}s, "
+          f"{failed} failed, summary in {summary}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
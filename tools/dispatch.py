@@ -0,0 +1,292 @@
+"""
+Spread scene buildup jobs over a pool of long-running Blender workers.
+
+Plain Python, no Blender needed. Starts N workers on a spool directory (see
+blender_scene_buildup/worker.py), queues one job per input file, waits for
+the results and prints throughput and per-job latency:
+
+    python tools/dispatch.py --workers 4 --manifest manifest.json \\
+        --output-dir built/ scenes/*.blend
+
+With --workers 0 the jobs go to workers that are already running on the
+spool, which is how a permanent pool is fed. With --cache, files whose
+result is cached are linked to their output without queuing a job.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+WORKER_SCRIPT = REPO_ROOT / "blender_scene_buildup" / "worker.py"
+
+# The add-on package imports bpy, its standalone result cache is loaded
+# from its folder instead
+sys.path.insert(0, str(REPO_ROOT / "blender_scene_buildup"))
+from result_cache import ResultCache, cache_key, load_manifest  # noqa: E402
+
+# Must match SPOOL_DIRS and STOP_FILE in worker.py, which imports bpy
+SPOOL_DIRS = ("jobs", "claimed", "done", "failed", "workers")
+STOP_FILE = "stop"
+
+
+def write_json(path, data):
+    """Write data so workers never see a partial job"""
+    partial = path.with_name(f".{path.name}.partial")
+    partial.write_text(json.dumps(data, sort_keys=True), encoding="utf-8")
+    os.replace(partial, path)
+
+
+def start_workers(blender, spool, count):
+    """Launch count background Blender workers on spool"""
+    workers = []
+    for i in range(count):
+        command = [
+            blender, "-b", "--factory-startup",
+            "--python", str(WORKER_SCRIPT),
+            "--", str(spool), "--id", f"worker-{i}",
+        ]
+        workers.append(subprocess.Popen(command, stdout=subprocess.DEVNULL))
+    return workers
+
+
+def cached_records(inputs, manifest_path, output_dir, cache):
+    """Link cached results to their outputs, returns (records, misses)"""
+    manifest = load_manifest(manifest_path)
+    records = []
+    misses = []
+    for path in inputs:
+        path = Path(path).resolve()
+        submitted = time.time()
+        output = output_dir / path.name
+        stats = cache.fetch(cache_key(path, manifest), output)
+        if stats is None:
+            misses.append(path)
+            continue
+        stats["cached"] = True
+        records.append({
+            "input": str(path),
+            "output": str(output),
+            "worker": "cache",
+            "submitted": submitted,
+            "started": submitted,
+            "finished": time.time(),
+            "stats": stats,
+        })
+    return records, misses
+
+
+def submit(spool, inputs, manifest, output_dir, cache=None):
+    """Queue one job per input, returns the job file names in order"""
+    names = []
+    for i, path in enumerate(inputs):
+        path = Path(path).resolve()
+        name = f"{time.time_ns()}-{i:06d}.json"
+        job = {
+            "input": str(path),
+            "output": str(output_dir / path.name),
+            "manifest": manifest,
+            "submitted": time.time(),
+        }
+        if cache is not None:
+            job["cache"] = {"root": str(cache.root), "max_bytes": cache.max_bytes}
+        write_json(spool / "jobs" / name, job)
+        names.append(name)
+    return names
+
+
+def process_alive(pid):
+    """True while a process with this id is running on this machine"""
+    if os.name == "nt":
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        # SYNCHRONIZE access, then a zero wait times out while it runs
+        handle = kernel32.OpenProcess(0x00100000, False, pid)
+        if not handle:
+            return False
+        try:
+            return kernel32.WaitForSingleObject(handle, 0) == 0x102
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def fail_orphaned_jobs(spool, pending, workers=()):
+    """File pending jobs whose worker died mid-job as failed
+
+    Claimed jobs are named <pid>-<job name> (see worker.claim_next()). They
+    are failed rather than requeued, since a file that crashed one worker
+    would likely crash the next one too. Workers this dispatcher started
+    are checked through their Popen, a dead child stays a zombie that
+    looks alive to process_alive() until it is polled.
+    """
+    own = {worker.pid: worker for worker in workers}
+    for claimed in (spool / "claimed").glob("*.json"):
+        pid, _, name = claimed.name.partition("-")
+        if name not in pending or not pid.isdigit():
+            continue
+        worker = own.get(int(pid))
+        if worker.poll() is None if worker else process_alive(int(pid)):
+            continue
+        try:
+            job = json.loads(claimed.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            continue
+        now = time.time()
+        job.update(
+            worker=f"pid-{pid}",
+            pid=int(pid),
+            started=job.get("submitted", now),
+            finished=now,
+            error=f"Worker {pid} exited while processing the job",
+        )
+        write_json(spool / "failed" / name, job)
+        claimed.unlink(missing_ok=True)
+
+
+def collect(spool, names, workers, timeout):
+    """Wait for the records of all jobs, returns them in submission order"""
+    pending = set(names)
+    records = {}
+    deadline = time.monotonic() + timeout if timeout else None
+    last_check = time.monotonic()
+    while pending:
+        for name in list(pending):
+            for folder in ("done", "failed"):
+                path = spool / folder / name
+                if path.exists():
+                    records[name] = json.loads(path.read_text(encoding="utf-8"))
+                    pending.discard(name)
+                    break
+        if not pending:
+            break
+        if time.monotonic() - last_check > 1.0:
+            fail_orphaned_jobs(spool, pending, workers)
+            last_check = time.monotonic()
+            continue
+        # Poll every worker, so each dead one is reaped
+        alive = [worker.poll() is None for worker in workers]
+        if workers and not any(alive):
+            raise RuntimeError(f"All workers exited with {len(pending)} jobs left")
+        if deadline is not None and time.monotonic() > deadline:
+            raise TimeoutError(f"{len(pending)} jobs unfinished after {timeout}s")
+        time.sleep(0.05)
+    return [records[name] for name in names]
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def summarize(records, began):
+    """Throughput and latency figures of finished job records"""
+    finished = [r for r in records if "error" not in r]
+    cached = [r for r in finished if r.get("stats", {}).get("cached")]
+    latency = [r["finished"] - r["submitted"] for r in records]
+    wait = [r["started"] - r["submitted"] for r in records]
+    service = [r["finished"] - r["started"] for r in records]
+    elapsed = max(r["finished"] for r in records) - began
+    per_worker = {}
+    for record in records:
+        per_worker[record["worker"]] = per_worker.get(record["worker"], 0) + 1
+    return {
+        "jobs": len(records),
+        "failed": len(records) - len(finished),
+        "cached": len(cached),
+        "elapsed_seconds": round(elapsed, 3),
+        "jobs_per_minute": round(60.0 * len(records) / elapsed, 2),
+        "latency_p50": round(statistics.median(latency), 3),
+        "latency_p95": round(percentile(latency, 0.95), 3),
+        "latency_max": round(max(latency), 3),
+        "queue_wait_mean": round(statistics.mean(wait), 3),
+        "processing_mean": round(statistics.mean(service), 3),
+        "per_worker": per_worker,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run scene buildup jobs on a pool of Blender workers"
+    )
+    parser.add_argument("inputs", nargs="+", help=".blend files to process")
+    parser.add_argument("--manifest", required=True, help="Manifest for every file")
+    parser.add_argument("--output-dir", required=True, help="Where outputs go")
+    parser.add_argument(
+        "--spool", default=".scene_buildup_spool", help="Spool directory"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1,
+        help="Workers to start, 0 to use workers already on the spool",
+    )
+    parser.add_argument(
+        "--blender", default=shutil.which("blender") or "blender",
+        help="Blender executable",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=0.0,
+        help="Give up after this many seconds (0: wait forever)",
+    )
+    parser.add_argument(
+        "--cache", help="Result cache directory, reused for unchanged inputs"
+    )
+    parser.add_argument(
+        "--cache-size", type=float, default=0.0,
+        help="Evict least recently used results past this many GiB (0: never)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    spool = Path(args.spool).resolve()
+    for name in SPOOL_DIRS:
+        (spool / name).mkdir(parents=True, exist_ok=True)
+    output_dir = Path(args.output_dir).resolve()
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    began = time.time()
+    manifest = str(Path(args.manifest).resolve())
+    cache = None
+    hits = []
+    inputs = args.inputs
+    if args.cache:
+        cache = ResultCache(args.cache, int(args.cache_size * 2**30))
+        hits, inputs = cached_records(inputs, manifest, output_dir, cache)
+
+    workers = []
+    if args.workers and inputs:
+        (spool / STOP_FILE).unlink(missing_ok=True)
+        workers = start_workers(args.blender, spool, args.workers)
+
+    names = submit(spool, inputs, manifest, output_dir, cache)
+    try:
+        records = hits + collect(spool, names, workers, args.timeout)
+    finally:
+        # Workers we started finish their current job, then exit
+        if workers:
+            (spool / STOP_FILE).touch()
+            for worker in workers:
+                worker.wait()
+
+    for record in records:
+        if "error" in record:
+            print(f"FAILED {record['input']}: {record['error']}", file=sys.stderr)
+    print(json.dumps(summarize(records, began), sort_keys=True))
+    return 1 if any("error" in record for record in records) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())